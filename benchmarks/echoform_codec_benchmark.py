@@ -0,0 +1,65 @@
+"""
+EchoForm Codec Benchmark
+========================
+
+Builds forms with many cls_event terms and compares the JSON encoding
+(flatten) with the binary one (pack), reinflated as a list of dicts or
+as a TermTable: encoded size, encode and reinflate time in milliseconds
+per form, and intensity_sum time in microseconds.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.echoform import EchoForm
+
+
+def synthetic_form(terms: int, seed: int = 0) -> EchoForm:
+    rng = random.Random(seed)
+    form = EchoForm(anchor=f"cls_{terms}", domain="cls")
+    now = time.time()
+    for i in range(terms):
+        form.add_term(f"identity_{rng.randrange(100)}", role="cls_event",
+                      intensity=rng.random(), timestamp=now - i, source="bench")
+    return form
+
+
+def timed(fn, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'terms':>6} {'codec':>6} {'bytes':>9} {'encode_ms':>10} {'reinflate_ms':>13} {'intensity_us':>13}")
+    for terms in args.terms:
+        form = synthetic_form(terms)
+        for name, term_table in (("json", False), ("packed", False), ("table", True)):
+            encode = form.flatten if name == "json" else form.pack
+            blob = encode()
+            encode_ms = timed(encode, args.rounds)
+            reinflate_ms = timed(lambda: EchoForm.reinflate(blob, term_table), args.rounds)
+            decoded = EchoForm.reinflate(blob, term_table)
+            intensity_us = timed(decoded.intensity_sum, args.rounds) * 1e3
+            if term_table:
+                encode_ms = timed(decoded.pack, args.rounds)
+            print(f"{terms:>6} {name:>6} {len(blob):>9} {encode_ms:>10.2f} {reinflate_ms:>13.2f} "
+                  f"{intensity_us:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
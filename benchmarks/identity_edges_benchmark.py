@@ -0,0 +1,88 @@
+"""
+Identity Edges Benchmark
+========================
+
+Bulk-loads scar identities relating random geoid ids into a fresh
+LatticeStorage, then times the relationship queries backed by the
+identity_edges table: related scars per id, scars by relationship type
+and the per-identity lattice stats.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.identity import Identity
+from kimera.storage import LatticeStorage
+
+RELATIONSHIP_TYPES = ("contradiction", "support", "analogy", "refinement")
+
+
+def synthetic_scars(n: int, ids: int, seed: int = 0):
+    """Scars relating two random ids out of ``ids`` geoid ids."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield Identity.create_scar(
+            content=f"scar {i}",
+            related_ids=[f"geoid_{rng.randrange(ids)}", f"geoid_{rng.randrange(ids)}"],
+            weight=rng.random(),
+            metadata={"relationship_type": RELATIONSHIP_TYPES[i % len(RELATIONSHIP_TYPES)]},
+        )
+
+
+def timed(fn, queries):
+    """Median and max milliseconds of ``fn(q)`` over ``queries``."""
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scars", type=int, default=1_000_000)
+    parser.add_argument("--ids", type=int, default=100_000, help="distinct related ids")
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LatticeStorage(db_path=str(Path(tmp) / "edges.db"))
+        try:
+            start = time.perf_counter()
+            batch = []
+            for scar in synthetic_scars(args.scars, args.ids):
+                batch.append(scar)
+                if len(batch) == args.batch:
+                    storage.store_identities_bulk(batch)
+                    batch = []
+            storage.store_identities_bulk(batch)
+            load = time.perf_counter() - start
+            edges = storage._conn.execute("SELECT count(*) FROM identity_edges").fetchone()[0]
+            print(f"loaded {args.scars} scars / {edges} edges in {load:.1f}s "
+                  f"({args.scars / load:,.0f} scars/s)")
+
+            rng = random.Random(1)
+            ids = [f"geoid_{rng.randrange(args.ids)}" for _ in range(args.queries)]
+            print(f"{'query':>26} {'median_ms':>10} {'max_ms':>8}")
+            for name, fn, queries in (
+                ("get_related_scars", storage.get_related_scars, ids),
+                ("get_identity_lattice_stats", storage.get_identity_lattice_stats, ids),
+                ("get_scars_by_type", storage.get_scars_by_type, RELATIONSHIP_TYPES[:1]),
+            ):
+                median, worst = timed(fn, queries)
+                print(f"{name:>26} {median:>10.2f} {worst:>8.2f}")
+        finally:
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
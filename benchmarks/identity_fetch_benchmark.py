@@ -0,0 +1,69 @@
+"""
+Identity Fetch Benchmark
+========================
+
+Bulk-loads identities into a fresh LatticeStorage, then times point
+fetches (fetch_identity, one query per id) against fetch_identities_many
+for batches of random ids, as microseconds per identity.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.identity import Identity
+from kimera.storage import LatticeStorage
+
+
+def synthetic_identities(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield Identity(id=f"identity_{i}", raw=f"identity {i}", tags=["bench"],
+                       weight=rng.random(), meta={"rank": i})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--identities", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LatticeStorage(db_path=str(Path(tmp) / "fetch.db"))
+        try:
+            batch = []
+            for identity in synthetic_identities(args.identities):
+                batch.append(identity)
+                if len(batch) == 50_000:
+                    storage.store_identities_bulk(batch)
+                    batch = []
+            storage.store_identities_bulk(batch)
+
+            rng = random.Random(1)
+            print(f"{'batch':>6} {'fetch_identity_us':>18} {'fetch_many_us':>14}")
+            for size in args.batch:
+                point, many = [], []
+                for _ in range(args.rounds):
+                    ids = [f"identity_{rng.randrange(args.identities)}" for _ in range(size)]
+                    start = time.perf_counter()
+                    for identity_id in ids:
+                        storage.fetch_identity(identity_id)
+                    point.append((time.perf_counter() - start) / size * 1e6)
+                    ids = [f"identity_{rng.randrange(args.identities)}" for _ in range(size)]
+                    start = time.perf_counter()
+                    storage.fetch_identities_many(ids)
+                    many.append((time.perf_counter() - start) / size * 1e6)
+                print(f"{size:>6} {statistics.median(point):>18.0f} {statistics.median(many):>14.0f}")
+        finally:
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
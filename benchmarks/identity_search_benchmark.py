@@ -0,0 +1,85 @@
+"""
+Identity Search Benchmark
+=========================
+
+Bulk-loads identities with synthetic text (Zipf-distributed words) into a
+fresh LatticeStorage, compacts the search index, then times
+search_identities in BM25 mode for rare, mid-frequency and common words
+against the substring scan.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.identity import Identity
+from kimera.storage import LatticeStorage
+
+
+def synthetic_identities(n: int, vocab: int, words: int, seed: int = 0):
+    """Identities whose text is ``words`` Zipf-distributed words out of ``vocab``."""
+    rng = np.random.default_rng(seed)
+    ranks = rng.zipf(1.3, size=(n, words)) % vocab
+    for row in ranks:
+        yield Identity(content=" ".join(f"w{r}" for r in row))
+
+
+def timed(fn, queries):
+    """Median milliseconds of ``fn(q)`` over ``queries``."""
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--identities", type=int, default=1_000_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LatticeStorage(db_path=str(Path(tmp) / "search.db"))
+        try:
+            start = time.perf_counter()
+            batch = []
+            for identity in synthetic_identities(args.identities, args.vocab, args.words):
+                batch.append(identity)
+                if len(batch) == args.batch:
+                    storage.store_identities_bulk(batch)
+                    batch = []
+            storage.store_identities_bulk(batch)
+            load = time.perf_counter() - start
+            start = time.perf_counter()
+            postings = storage.compact_search_index()
+            compact = time.perf_counter() - start
+            print(f"loaded {args.identities} identities in {load:.1f}s, "
+                  f"compacted {postings} postings in {compact:.1f}s")
+
+            print(f"{'query':>22} {'bm25_ms':>9} {'substring_ms':>13}")
+            for name, queries in (
+                ("rare (w4000+)", [f"w{4000 + i}" for i in range(20)]),
+                ("mid (w100+)", [f"w{100 + i}" for i in range(20)]),
+                ("common (w1, w2)", ["w1", "w2"]),
+                ("two words", [f"w{4000 + i} w{100 + i}" for i in range(20)]),
+            ):
+                bm25 = timed(lambda q: storage.search_identities(q), queries)
+                substring = timed(lambda q: storage.search_identities(q, mode="substring"), queries[:3])
+                print(f"{name:>22} {bm25:>9.2f} {substring:>13.2f}")
+        finally:
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -36,7 +36,7 @@ import gc
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from kimera.dataset import load_toy_dataset
-from kimera.geoid import Geoid, init_geoid
+from kimera.geoid import Geoid, init_geoids_batch
 from kimera.resonance import resonance, THRESH
 
 # Import async OpenAI client
@@ -73,16 +73,12 @@ def stream_dataset_pairs(dataset_path: Path, max_pairs: int, chunk_size: int = 1
             if pairs_generated >= max_pairs:
                 break
                 
-            # Convert chunk to geoids
-            chunk_geoids = []
-            for _, row in chunk_df.iterrows():
-                if 'text' in row and pd.notna(row['text']):
-                    geoid = init_geoid(
-                        raw=str(row['text']),
-                        lang=row.get('lang', 'en'),
-                        tags=["benchmark"]
-                    )
-                    chunk_geoids.append(geoid)
+            # Convert chunk to geoids (one batched encode per chunk)
+            if 'text' not in chunk_df.columns:
+                continue
+            rows = chunk_df[chunk_df['text'].notna()]
+            langs = rows['lang'].fillna('en').tolist() if 'lang' in rows.columns else 'en'
+            chunk_geoids = init_geoids_batch(rows['text'].astype(str).tolist(), langs, ["benchmark"])
             
             # Create pairs from this chunk
             chunk_pairs = create_test_pairs(chunk_geoids, min(max_pairs - pairs_generated, len(chunk_geoids) // 2))
@@ -102,31 +98,29 @@ def stream_dataset_pairs(dataset_path: Path, max_pairs: int, chunk_size: int = 1
         with open(dataset_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             
-            chunk_geoids = []
+            chunk_texts, chunk_langs = [], []
             for i, row in enumerate(reader):
                 if pairs_generated >= max_pairs:
                     break
                     
                 if 'text' in row and row['text'].strip():
-                    geoid = init_geoid(
-                        raw=row['text'],
-                        lang=row.get('lang', 'en'),
-                        tags=["benchmark"]
-                    )
-                    chunk_geoids.append(geoid)
+                    chunk_texts.append(row['text'])
+                    chunk_langs.append(row.get('lang') or 'en')
                 
                 # Process chunk when it reaches chunk_size
-                if len(chunk_geoids) >= chunk_size:
+                if len(chunk_texts) >= chunk_size:
+                    chunk_geoids = init_geoids_batch(chunk_texts, chunk_langs, ["benchmark"])
                     chunk_pairs = create_test_pairs(chunk_geoids, min(max_pairs - pairs_generated, len(chunk_geoids) // 2))
                     if chunk_pairs:
                         pairs_generated += len(chunk_pairs)
                         yield chunk_pairs
                     
-                    chunk_geoids.clear()
+                    chunk_texts, chunk_langs = [], []
                     gc.collect()
             
             # Process remaining geoids
-            if chunk_geoids and pairs_generated < max_pairs:
+            if chunk_texts and pairs_generated < max_pairs:
+                chunk_geoids = init_geoids_batch(chunk_texts, chunk_langs, ["benchmark"])
                 chunk_pairs = create_test_pairs(chunk_geoids, min(max_pairs - pairs_generated, len(chunk_geoids) // 2))
                 if chunk_pairs:
                     yield chunk_pairs
@@ -0,0 +1,66 @@
+"""
+Reactor Parallelism Benchmark
+=============================
+
+Runs one reactor cycle over synthetic geoids in each parallel mode:
+threaded, forked (geoids pickled to a process pool) and shared memory
+(embeddings in shared memory, scar records returned to the parent).
+Reports latency, memory delta and scars created per mode.
+"""
+
+import argparse
+import random
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.geoid import Geoid
+from kimera.reactor_mp import reactor_cycle_parallel, reactor_cycle_shared, reactor_cycle_threaded
+from kimera.scar import SCAR_LOG
+
+
+def synthetic_geoids(n: int, dim: int, seed: int = 0):
+    """Geoids with random embeddings, so no encoder is needed."""
+    rng = np.random.default_rng(seed)
+    vecs = rng.normal(size=(n, dim)).astype(np.float32)
+    geoids = []
+    for i in range(n):
+        raw = f"statement {i}" + (" is not true" if i % 5 == 0 else "")
+        geoids.append(Geoid(raw, raw, f"bench_{i}", "en", ["bench"], vecs[i], vecs[i], 0.0))
+    return geoids
+
+
+MODES = {
+    "threaded": lambda gs, workers, chunk: reactor_cycle_threaded(gs, workers, chunk),
+    "forked": lambda gs, workers, chunk: reactor_cycle_parallel(gs, workers, chunk, use_threading=False),
+    "shared": lambda gs, workers, chunk: reactor_cycle_shared(gs, workers, chunk),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    print(f"{'geoids':>8} {'mode':>9} {'latency_ms':>11} {'mem_mb':>8} {'new_scars':>10} {'kept':>6}")
+    for n in args.sizes:
+        for mode in args.modes:
+            geoids = synthetic_geoids(n, args.dim)
+            SCAR_LOG.clear()
+            random.seed(0)
+            stats = MODES[mode](geoids, args.workers, args.chunk)
+            # Scars that actually reached the parent's geoids
+            kept = sum(len(g.scars) for g in geoids) // 2
+            print(f"{n:>8} {mode:>9} {stats['latency_ms']:>11.1f} {stats['mem_mb']:>8.1f} "
+                  f"{stats['new_scars']:>10} {kept:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Scar Penalty Benchmark
+======================
+
+Times ``resonance(a, b)`` for a pair of geoids as the number of scars per
+geoid grows. The penalty is read from the scar store's running totals, so
+per-call latency should stay flat; the ``fetch_mean`` column times the old
+approach (materialize both geoids' scars and average them) for reference.
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera import resonance as resonance_mod
+from kimera.geoid import Geoid
+from kimera.resonance import resonance
+from kimera.scar import SCAR_LOG, fetch_scars
+
+
+def _geoid(gid: str, vec: np.ndarray) -> Geoid:
+    return Geoid(gid, gid, gid, "en", ["bench"], vec, vec, 0.0)
+
+
+def _per_call_us(fn, calls: int) -> float:
+    fn()  # warm the resonance cache
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scars", type=int, nargs="+", default=[0, 10, 100, 1_000, 10_000])
+    parser.add_argument("--calls", type=int, default=2_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--decay", action="store_true", help="use the time-decayed penalty")
+    args = parser.parse_args()
+
+    resonance_mod.ENABLE_SCAR_DECAY = args.decay
+    rng = np.random.default_rng(0)
+    print(f"{'scars/geoid':>11} {'resonance_us':>13} {'fetch_mean_us':>14}")
+    for n in args.scars:
+        SCAR_LOG.clear()
+        a = _geoid("bench_a", rng.normal(size=args.dim).astype(np.float32))
+        b = _geoid("bench_b", rng.normal(size=args.dim).astype(np.float32))
+        others = [f"other_{i}" for i in range(n)]
+        SCAR_LOG.append([a.gid] * n + [b.gid] * n, others + others, rng.random(2 * n))
+
+        fast = _per_call_us(lambda: resonance(a, b), args.calls)
+        slow_calls = max(1, min(args.calls, 2_000_000 // max(n, 1)))
+        slow = _per_call_us(lambda: np.mean([s.weight for s in fetch_scars(a, b)] or [0.0]), slow_calls)
+        print(f"{n:>11} {fast:>13.2f} {slow:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
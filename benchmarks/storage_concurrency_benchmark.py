@@ -0,0 +1,107 @@
+"""
+Storage Concurrency Benchmark
+=============================
+
+Measures LatticeStorage read QPS with 1, 4 and 16 reader threads while a
+writer thread keeps storing forms. Readers mix point fetches, recent-form
+listings and identity searches on their own cursors; ``--serialized``
+makes every read take the writer lock, as all reads did before per-thread
+cursors, for comparison.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.echoform import EchoForm
+from kimera.identity import Identity
+from kimera.storage import LatticeStorage
+
+WORDS = ["lattice", "echo", "scar", "geoid", "tension", "resonance", "contradiction", "entropy"]
+
+
+def make_form(i: int) -> EchoForm:
+    form = EchoForm(anchor=f"form_{i}", domain="bench")
+    form.add_term("t", intensity=1.0)
+    return form
+
+
+def load(storage: LatticeStorage, forms: int, identities: int, seed: int = 0):
+    rng = random.Random(seed)
+    storage.store_forms_bulk(make_form(i) for i in range(forms))
+    storage.store_identities_bulk(
+        Identity(content=" ".join(rng.choices(WORDS, k=6))) for _ in range(identities)
+    )
+
+
+def run(storage: LatticeStorage, threads: int, seconds: float, forms: int, serialized: bool):
+    """Read QPS of ``threads`` readers and write rate of one writer over ``seconds``."""
+    stop = threading.Event()
+    reads = [0] * threads
+    writes = [0]
+
+    def writer():
+        i = forms
+        while not stop.is_set():
+            storage.store_form(make_form(i))
+            i += 1
+            writes[0] += 1
+
+    def reader(slot: int):
+        rng = random.Random(slot)
+        ops = (
+            lambda: storage.fetch_form(f"form_{rng.randrange(forms)}"),
+            lambda: storage.list_forms(limit=20, domain="bench"),
+            lambda: storage.search_identities(rng.choice(WORDS)),
+        )
+        while not stop.is_set():
+            op = rng.choice(ops)
+            if serialized:
+                with storage._lock:
+                    op()
+            else:
+                op()
+            reads[slot] += 1
+
+    workers = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(slot,)) for slot in range(threads)
+    ]
+    for w in workers:
+        w.start()
+    time.sleep(seconds)
+    stop.set()
+    for w in workers:
+        w.join()
+    return sum(reads) / seconds, writes[0] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--forms", type=int, default=20_000)
+    parser.add_argument("--identities", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--serialized", action="store_true",
+                        help="hold the writer lock for every read")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LatticeStorage(db_path=str(Path(tmp) / "concurrency.db"))
+        try:
+            load(storage, args.forms, args.identities)
+            print(f"{'threads':>8} {'read_qps':>10} {'write_qps':>10}")
+            for threads in args.threads:
+                read_qps, write_qps = run(storage, threads, args.seconds, args.forms, args.serialized)
+                print(f"{threads:>8} {read_qps:>10.0f} {write_qps:>10.0f}")
+        finally:
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Vector Index Benchmark
+======================
+
+Compares exact (flat) and IVF top-k search over a synthetic knowledge
+base of clustered unit vectors: build time, per-query latency and
+recall@k of IVF against the exact result.
+"""
+
+import argparse
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.vector_index import FlatIndex, IVFIndex
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, n)
+    return (centers[labels] + 0.5 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def run(n: int, dim: int, queries: int, k: int, n_probe: int):
+    vecs = synthetic_vectors(n, dim, clusters=max(1, n // 500))
+    ids = [str(i) for i in range(n)]
+    rng = np.random.default_rng(1)
+    qs = vecs[rng.choice(n, queries, replace=False)] + 0.1 * rng.normal(size=(queries, dim)).astype(np.float32)
+
+    flat = FlatIndex(dim, capacity=n)
+    t0 = time.perf_counter()
+    flat.add(ids, vecs)
+    flat_build = time.perf_counter() - t0
+
+    ivf = IVFIndex(dim, n_probe=n_probe, capacity=n)
+    t0 = time.perf_counter()
+    ivf.add(ids, vecs)
+    ivf.train()
+    ivf_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    exact = [{h for h, _ in flat.top_k(q, k)} for q in qs]
+    flat_ms = (time.perf_counter() - t0) * 1000 / queries
+
+    t0 = time.perf_counter()
+    approx = [{h for h, _ in ivf.top_k(q, k)} for q in qs]
+    ivf_ms = (time.perf_counter() - t0) * 1000 / queries
+
+    recall = np.mean([len(e & a) / k for e, a in zip(exact, approx)])
+
+    print(f"n={n} dim={dim} k={k} n_probe={n_probe} lists={len(ivf._centroids)}")
+    print(f"  flat: build {flat_build:.2f}s  query {flat_ms:.3f} ms")
+    print(f"  ivf:  build {ivf_build:.2f}s  query {ivf_ms:.3f} ms  recall@{k} {recall:.3f}")
+    print(f"  speedup: {flat_ms / ivf_ms:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-probe", type=int, default=8)
+    args = parser.parse_args()
+    run(args.n, args.dim, args.queries, args.k, args.n_probe)
+
+
+if __name__ == "__main__":
+    main()
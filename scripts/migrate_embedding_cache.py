@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Migrate a legacy one-.pkl-per-vector embedding cache into the
+memory-mapped vector store used by kimera.cache.EmbeddingCache
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kimera.cache import get_cache_dir, migrate_pickle_cache, get_cache_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate .pkl embedding cache to the vector store")
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="Cache directory (default: $KIMERA_CACHE_DIR or .cache)")
+    parser.add_argument("--delete", action="store_true",
+                        help="Remove .pkl files once imported")
+    args = parser.parse_args()
+
+    cache_dir = args.cache_dir or get_cache_dir()
+    print(f"[MIGRATE] Importing *.pkl from {cache_dir}")
+
+    t0 = time.perf_counter()
+    n = migrate_pickle_cache(cache_dir, delete=args.delete)
+    elapsed = time.perf_counter() - t0
+
+    print(f"[MIGRATE] Imported {n:,} vectors in {elapsed:.2f}s")
+    if args.cache_dir is None:
+        stats = get_cache_stats()
+        print(f"[MIGRATE] Store now holds {stats['embedding_cache_size']:,} vectors "
+              f"({stats['cache_file_size_mb']:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
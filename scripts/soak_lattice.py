@@ -12,7 +12,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from kimera.geoid import init_geoid
+from kimera.geoid import init_geoids_batch
 from kimera.cls import lattice_resolve, clear_stored_forms
 from kimera.storage import get_storage, close_storage
 
@@ -68,7 +68,7 @@ def generate_random_text_pairs(n_pairs):
     return pairs
 
 
-def setup_soak_storage():
+def setup_soak_storage(write_behind=True):
     """Setup storage for soak testing"""
     # Use a dedicated soak test database
     soak_db = "soak_test_lattice.db"
@@ -81,12 +81,14 @@ def setup_soak_storage():
     # Initialize fresh storage
     storage = get_storage(soak_db)
     clear_stored_forms()
-    print(f"[SETUP] Initialized fresh storage: {soak_db}")
+    if write_behind:
+        storage.enable_write_behind(flush_rows=5000, flush_interval=1.0)
+    print(f"[SETUP] Initialized fresh storage: {soak_db} (write-behind: {'on' if write_behind else 'off'})")
     
     return storage, soak_db
 
 
-def run_soak_test(n_pairs=100000, dry_run=False):
+def run_soak_test(n_pairs=100000, dry_run=False, write_behind=True):
     """Run the soak test"""
     print(f"🔥 Lattice Storage Soak Test")
     print(f"Target: {n_pairs:,} GeoID pairs")
@@ -102,7 +104,7 @@ def run_soak_test(n_pairs=100000, dry_run=False):
         print(f"[DRY RUN] Reduced to {n_pairs} pairs")
     
     # Setup storage
-    storage, soak_db = setup_soak_storage()
+    storage, soak_db = setup_soak_storage(write_behind)
     
     try:
         # Generate test data
@@ -114,15 +116,9 @@ def run_soak_test(n_pairs=100000, dry_run=False):
         # Convert to GeoIDs
         print(f"[GEOID] Converting {len(pairs):,} pairs to GeoIDs...")
         start_geoid = time.perf_counter()
-        geoid_pairs = []
-        
-        for i, (text1, text2) in enumerate(pairs):
-            geo1 = init_geoid(text1, "en", ["soak_test"])
-            geo2 = init_geoid(text2, "en", ["soak_test"])
-            geoid_pairs.append((geo1, geo2))
-            
-            if (i + 1) % 5000 == 0:
-                print(f"[GEOID] Processed {i + 1:,} pairs...")
+        flat_texts = [text for pair in pairs for text in pair]
+        geoids = init_geoids_batch(flat_texts, "en", ["soak_test"], batch_size=256)
+        geoid_pairs = list(zip(geoids[0::2], geoids[1::2]))
         
         geoid_time = time.perf_counter() - start_geoid
         print(f"[TIMING] GeoID creation: {geoid_time:.2f}s ({geoid_time/len(pairs)*1000:.1f}ms per pair)")
@@ -137,6 +133,7 @@ def run_soak_test(n_pairs=100000, dry_run=False):
             if (i + 1) % 10000 == 0:
                 print(f"[RESOLVE] First pass: {i + 1:,} calls completed...")
         
+        storage.flush()
         resolve1_time = time.perf_counter() - start_resolve1
         qps1 = len(geoid_pairs) / resolve1_time
         print(f"[TIMING] First resolve pass: {resolve1_time:.2f}s ({qps1:.1f} QPS)")
@@ -151,6 +148,7 @@ def run_soak_test(n_pairs=100000, dry_run=False):
             if (i + 1) % 10000 == 0:
                 print(f"[RESOLVE] Second pass: {i + 1:,} calls completed...")
         
+        storage.flush()
         resolve2_time = time.perf_counter() - start_resolve2
         qps2 = len(geoid_pairs) / resolve2_time
         print(f"[TIMING] Second resolve pass: {resolve2_time:.2f}s ({qps2:.1f} QPS)")
@@ -239,10 +237,13 @@ def main():
                        help="Number of text pairs to test (default: 100000)")
     parser.add_argument("--dry-run", action="store_true",
                        help="Run with reduced dataset for testing (500 pairs)")
+    parser.add_argument("--no-write-behind", action="store_true",
+                       help="Write every form and identity immediately instead of buffering")
     
     args = parser.parse_args()
     
-    success = run_soak_test(n_pairs=args.pairs, dry_run=args.dry_run)
+    success = run_soak_test(n_pairs=args.pairs, dry_run=args.dry_run,
+                            write_behind=not args.no_write_behind)
     sys.exit(0 if success else 1)
 
 
@@ -7,13 +7,14 @@ from .identity import Identity  # noqa: F401
 # Legacy imports for backward compatibility
 try:
     from .geoid import Geoid, init_geoid  # noqa: F401
+    from .vector_index import FlatIndex, IVFIndex, load_index  # noqa: F401
 except ImportError:
     # Geoid might have external dependencies
     pass
 
 try:
     from .reactor import reactor_cycle, reactor_cycle_batched    # noqa: F401
-    from .reactor_mp import reactor_cycle_parallel, reactor_cycle_threaded  # noqa: F401
+    from .reactor_mp import reactor_cycle_parallel, reactor_cycle_threaded, reactor_cycle_shared  # noqa: F401
 except ImportError:
     # Reactor might have external dependencies
     pass
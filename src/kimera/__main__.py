@@ -4,6 +4,7 @@ Kimera CLI interface for lattice management and debugging
 import argparse
 import sys
 import time
+from .echoform import EchoForm
 from .storage import get_storage, close_storage
 from .cls import get_stored_forms, clear_stored_forms
 
@@ -74,8 +75,42 @@ def cmd_lattice_decay(args):
     storage = get_storage()
     
     print(f"Applying time-decay with τ = {args.tau} days...")
-    storage.apply_time_decay(args.tau)
-    print("Time-decay applied to all forms")
+    updated = storage.apply_time_decay(args.tau)
+    print(f"Time-decay applied to {updated} forms")
+
+
+def cmd_lattice_compact(args):
+    """Roll up old cls_event terms of hot forms"""
+    storage = get_storage()
+    
+    max_age = args.max_age_days * 24 * 3600 if args.max_age_days is not None else None
+    compacted = storage.compact_forms(threshold=args.threshold, max_age=max_age,
+                                      keep=args.keep, tolerance=args.tolerance)
+    print(f"Compacted {compacted} forms")
+
+
+def cmd_lattice_search(args):
+    """Search stored identities by content"""
+    storage = get_storage()
+    
+    identities = storage.search_identities(args.query, limit=args.limit, mode=args.mode)
+    if not identities:
+        print(f"No identities match: {args.query}")
+        return
+    
+    print(f"{'ID':<40} {'Type':<8} {'Raw':<30}")
+    print("-" * 80)
+    for identity in identities:
+        raw = (identity.raw or "").replace("\n", " ")
+        print(f"{identity.id:<40} {identity.identity_type:<8} {raw[:30]:<30}")
+
+
+def cmd_lattice_reindex(args):
+    """Compact the identity search index"""
+    storage = get_storage()
+    
+    postings = storage.compact_search_index()
+    print(f"Search index compacted: {postings} postings")
 
 
 def cmd_lattice_clear(args):
@@ -127,6 +162,30 @@ def main():
                              help='Decay time constant in days')
     decay_parser.set_defaults(func=cmd_lattice_decay)
     
+    # lattice compact
+    compact_parser = lattice_subparsers.add_parser('compact', help='Roll up old cls_event terms')
+    compact_parser.add_argument('--threshold', type=int,
+                                help=f'Compact forms with at least N terms (default: {EchoForm.COMPACT_THRESHOLD})')
+    compact_parser.add_argument('--keep', type=int,
+                                help=f'Recent cls_event terms to leave as they are (default: {EchoForm.COMPACT_KEEP})')
+    compact_parser.add_argument('--max-age-days', type=float,
+                                help='Also roll up cls_event terms older than N days, in every form')
+    compact_parser.add_argument('--tolerance', type=float,
+                                help=f"Allowed relative change of a form's intensity (default: {EchoForm.COMPACT_TOLERANCE})")
+    compact_parser.set_defaults(func=cmd_lattice_compact)
+    
+    # lattice search
+    search_parser = lattice_subparsers.add_parser('search', help='Search identities by content')
+    search_parser.add_argument('query', help='Words to search for')
+    search_parser.add_argument('--limit', type=int, default=10, help='Max identities to show')
+    search_parser.add_argument('--mode', choices=['bm25', 'substring'], default='bm25',
+                               help='Ranked word search or verbatim substring match')
+    search_parser.set_defaults(func=cmd_lattice_search)
+    
+    # lattice reindex
+    reindex_parser = lattice_subparsers.add_parser('reindex', help='Compact the identity search index')
+    reindex_parser.set_defaults(func=cmd_lattice_reindex)
+    
     # lattice clear
     clear_parser = lattice_subparsers.add_parser('clear', help='Clear all forms')
     clear_parser.add_argument('--confirm', action='store_true',
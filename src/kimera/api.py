@@ -9,11 +9,13 @@ Simple, clear API for using Kimera's capabilities:
 """
 
 from typing import Tuple, List, Dict, Optional
-from .geoid import init_geoid, Geoid
-from .resonance import resonance as basic_resonance
+import numpy as np
+from .geoid import init_geoid, init_geoids_batch, Geoid
+from .resonance import resonance as basic_resonance, resonance_matrix
 from .enhanced_resonance import resonance_v2, resonance_v3
 from .contradiction import is_contradiction
 from .advanced_patterns import extract_patterns_advanced, Pattern
+from .vector_index import FlatIndex, index_path, load_index, make_index
 
 class Kimera:
     """Main API class for Kimera functionality."""
@@ -36,6 +38,9 @@ class Kimera:
             3: resonance_v3
         }
         self.resonance_func = self.resonance_funcs.get(resonance_version, resonance_v3)
+        
+        # Indexed knowledge base for find_cross_domain_insights
+        self.knowledge_index: Optional[FlatIndex] = None
     
     def find_resonance(self, text1: str, text2: str) -> Dict[str, any]:
         """
@@ -130,9 +135,53 @@ class Kimera:
         patterns = extract_patterns_advanced(text)
         return [self._pattern_to_dict(p) for p in patterns]
     
+    def index_knowledge(self, knowledge_base: List[str], kind: str = "ivf",
+                        **index_kwargs) -> FlatIndex:
+        """
+        Add texts to the indexed knowledge base.
+        
+        Texts are embedded once here; later calls to
+        find_cross_domain_insights without an explicit knowledge base
+        only score the nearest candidates instead of every text.
+        
+        Args:
+            knowledge_base: Texts to add (already indexed texts are updated)
+            kind: Index type for a new index ("ivf" or "flat")
+            **index_kwargs: Extra arguments for a new index (e.g. n_probe)
+            
+        Returns:
+            The knowledge index
+        """
+        geoids = init_geoids_batch(knowledge_base, self.lang, ["insight"])
+        if self.knowledge_index is None:
+            if not geoids:
+                raise ValueError("index_knowledge needs at least one text to size the index")
+            self.knowledge_index = make_index(len(geoids[0].sem_vec), kind, **index_kwargs)
+        if geoids:
+            self.knowledge_index.add(knowledge_base, np.stack([g.sem_vec for g in geoids]))
+        return self.knowledge_index
+    
+    def forget_knowledge(self, knowledge_base: List[str]) -> int:
+        """Remove texts from the indexed knowledge base; returns how many were removed."""
+        if self.knowledge_index is None:
+            return 0
+        return self.knowledge_index.remove(knowledge_base)
+    
+    def save_knowledge_index(self, path: Optional[str] = None) -> str:
+        """Persist the knowledge index (defaults to next to the lattice database)."""
+        if self.knowledge_index is None:
+            raise ValueError("No knowledge index to save; call index_knowledge first")
+        return str(self.knowledge_index.save(path or index_path(name="knowledge")))
+    
+    def load_knowledge_index(self, path: Optional[str] = None) -> FlatIndex:
+        """Load a knowledge index written by save_knowledge_index."""
+        self.knowledge_index = load_index(path or index_path(name="knowledge"))
+        return self.knowledge_index
+    
     def find_cross_domain_insights(self, concept: str, 
-                                  knowledge_base: List[str], 
-                                  threshold: float = 0.5) -> List[Dict[str, any]]:
+                                  knowledge_base: Optional[List[str]] = None, 
+                                  threshold: float = 0.5,
+                                  k: int = 50) -> List[Dict[str, any]]:
         """
         Find insights by discovering resonances with a knowledge base.
         
@@ -143,18 +192,45 @@ class Kimera:
         
         Args:
             concept: The concept to explore
-            knowledge_base: List of texts to search for resonances
+            knowledge_base: List of texts to search for resonances. If
+                omitted, the indexed knowledge base (see index_knowledge)
+                is searched and only its k semantically nearest texts are
+                scored.
             threshold: Minimum resonance score to include
+            k: Number of index candidates to score (indexed search only)
             
         Returns:
             List of insights sorted by resonance score
         """
-        concept_geoid = init_geoid(concept, self.lang, ["insight"])
+        if knowledge_base is None:
+            if self.knowledge_index is None or not len(self.knowledge_index):
+                return []
+            concept_geoid = init_geoid(concept, self.lang, ["insight"])
+            # Raw semantic similarity upper-bounds the basic score, so the
+            # threshold can prune inside the index
+            hits = self.knowledge_index.top_k(
+                concept_geoid.sem_vec, k,
+                threshold=threshold if self.resonance_func is basic_resonance else None,
+            )
+            if not hits:
+                return []
+            knowledge_base = [text for text, _ in hits]
+            knowledge_geoids = init_geoids_batch(knowledge_base, self.lang, ["insight"])
+        else:
+            if not knowledge_base:
+                return []
+            concept_geoid, *knowledge_geoids = init_geoids_batch(
+                [concept, *knowledge_base], self.lang, ["insight"]
+            )
+        # Semantic resonance against the whole knowledge base in one pass
+        semantic_scores = resonance_matrix([concept_geoid], knowledge_geoids)[0]
         insights = []
         
-        for knowledge in knowledge_base:
-            knowledge_geoid = init_geoid(knowledge, self.lang, ["insight"])
-            score = self.resonance_func(concept_geoid, knowledge_geoid)
+        for knowledge, knowledge_geoid, semantic in zip(knowledge_base, knowledge_geoids, semantic_scores):
+            if self.resonance_func is basic_resonance:
+                score = float(semantic)
+            else:
+                score = self.resonance_func(concept_geoid, knowledge_geoid, semantic_score=float(semantic))
             
             if score >= threshold:
                 patterns = extract_patterns_advanced(knowledge)
@@ -1,20 +1,28 @@
 """Simple disk-backed embedding & resonance cache.
 
+Embeddings live in an append-only memory-mapped float32 matrix per vector
+width, indexed by a truncated SHA-256 of ``lang:text``. Legacy one-``.pkl``
+per-vector caches can be imported with :func:`migrate_pickle_cache`.
+
 Usage
 -----
 from kimera.cache import embed_cache, resonance_cache
 vec = embed_cache.get(lang, text)
 embed_cache.set(lang, text, vec)
 
-r = resonance_cache.get(gid1, gid2)  # None if missing
-resonance_cache.set(gid1, gid2, value)
+# resonance() keys entries by Geoid.vector_key() (gid + vector fingerprint)
+r = resonance_cache.get(key1, key2)  # None if missing
+resonance_cache.set(key1, key2, value)
 """
 from pathlib import Path
 import hashlib
 import joblib
 import os
+import threading
+import time
+from collections import OrderedDict
 import numpy as np
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Iterable, List, Tuple
 
 def get_cache_dir() -> Path:
     """Get the cache directory, respecting environment variable."""
@@ -36,67 +44,387 @@ def _emb_key(lang: str, text: str) -> str:
     h = hashlib.sha256(f"{lang}:{text}".encode()).hexdigest()
     return h
 
+
+def _digest(hex_key: str) -> bytes:
+    """Compact 16-byte index key from a hex ``_emb_key``."""
+    return bytes.fromhex(hex_key[:32])
+
+
+class VectorStore:
+    """Append-only, memory-mapped float32 matrix with a digest -> row index.
+
+    Files in ``root`` (one set per vector width ``dim``)::
+
+        vectors_<dim>d.f32   rows of ``dim`` little-endian float32
+        vectors_<dim>d.idx   20-byte records: 16-byte key digest + uint32 row
+
+    A row is written and flushed before its index record, so every index
+    record points at a complete row. A torn trailing record or row left by
+    a crash is ignored on open and overwritten by the next append. One
+    writer process at a time is assumed; readers in other processes pick up
+    new rows on their next miss.
+    """
+
+    _REC = np.dtype([("key", "V16"), ("row", "<u4")])
+
+    def __init__(self, root: Path, dim: int, durable: bool = False):
+        self.root = Path(root)
+        self.dim = int(dim)
+        self.durable = durable  # fsync rows before indexing them
+        self.vec_path = self.root / f"vectors_{self.dim}d.f32"
+        self.idx_path = self.root / f"vectors_{self.dim}d.idx"
+        self._row_bytes = self.dim * 4
+        self._lock = threading.RLock()
+        self._index: Dict[bytes, int] = {}
+        self._idx_pos = 0      # bytes of the index file already loaded
+        self._rows = 0         # complete rows backed by index records
+        self._mm: Optional[np.memmap] = None
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _refresh(self) -> None:
+        """Load index records appended since the last refresh."""
+        try:
+            size = self.idx_path.stat().st_size
+            vec_rows = self.vec_path.stat().st_size // self._row_bytes
+        except FileNotFoundError:
+            return
+        end = size - size % self._REC.itemsize
+        if end <= self._idx_pos:
+            return
+        with open(self.idx_path, "rb") as f:
+            f.seek(self._idx_pos)
+            recs = np.frombuffer(f.read(end - self._idx_pos), dtype=self._REC)
+        for key, row in zip(recs["key"].tolist(), recs["row"].tolist()):
+            if row < vec_rows:
+                self._index[key] = row
+                self._rows = max(self._rows, row + 1)
+        self._idx_pos = end
+
+    def _matrix(self, need_rows: int) -> np.memmap:
+        if self._mm is None or self._mm.shape[0] < need_rows:
+            rows = self.vec_path.stat().st_size // self._row_bytes
+            self._mm = np.memmap(self.vec_path, dtype="<f4", mode="r", shape=(rows, self.dim))
+        return self._mm
+
+    def get_rows(self, keys: List[bytes]) -> Tuple[List[int], Optional[np.ndarray]]:
+        """Return ``(positions, vectors)`` for the keys present in the store."""
+        with self._lock:
+            rows = [self._index.get(k) for k in keys]
+            if any(r is None for r in rows):
+                self._refresh()
+                rows = [self._index.get(k) if r is None else r for k, r in zip(keys, rows)]
+            hits = [i for i, r in enumerate(rows) if r is not None]
+            if not hits:
+                return [], None
+            take = np.fromiter((rows[i] for i in hits), dtype=np.int64, count=len(hits))
+            return hits, np.array(self._matrix(int(take.max()) + 1)[take])
+
+    def append(self, keys: List[bytes], vecs: np.ndarray) -> None:
+        """Append ``vecs`` (one row per key); keys already stored are skipped."""
+        vecs = np.asarray(vecs, dtype="<f4").reshape(len(keys), self.dim)
+        with self._lock:
+            self._refresh()
+            fresh, seen = [], set()
+            for i, k in enumerate(keys):
+                if k not in self._index and k not in seen:
+                    seen.add(k)
+                    fresh.append(i)
+            if not fresh:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.vec_path, "ab") as vf:
+                # Drop any torn row so new rows stay aligned
+                start = vf.seek(0, os.SEEK_END) // self._row_bytes
+                vf.truncate(start * self._row_bytes)
+                vf.seek(start * self._row_bytes)
+                vf.write(np.ascontiguousarray(vecs[fresh]).tobytes())
+                vf.flush()
+                if self.durable:
+                    os.fsync(vf.fileno())
+            recs = np.empty(len(fresh), dtype=self._REC)
+            recs["key"] = [keys[i] for i in fresh]
+            recs["row"] = np.arange(start, start + len(fresh), dtype=np.uint32)
+            with open(self.idx_path, "ab") as xf:
+                end = xf.seek(0, os.SEEK_END)
+                end -= end % self._REC.itemsize
+                xf.truncate(end)
+                xf.seek(end)
+                xf.write(recs.tobytes())
+                xf.flush()
+                if self.durable:
+                    os.fsync(xf.fileno())
+            self._refresh()
+
+    def size_bytes(self) -> int:
+        total = 0
+        for path in (self.vec_path, self.idx_path):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def close(self) -> None:
+        with self._lock:
+            self._mm = None
+
+
 class EmbeddingCache:
-    """Simple file-based embedding cache using one file per vector."""
-    
+    """Disk-backed embedding cache on memory-mapped :class:`VectorStore` files.
+
+    Vectors are grouped by width, one store per ``dim``. Lookups are a hash
+    plus a dict probe and a row read, and stats come from counters and two
+    ``stat`` calls instead of a directory listing.
+    """
+
+    def __init__(self, durable: bool = False):
+        self.durable = durable
+        self._lock = threading.RLock()
+        self._root: Optional[Path] = None
+        self._stores: Dict[int, VectorStore] = {}
+
+    def _open(self) -> Dict[int, VectorStore]:
+        """Stores for the current cache dir (reopened if KIMERA_CACHE_DIR changed)."""
+        root = get_cache_dir()
+        with self._lock:
+            if root != self._root:
+                self._close_stores()
+                self._root = root
+                for idx in root.glob("vectors_*d.idx"):
+                    dim = int(idx.name[len("vectors_"):-len("d.idx")])
+                    self._stores[dim] = VectorStore(root, dim, self.durable)
+            return self._stores
+
+    def reload(self) -> None:
+        """Forget open stores; they are rediscovered on next access."""
+        with self._lock:
+            self._close_stores()
+            self._root = None
+
+    def _close_stores(self) -> None:
+        for store in self._stores.values():
+            store.close()
+        self._stores = {}
+
     def get(self, lang: str, text: str) -> Optional[np.ndarray]:
         """Get cached embedding vector."""
-        try:
-            path = get_cache_dir() / f"{_emb_key(lang, text)}.pkl"
-            return joblib.load(path) if path.exists() else None
-        except Exception:
-            return None
-    
+        return self.get_many([(lang, text)])[0]
+
     def set(self, lang: str, text: str, vec: np.ndarray) -> None:
         """Store embedding vector in cache."""
+        self.set_many([(lang, text, vec)])
+
+    def get_many(self, keys: Iterable[Tuple[str, str]]) -> List[Optional[np.ndarray]]:
+        """Get cached vectors for ``(lang, text)`` keys, ``None`` for misses."""
+        keys = list(keys)
+        out: List[Optional[np.ndarray]] = [None] * len(keys)
         try:
-            path = get_cache_dir() / f"{_emb_key(lang, text)}.pkl"
-            joblib.dump(vec.copy(), path)
+            stores = self._open()
+            if not stores:
+                return out
+            digests = [_digest(_emb_key(lang, text)) for lang, text in keys]
+            for store in stores.values():
+                pending = [i for i, v in enumerate(out) if v is None]
+                if not pending:
+                    break
+                hits, block = store.get_rows([digests[i] for i in pending])
+                for j, pos in enumerate(hits):
+                    out[pending[pos]] = block[j]
         except Exception:
             pass
-    
+        return out
+
+    def set_many(self, items: Iterable[Tuple[str, str, np.ndarray]]) -> None:
+        """Store ``(lang, text, vec)`` triples in the cache."""
+        try:
+            by_dim: Dict[int, Tuple[List[bytes], List[np.ndarray]]] = {}
+            for lang, text, vec in items:
+                vec = np.asarray(vec).ravel()
+                keys, vecs = by_dim.setdefault(vec.shape[0], ([], []))
+                keys.append(_digest(_emb_key(lang, text)))
+                vecs.append(vec)
+            self.set_digests(by_dim)
+        except Exception:
+            pass
+
+    def set_digests(self, by_dim: Dict[int, Tuple[List[bytes], List[np.ndarray]]]) -> None:
+        """Append pre-hashed vectors, grouped as ``{dim: (digests, vecs)}``."""
+        stores = self._open()
+        with self._lock:
+            for dim, (keys, vecs) in by_dim.items():
+                if dim not in stores:
+                    stores[dim] = VectorStore(self._root, dim, self.durable)
+                stores[dim].append(keys, np.stack(vecs))
+
     def clear(self) -> None:
-        """Clear the cache."""
+        """Clear the cache (vector stores and any legacy ``.pkl`` files)."""
         try:
             cache_dir = get_cache_dir()
-            for pkl_file in cache_dir.glob("*.pkl"):
-                pkl_file.unlink()
+            self.reload()
+            for path in list(cache_dir.glob("vectors_*d.*")) + list(cache_dir.glob("*.pkl")):
+                path.unlink()
         except Exception:
             pass
-    
+
     def _get_cache_size(self) -> int:
         """Get number of cached embeddings."""
         try:
-            cache_dir = get_cache_dir()
-            return len(list(cache_dir.glob("*.pkl")))
+            return sum(len(store) for store in self._open().values())
+        except Exception:
+            return 0
+
+    def _get_cache_bytes(self) -> int:
+        try:
+            return sum(store.size_bytes() for store in self._open().values())
         except Exception:
             return 0
 
 embed_cache = EmbeddingCache()
 
+
+def migrate_pickle_cache(cache_dir: Optional[Path] = None, delete: bool = False,
+                         batch: int = 4096) -> int:
+    """Import a legacy one-``.pkl``-per-vector cache into the vector store.
+
+    Pickle file names are the same SHA-256 keys the store indexes on, so the
+    migration is lossless. Returns the number of vectors imported.
+
+    Args:
+        cache_dir: Directory holding ``*.pkl`` files (default: current cache dir).
+        delete: Remove each ``.pkl`` file once it has been imported.
+        batch: Vectors appended per write.
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir()
+    stores: Dict[int, VectorStore] = {}
+    pending: Dict[int, Tuple[List[bytes], List[np.ndarray]]] = {}
+    done: List[Path] = []
+    migrated = 0
+
+    def flush():
+        for dim, (keys, vecs) in pending.items():
+            if dim not in stores:
+                stores[dim] = VectorStore(cache_dir, dim)
+            stores[dim].append(keys, np.stack(vecs))
+        if delete:
+            for path in done:
+                path.unlink()
+        pending.clear()
+        done.clear()
+
+    for path in sorted(cache_dir.glob("*.pkl")):
+        try:
+            key = _digest(path.stem)
+            vec = np.asarray(joblib.load(path), dtype=np.float32).ravel()
+        except Exception:
+            continue  # not a cache entry
+        keys, vecs = pending.setdefault(vec.shape[0], ([], []))
+        keys.append(key)
+        vecs.append(vec)
+        done.append(path)
+        migrated += 1
+        if len(done) >= batch:
+            flush()
+    flush()
+
+    # Let the shared cache pick up stores created by the migration
+    embed_cache.reload()
+    return migrated
+
+
 # ---------- Resonance cache ----------
 
-def _res_key(gid1: str, gid2: str) -> str:
-    """Generate a unique key for resonance cache."""
-    return "|".join(sorted([gid1, gid2]))
+RESONANCE_CACHE_SIZE = int(os.getenv("KIMERA_RESONANCE_CACHE_SIZE", "100000"))
+_ttl_env = os.getenv("KIMERA_RESONANCE_CACHE_TTL")
+RESONANCE_CACHE_TTL: Optional[float] = float(_ttl_env) if _ttl_env else None
+
+
+def _res_key(gid1: str, gid2: str) -> Tuple[str, str]:
+    """Order-independent key for resonance cache."""
+    return (gid1, gid2) if gid1 <= gid2 else (gid2, gid1)
 
 class ResonanceCache:
-    """In-memory resonance cache for current session."""
+    """Bounded in-memory resonance cache with LRU eviction and optional TTL.
+
+    Args:
+        capacity: Maximum number of pairs kept; least recently used go first.
+        ttl: Seconds an entry stays valid, or ``None`` for no expiry.
+    """
     
-    def __init__(self):
-        self._mem = {}
+    def __init__(self, capacity: int = RESONANCE_CACHE_SIZE, ttl: Optional[float] = RESONANCE_CACHE_TTL):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.ttl = ttl
+        self._mem: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._expires: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._mem)
     
     def get(self, gid1: str, gid2: str) -> Optional[Any]:
         """Get cached resonance value."""
-        return self._mem.get(_res_key(gid1, gid2))
+        key = _res_key(gid1, gid2)
+        with self._lock:
+            value = self._mem.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            if self.ttl is not None and self._expires[key] < time.monotonic():
+                del self._mem[key]
+                del self._expires[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return value
     
     def set(self, gid1: str, gid2: str, value: Any) -> None:
         """Store resonance value in cache."""
-        self._mem[_res_key(gid1, gid2)] = value
+        key = _res_key(gid1, gid2)
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            while len(self._mem) > self.capacity:
+                old, _ = self._mem.popitem(last=False)
+                self._expires.pop(old, None)
+                self.evictions += 1
     
     def clear(self) -> None:
         """Clear all cached resonance values."""
-        self._mem.clear()
+        with self._lock:
+            self._mem.clear()
+            self._expires.clear()
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/eviction counters."""
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, capacity and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._mem),
+                "capacity": self.capacity,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
 
 resonance_cache = ResonanceCache()
 
@@ -113,16 +441,16 @@ def get_cache_stats() -> dict:
     
     stats = {
         "embedding_cache_size": embedding_count,
-        "resonance_cache_size": len(resonance_cache._mem),
+        "resonance_cache_size": len(resonance_cache),
         "cache_dir": str(cache_dir),
         "cache_file_exists": embedding_count > 0
     }
     
-    # Calculate total cache size
-    try:
-        total_size = sum(f.stat().st_size for f in cache_dir.glob("*.pkl"))
-        stats["cache_file_size_mb"] = total_size / (1024 * 1024)
-    except Exception:
-        stats["cache_file_size_mb"] = 0
+    for name, value in resonance_cache.stats().items():
+        if name != "size":
+            stats[f"resonance_cache_{name}"] = value
+    
+    # Total cache size (vector and index files)
+    stats["cache_file_size_mb"] = embed_cache._get_cache_bytes() / (1024 * 1024)
     
     return stats
\ No newline at end of file
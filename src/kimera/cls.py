@@ -49,7 +49,7 @@ def lattice_resolve(identity_a: Union[Identity, Geoid], identity_b: Union[Identi
     anchor = f"{identity_a.id}_{identity_b.id}"
     
     # Check if we already have a form for this pair
-    existing_form = storage.fetch_form(anchor)
+    existing_form = storage.fetch_form(anchor, term_table=True)
     
     if existing_form:
         # Existing form - append cls_event term with entropy tracking
@@ -66,6 +66,9 @@ def lattice_resolve(identity_a: Union[Identity, Geoid], identity_b: Union[Identi
             entropy_a=entropy_a,
             entropy_b=entropy_b
         )
+        # Hot pairs roll their old cls_event terms up so the form stays bounded
+        if len(existing_form.terms) >= existing_form.COMPACT_THRESHOLD:
+            existing_form.compact_terms()
         storage.update_form(existing_form)
         
         # Store identity references if not already stored
@@ -281,17 +284,13 @@ def get_identity_lattice_metrics(identity_id: str) -> Dict[str, Any]:
     if not identity:
         return {"error": "Identity not found"}
     
-    # Find all forms that reference this identity
-    forms_metadata = storage.list_forms(limit=1000, domain="cls")
-    related_forms = []
-    
-    for meta in forms_metadata:
-        form = storage.fetch_form(meta["anchor"])
-        if form and identity_id in str(form.topology):
-            related_forms.append(form)
+    # Forms that reference this identity and identities that relate it,
+    # aggregated in storage
+    stats = storage.get_identity_lattice_stats(identity_id)
+    related_forms = stats["related_forms_count"]
+    total_intensity = stats["total_lattice_intensity"]
     
     # Calculate metrics
-    total_intensity = sum(form.intensity_sum() for form in related_forms)
     avg_entropy = identity.entropy()
     effective_tau = identity.effective_tau()
     
@@ -299,10 +298,12 @@ def get_identity_lattice_metrics(identity_id: str) -> Dict[str, Any]:
         "identity_id": identity_id,
         "entropy": avg_entropy,
         "effective_tau": effective_tau,
-        "related_forms_count": len(related_forms),
+        "related_forms_count": related_forms,
         "total_lattice_intensity": total_intensity,
-        "avg_form_intensity": total_intensity / len(related_forms) if related_forms else 0,
-        "lattice_participation": len(related_forms)  # How many lattice operations this identity has participated in
+        "avg_form_intensity": total_intensity / related_forms if related_forms else 0,
+        "lattice_participation": related_forms,  # How many lattice operations this identity has participated in
+        "relationship_count": stats["relationship_count"],
+        "relationship_weight": stats["relationship_weight"]
     }
 
 
@@ -312,8 +313,10 @@ def clear_stored_forms() -> None:
     Now clears from persistent storage
     """
     storage = get_storage()
-    # For testing, we'll delete all CLS domain forms
-    storage._conn.execute("DELETE FROM echoforms WHERE domain = 'cls'")
+    # For testing, we'll delete all CLS domain forms (staged ones included)
+    with storage._lock:
+        storage.flush()
+        storage._conn.execute("DELETE FROM echoforms WHERE domain = 'cls'")
 
 
 def get_form_by_anchor(anchor: str) -> EchoForm:
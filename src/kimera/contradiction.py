@@ -7,95 +7,51 @@ concern from resonance. While resonance measures structural similarity,
 contradiction detection identifies logical incompatibility.
 """
 
-import re
 from typing import Tuple, List
+from .features import (  # noqa: F401  (constants re-exported)
+    ANTONYM_PAIRS, COMMON_WORDS, NEGATION_WORDS, TextFeatures, features_of, text_features,
+)
 from .geoid import Geoid
 from .resonance import resonance
 
-# Negation patterns
-NEGATION_WORDS = {
-    "not", "no", "never", "cannot", "can't", "won't", "doesn't", 
-    "isn't", "aren't", "wasn't", "weren't", "don't", "didn't", 
-    "hasn't", "haven't", "hadn't", "none", "neither", "nor"
-}
-
-# Antonym patterns (expandable)
-ANTONYM_PAIRS = [
-    ("hot", "cold"), ("cold", "hot"),
-    ("black", "white"), ("white", "black"),
-    ("true", "false"), ("false", "true"),
-    ("round", "flat"), ("flat", "round"),
-    ("can", "cannot"), ("cannot", "can"),
-    ("is", "is not"), ("is not", "is"),
-    ("are", "are not"), ("are not", "are"),
-    ("fly", "cannot fly"), ("cannot fly", "fly"),
-]
-
 def extract_core_claim(text: str) -> Tuple[str, str, bool]:
     """
     Extract subject, predicate, and whether it's negated.
     Simple heuristic parser.
     """
-    text = text.lower().strip()
-    has_negation = any(neg in text for neg in NEGATION_WORDS)
-    
-    # Simple pattern matching for "X is Y" type statements
-    patterns = [
-        r"(\w+)\s+(?:is|are)\s+(.+)",
-        r"(\w+)\s+(?:can|cannot)\s+(.+)",
-        r"(\w+)\s+(?:have|has)\s+(.+)",
-        r"(\w+)\s+(?:live|lives)\s+(.+)",
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, text)
-        if match:
-            subject = match.group(1)
-            predicate = match.group(2)
-            return subject, predicate, has_negation
-    
-    # Fallback
-    words = text.split()
-    if len(words) >= 2:
-        return words[0], " ".join(words[1:]), has_negation
-    return text, "", has_negation
+    features = text_features(text)
+    return features.subject, features.predicate, features.negated
 
-def detect_antonym_contradiction(text1: str, text2: str) -> bool:
-    """Check if texts contain antonymous predicates about the same subject."""
-    subj1, pred1, neg1 = extract_core_claim(text1)
-    subj2, pred2, neg2 = extract_core_claim(text2)
-    
+def _antonym_contradiction(f1: TextFeatures, f2: TextFeatures) -> bool:
     # Same subject check (fuzzy)
-    if subj1.lower() != subj2.lower():
+    if f1.subject != f2.subject:
         return False
     
     # Check for antonym pairs
+    if not f1.antonym_hits or not f2.antonym_hits:
+        return False
     for ant1, ant2 in ANTONYM_PAIRS:
-        if ant1 in pred1 and ant2 in pred2:
+        if ant1 in f1.antonym_hits and ant2 in f2.antonym_hits:
             return True
-        if ant2 in pred1 and ant1 in pred2:
+        if ant2 in f1.antonym_hits and ant1 in f2.antonym_hits:
             return True
     
     return False
 
-def detect_negation_contradiction(text1: str, text2: str) -> bool:
-    """Check if one text negates the other."""
-    # Remove common words to focus on content
-    common_words = {"the", "a", "an", "is", "are", "in", "on", "at"}
-    
-    words1 = set(text1.lower().split()) - common_words
-    words2 = set(text2.lower().split()) - common_words
-    
+def _negation_contradiction(f1: TextFeatures, f2: TextFeatures) -> bool:
     # Check if texts share significant content
-    overlap = words1 & words2
-    if len(overlap) < 2:  # Not about the same thing
+    if len(f1.words & f2.words) < 2:  # Not about the same thing
         return False
     
-    # Check if one has negation and the other doesn't
-    has_neg1 = any(neg in text1.lower() for neg in NEGATION_WORDS)
-    has_neg2 = any(neg in text2.lower() for neg in NEGATION_WORDS)
-    
-    return has_neg1 != has_neg2  # XOR - one negated, one not
+    return f1.negated != f2.negated  # XOR - one negated, one not
+
+def detect_antonym_contradiction(text1: str, text2: str) -> bool:
+    """Check if texts contain antonymous predicates about the same subject."""
+    return _antonym_contradiction(text_features(text1), text_features(text2))
+
+def detect_negation_contradiction(text1: str, text2: str) -> bool:
+    """Check if one text negates the other."""
+    return _negation_contradiction(text_features(text1), text_features(text2))
 
 def detect_contradiction(geoid1: Geoid, geoid2: Geoid) -> Tuple[bool, float, str]:
     """
@@ -104,8 +60,9 @@ def detect_contradiction(geoid1: Geoid, geoid2: Geoid) -> Tuple[bool, float, str
     Returns:
         (is_contradiction, confidence, reasoning)
     """
-    text1 = geoid1.raw.lower()
-    text2 = geoid2.raw.lower()
+    # Token/claim features are precomputed per geoid, not per pair
+    f1 = features_of(geoid1)
+    f2 = features_of(geoid2)
     
     # First check resonance - high resonance usually means no contradiction
     res_score = resonance(geoid1, geoid2)
@@ -113,12 +70,12 @@ def detect_contradiction(geoid1: Geoid, geoid2: Geoid) -> Tuple[bool, float, str
         return False, 0.9, f"High resonance ({res_score:.3f}) indicates compatibility"
     
     # Check for antonym-based contradictions
-    if detect_antonym_contradiction(text1, text2):
+    if _antonym_contradiction(f1, f2):
         confidence = 0.85 if res_score < 0.3 else 0.7
         return True, confidence, "Antonymous predicates about same subject"
     
     # Check for negation-based contradictions
-    if detect_negation_contradiction(text1, text2):
+    if _negation_contradiction(f1, f2):
         confidence = 0.75 if res_score < 0.4 else 0.6
         return True, confidence, "One statement negates the other"
     
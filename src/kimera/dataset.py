@@ -1,7 +1,7 @@
 import csv
 import os
 from pathlib import Path
-from .geoid import init_geoid
+from .geoid import init_geoids_batch
 
 def load_toy_dataset(path: Path = None):
     """Load dataset from CSV file. Supports both old and new formats."""
@@ -13,7 +13,7 @@ def load_toy_dataset(path: Path = None):
         else:
             path = Path(__file__).parent.parent.parent / "data" / "toy_contradictions.csv"
     
-    geoids = []
+    texts, langs = [], []
     with path.open(encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -22,9 +22,10 @@ def load_toy_dataset(path: Path = None):
             lang = row.get("lang", "en")
             
             if text and lang:
-                geoids.append(init_geoid(text, lang, ["default"]))
+                texts.append(text)
+                langs.append(lang)
     
-    return geoids
+    return init_geoids_batch(texts, langs, ["default"])
 
 def load_dataset(path: Path):
     """Load dataset from specified path."""
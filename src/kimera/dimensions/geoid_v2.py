@@ -286,7 +286,7 @@ class GeoidV2:
             'lang_axis': self.lang_axis,
             'context_layers': self.context_layers,
             'vdr': self.vdr,
-            'scars': self.scars,
+            'scars': list(self.scars),
             'dimensions': {
                 dim_type.value: {
                     'value': dim.value,
@@ -9,8 +9,13 @@ import math
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+import numpy as np
+
 # Import entropy functions for enhanced time decay
-from .entropy import calculate_term_entropy, entropy_weighted_decay, DEFAULT_TAU_SECONDS
+from .entropy import (calculate_term_entropy, calculate_grouped_entropy, entropy_weighted_decay, adaptive_tau,
+                      DEFAULT_TAU_SECONDS)
+from . import echoform_codec
+from .term_table import TermTable
 
 # Time-decay constant (τ = 14 days in seconds)
 TIME_DECAY_TAU = DEFAULT_TAU_SECONDS
@@ -24,7 +29,8 @@ class EchoForm:
     Attributes:
         anchor: Primary identifier for the form
         domain: Domain classification (default: "echo")
-        terms: List of term dictionaries with symbol, role, intensity
+        terms: List of term dictionaries with symbol, role, intensity, or a
+            TermTable holding the same terms in columns (see ``reinflate``)
         phase: Current phase of the form (default: "active")
         recursive: Whether form supports recursive operations
         topology: JSON-serializable topology data
@@ -37,6 +43,11 @@ class EchoForm:
     MAX_TERMS = 10000
     MAX_TOPOLOGY_SIZE = 1000000  # 1MB
 
+    # Term compaction (see compact_terms)
+    COMPACT_THRESHOLD = 1000  # terms at which lattice_resolve compacts a form
+    COMPACT_KEEP = 100  # most recent cls_event terms left as they are
+    COMPACT_TOLERANCE = 1e-6  # relative change of intensity_sum allowed
+
     def __init__(self, anchor: str = "", domain: str = "echo", config: Optional[Dict[str, Any]] = None, **kwargs):
         """
         Backward-compatible constructor that supports:
@@ -119,23 +130,29 @@ class EchoForm:
         hash_obj = hashlib.sha256(base_string.encode('utf-8'))
         return hash_obj.hexdigest()[:16]
 
-    def intensity_sum(self, apply_time_decay: bool = True, use_entropy_weighting: bool = True) -> float:
+    def intensity_sum(self, apply_time_decay: bool = True, use_entropy_weighting: bool = True,
+                      at: Optional[float] = None) -> float:
         """
         Calculate total intensity across all terms with optional time-decay weighting
         
         Args:
             apply_time_decay: Whether to apply time-decay weighting (default: True)
             use_entropy_weighting: Whether to use entropy-weighted decay (requires apply_time_decay=True)
+            at: Unix time to evaluate the decay at (default: now)
         
         Returns:
             Sum of intensity values from all terms, optionally weighted by time decay
         """
+        if isinstance(self.terms, TermTable):
+            return self._table_intensity_sum(apply_time_decay, use_entropy_weighting, at)
+
         if not apply_time_decay:
-            # Simple sum without time decay
-            return sum(term.get("intensity", 0.0) for term in self.terms)
+            # Simple sum without time decay (rollup terms count what they merged)
+            return sum(term["rollup_intensity"] if "rollup_intensity" in term else term.get("intensity", 0.0)
+                       for term in self.terms)
         
         # Apply time-decay weighting
-        current_time = time.time()
+        current_time = time.time() if at is None else at
         total_intensity = 0.0
         
         # Calculate entropy for entropy-weighted decay
@@ -179,6 +196,42 @@ class EchoForm:
         
         return total_intensity
 
+    def _table_intensity_sum(self, apply_time_decay: bool, use_entropy_weighting: bool,
+                             at: Optional[float]) -> float:
+        """``intensity_sum`` over a TermTable, as numpy reductions over its columns"""
+        intensities, has_intensity, odd_intensities = self.terms.numbers("intensity")
+        base = np.where(has_intensity, intensities, 0.0)
+        if not apply_time_decay:
+            # Rollup terms count what they merged
+            rollups = self.terms.extras.get("rollup_intensity", {})
+            if rollups:
+                base[list(rollups)] = list(rollups.values())
+            return float(base.sum()) + sum(v for row, v in odd_intensities.items() if row not in rollups)
+
+        current_time = time.time() if at is None else at
+        tau = TIME_DECAY_TAU
+        if use_entropy_weighting:
+            entropy = self.entropy()
+            if entropy > 0:
+                tau = adaptive_tau(TIME_DECAY_TAU, entropy)
+
+        # Terms without a timestamp decay from the form's creation, or not at all
+        timestamps, timed, odd_timestamps = self.terms.numbers("timestamp")
+        created = self.echo_created_at
+        age = np.where(timed, current_time - timestamps, 0.0 if created is None else current_time - created)
+        if created is not None:
+            timed = np.ones_like(timed)
+        for row, timestamp in odd_timestamps.items():
+            if timestamp is not None:
+                age[row] = current_time - timestamp
+                timed[row] = True
+        factor = np.where(timed, np.exp(-age / tau), 1.0)
+
+        total = float((base * factor).sum())
+        for row, intensity in odd_intensities.items():
+            total += intensity * factor[row]
+        return total
+
     def entropy(self) -> float:
         """
         Calculate Shannon entropy of the EchoForm's term intensities.
@@ -186,7 +239,32 @@ class EchoForm:
         Returns:
             Shannon entropy value in bits
         """
-        return calculate_term_entropy(self.terms)
+        if not isinstance(self.terms, TermTable):
+            return calculate_term_entropy(self.terms)
+
+        intensities, has_intensity, odd_intensities = self.terms.numbers("intensity")
+        # Rollup terms count as the terms they merged (see calculate_term_entropy)
+        rollups = self.terms.extras.get("rollup_intensity", {})
+        rollup_entropy = self.terms.extras.get("rollup_entropy", {})
+        single = has_intensity & (intensities > 0)
+        if rollups:
+            single[list(rollups)] = False
+        positive = intensities[single]
+        odd = [float(v) for row, v in odd_intensities.items()
+               if isinstance(v, (int, float)) and v > 0 and row not in rollups]
+        if odd:
+            positive = np.concatenate([positive, odd])
+        groups = [(weight, rollup_entropy.get(row, 0.0)) for row, weight in rollups.items() if weight > 0]
+        total = positive.sum() + sum(weight for weight, _ in groups)
+        if total <= 0:
+            return 0.0
+        probs = positive / total
+        probs = probs[probs > 0]
+        entropy = float(-(probs * np.log2(probs)).sum())
+        for weight, group_entropy in groups:
+            p = weight / total
+            entropy += p * (group_entropy - math.log2(p))
+        return entropy
 
     def effective_tau(self, base_tau: Optional[float] = None, k: float = 0.1) -> float:
         """
@@ -206,6 +284,91 @@ class EchoForm:
         # Use adaptive tau formula: tau * (1 + k * entropy)
         return base_tau * (1 + k * entropy)
 
+    def compact_terms(self, keep: Optional[int] = None, max_age: Optional[float] = None,
+                      tolerance: Optional[float] = None, at: Optional[float] = None) -> int:
+        """
+        Merge old cls_event terms into one decayed rollup term
+        
+        The merged terms are every cls_event term with a positive intensity
+        and a timestamp except the ``keep`` most recent, plus any older than
+        ``max_age``. They are replaced by one cls_event term (role
+        ``cls_rollup``) whose intensity and timestamp give their decayed
+        intensity at ``at`` and which records their count
+        (``rollup_count``), raw intensity sum (``rollup_intensity``) and
+        entropy (``rollup_entropy``), so ``entropy`` and with it the
+        decay tau are unchanged. Earlier rollups are merged again.
+        
+        ``intensity_sum`` at ``at`` is unchanged up to ``tolerance``
+        (relative); a merge that would move it further is undone. Later
+        values drift only as far as new terms shift the entropy-weighted
+        tau, and then only to second order in that shift.
+        
+        Args:
+            keep: Most recent cls_event terms to leave (default: COMPACT_KEEP)
+            max_age: Also merge cls_event terms older than this (seconds)
+            tolerance: Allowed relative change of intensity_sum (default: COMPACT_TOLERANCE)
+            at: Unix time to compact at (default: now)
+            
+        Returns:
+            Number of terms merged (0 if the form was left alone)
+        """
+        keep = self.COMPACT_KEEP if keep is None else keep
+        tolerance = self.COMPACT_TOLERANCE if tolerance is None else tolerance
+        now = time.time() if at is None else at
+        
+        candidates = []
+        for row, term in enumerate(self.terms):
+            if term.get("symbol") != "cls_event":
+                continue
+            intensity, timestamp = term.get("intensity"), term.get("timestamp")
+            if type(intensity) in (int, float) and intensity > 0 and type(timestamp) in (int, float):
+                candidates.append((timestamp, row))
+        candidates.sort()
+        merged = candidates[:max(len(candidates) - keep, 0)]
+        if max_age is not None:
+            merged += [c for c in candidates[len(merged):] if now - c[0] > max_age]
+        if len(merged) < 2:
+            return 0
+        
+        # Decay with the tau intensity_sum uses; the rollup keeps the entropy
+        entropy = self.entropy()
+        tau = adaptive_tau(TIME_DECAY_TAU, entropy) if entropy > 0 else TIME_DECAY_TAU
+        before = self.intensity_sum(at=now)
+        count, members, decayed = 0, [], []
+        for timestamp, row in merged:
+            term = self.terms[row]
+            decayed.append(term["intensity"] * math.exp(-(now - timestamp) / tau))
+            if "rollup_intensity" in term:
+                count += term.get("rollup_count", 1)
+                members.append((term["rollup_intensity"], term.get("rollup_entropy", 0.0)))
+            else:
+                count += 1
+                members.append((term["intensity"], 0.0))
+        # Timestamped at the decay-weighted mean of the merged terms, the
+        # rollup matches their sum to first order when tau later moves
+        total = sum(decayed)
+        timestamp = sum(w * t for w, (t, _) in zip(decayed, merged)) / total
+        rollup = {
+            "symbol": "cls_event",
+            "role": "cls_rollup",
+            "intensity": total * math.exp((now - timestamp) / tau),
+            "timestamp": timestamp,
+            "rollup_count": count,
+            "rollup_intensity": sum(weight for weight, _ in members),
+            "rollup_entropy": calculate_grouped_entropy([], members),
+        }
+        
+        rows = {row for _, row in merged}
+        first = min(rows)
+        kept = [rollup if row == first else term
+                for row, term in enumerate(self.terms) if row == first or row not in rows]
+        previous = self.terms
+        self.terms = TermTable(kept) if isinstance(previous, TermTable) else kept
+        if abs(self.intensity_sum(at=now) - before) > tolerance * abs(before):
+            self.terms = previous
+            return 0
+        return len(merged)
+
     def add_term(self, symbol: str, role="generic", intensity: float = 1.0, **kwargs) -> None:
         """
         Add a new term to the form
@@ -261,19 +424,40 @@ class EchoForm:
         Returns:
             JSON string representation of the form
         """
-        return json.dumps(self.__dict__, ensure_ascii=False, sort_keys=True)
+        state = self.__dict__
+        if isinstance(self.terms, TermTable):
+            state = {**state, "terms": self.terms.to_list()}
+        return json.dumps(state, ensure_ascii=False, sort_keys=True)
+
+    def pack(self) -> bytes:
+        """
+        Serialize the EchoForm to the compact binary encoding
+        
+        Returns:
+            Bytes in the format of ``echoform_codec`` (several times smaller
+            and faster to decode than ``flatten`` on term-heavy forms)
+        """
+        return echoform_codec.encode(self)
 
     @classmethod
-    def reinflate(cls, blob: str) -> 'EchoForm':
+    def reinflate(cls, blob, term_table: bool = False) -> 'EchoForm':
         """
-        Deserialize EchoForm from JSON string
+        Deserialize EchoForm from JSON string or packed bytes
         
         Args:
-            blob: JSON string representation
+            blob: JSON string representation (``flatten``) or binary
+                encoding (``pack``)
+            term_table: Hold the terms in a TermTable rather than a list
+                of dicts, so that intensity and entropy are computed over
+                numpy columns (for forms with many terms)
             
         Returns:
-            EchoForm instance reconstructed from JSON
+            EchoForm instance reconstructed from the blob
         """
+        if echoform_codec.is_packed(blob):
+            return echoform_codec.decode(blob, cls, term_table)
+        if isinstance(blob, (bytes, bytearray, memoryview)):
+            blob = bytes(blob).decode("utf-8")
         data = json.loads(blob)
         
         # Create a new instance and set the attributes
@@ -281,6 +465,8 @@ class EchoForm:
         for key, value in data.items():
             if hasattr(instance, key):
                 setattr(instance, key, value)
+        if term_table:
+            instance.terms = TermTable(instance.terms)
         
         return instance
 
@@ -300,7 +486,7 @@ class EchoForm:
         return {
             "anchor": self.anchor,
             "domain": self.domain,
-            "terms": self.terms,
+            "terms": self.terms.to_list() if isinstance(self.terms, TermTable) else self.terms,
             "phase": self.phase,
             "recursive": self.recursive,
             "topology": self.topology,
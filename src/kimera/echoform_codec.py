@@ -0,0 +1,140 @@
+"""
+Compact binary encoding of EchoForms.
+
+``EchoForm.flatten`` writes JSON that repeats every term key and number
+as text. This codec stores the terms column by column instead: symbols,
+roles and string values are indices into one string table, intensities
+and timestamps are packed float64 arrays, and any other term key
+becomes a column of its own over the terms that have it. Layout
+(little-endian), version 1::
+
+    b"EFB" | version u8 | header length u32 | header
+    n u32 | flags u8[n] | symbol u32[n] | role u32[n] | intensity f64[n] | timestamp f64[n]
+    k u32 | k x (key u32 | kind u8 | m u32 | first u32 | [rows u32[m]] | values)
+
+The header is UTF-8 JSON holding the string table and the form's other
+attributes. A column over consecutive terms only records its ``first``
+row; otherwise ``first`` is 0xFFFFFFFF and the rows follow. Its values
+are f64[m] (kind ``f``), string indices u32[m] (kind ``s``) or a
+length-prefixed JSON list (kind ``j``, for anything else), so every
+JSON-serializable term round-trips with its value types. The term
+columns are those of ``kimera.term_table.TermTable``, which both
+directions go through.
+``EchoForm.reinflate`` reads both this format and JSON.
+"""
+
+import json
+import struct
+from typing import Any, Dict
+
+import numpy as np
+
+from .term_table import TermTable
+
+MAGIC = b"EFB"
+VERSION = 1
+
+_U32 = struct.Struct("<I")
+_COLUMN = struct.Struct("<IBII")  # key, kind, rows, first row
+_SPARSE = 0xFFFFFFFF  # first row of a column whose rows are listed
+
+
+def is_packed(blob: Any) -> bool:
+    """Whether ``blob`` is a binary-encoded form (rather than JSON)."""
+    return isinstance(blob, (bytes, bytearray, memoryview)) and bytes(blob[:3]) == MAGIC
+
+
+def encode(form) -> bytes:
+    """Binary encoding of ``form``."""
+    table = form.terms if isinstance(form.terms, TermTable) else TermTable(form.terms)
+    table_strings, flags, symbols, roles, intensities, timestamps, extras = table.columns()
+    strings: Dict[str, int] = {text: index for index, text in enumerate(table_strings)}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    body = [
+        _U32.pack(len(flags)),
+        flags.tobytes(),
+        symbols.astype("<u4", copy=False).tobytes(),
+        roles.astype("<u4", copy=False).tobytes(),
+        intensities.astype("<f8", copy=False).tobytes(),
+        timestamps.astype("<f8", copy=False).tobytes(),
+        _U32.pack(len(extras)),
+    ]
+    for key, column in extras.items():
+        rows = sorted(column)
+        values = [column[row] for row in rows]
+        kinds = {type(value) for value in values}
+        if kinds == {float}:
+            kind, packed = b"f", np.array(values, dtype="<f8").tobytes()
+        elif kinds == {str}:
+            kind, packed = b"s", np.array([intern(v) for v in values], dtype="<u4").tobytes()
+        else:
+            text = json.dumps(values, ensure_ascii=False).encode("utf-8")
+            kind, packed = b"j", _U32.pack(len(text)) + text
+        if rows[-1] - rows[0] + 1 == len(rows):
+            body.append(_COLUMN.pack(intern(key), kind[0], len(rows), rows[0]))
+        else:
+            body.append(_COLUMN.pack(intern(key), kind[0], len(rows), _SPARSE))
+            body.append(np.array(rows, dtype="<u4").tobytes())
+        body.append(packed)
+
+    attributes = {k: v for k, v in form.__dict__.items() if k not in ("terms", "_recursion_depth")}
+    header = json.dumps({"strings": list(strings), "form": attributes},
+                        ensure_ascii=False).encode("utf-8")
+    return b"".join([MAGIC, bytes([VERSION]), _U32.pack(len(header)), header] + body)
+
+
+def decode(blob, cls, term_table: bool = False):
+    """The ``cls`` instance (an EchoForm class) encoded in ``blob``.
+
+    Its terms are a ``TermTable`` if ``term_table``, else a list of dicts.
+    """
+    view = memoryview(blob)
+    if bytes(view[:3]) != MAGIC:
+        raise ValueError("not a binary EchoForm")
+    if view[3] != VERSION:
+        raise ValueError(f"unsupported EchoForm encoding version {view[3]}")
+    (size,) = _U32.unpack_from(view, 4)
+    offset = 8 + size
+    header = json.loads(bytes(view[8:offset]).decode("utf-8"))
+    strings = header["strings"]
+
+    def array(dtype: str, count: int) -> np.ndarray:
+        nonlocal offset
+        values = np.frombuffer(view, dtype=dtype, count=count, offset=offset)
+        offset += values.nbytes
+        return values
+
+    (n,) = _U32.unpack_from(view, offset)
+    offset += 4
+    columns = [array(np.uint8, n), array("<u4", n), array("<u4", n), array("<f8", n), array("<f8", n)]
+
+    extras = {}
+    (count,) = _U32.unpack_from(view, offset)
+    offset += 4
+    for _ in range(count):
+        key, kind, m, first = _COLUMN.unpack_from(view, offset)
+        offset += _COLUMN.size
+        rows = array("<u4", m).tolist() if first == _SPARSE else range(first, first + m)
+        if kind == ord("f"):
+            values = array("<f8", m).tolist()
+        elif kind == ord("s"):
+            values = [strings[i] for i in array("<u4", m).tolist()]
+        else:
+            (size,) = _U32.unpack_from(view, offset)
+            offset += 4
+            values = json.loads(bytes(view[offset:offset + size]).decode("utf-8"))
+            offset += size
+        extras[strings[key]] = dict(zip(rows, values))
+
+    table = TermTable.from_columns(strings, *columns, extras)
+    form = cls.__new__(cls)
+    form._recursion_depth = 0
+    form.__dict__.update(header["form"])
+    form.terms = table if term_table else table.to_list()
+    return form
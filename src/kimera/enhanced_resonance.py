@@ -6,21 +6,26 @@ Combines semantic similarity with pattern-based analysis
 for more accurate resonance detection aligned with SWM principles.
 """
 
+from typing import Optional
 from .geoid import Geoid
 from .resonance import resonance as semantic_resonance
 from .pattern_extraction import enhanced_resonance as pattern_enhanced_resonance
 from .advanced_patterns import extract_patterns_advanced, calculate_pattern_similarity_advanced
 
-def resonance_v2(geoid1: Geoid, geoid2: Geoid) -> float:
+def resonance_v2(geoid1: Geoid, geoid2: Geoid, semantic_score: Optional[float] = None) -> float:
     """
     Enhanced resonance calculation that considers both
     semantic similarity and structural patterns.
     
     This is closer to the SWM vision of finding deep
     structural similarities across domains.
+    
+    ``semantic_score`` may be passed in when it was already computed in
+    bulk (e.g. by ``resonance_matrix``).
     """
     # Get base semantic resonance
-    semantic_score = semantic_resonance(geoid1, geoid2)
+    if semantic_score is None:
+        semantic_score = semantic_resonance(geoid1, geoid2)
     
     # Enhance with pattern analysis
     enhanced_score = pattern_enhanced_resonance(
@@ -31,15 +36,17 @@ def resonance_v2(geoid1: Geoid, geoid2: Geoid) -> float:
     
     return enhanced_score
 
-def resonance_v3(geoid1: Geoid, geoid2: Geoid) -> float:
+def resonance_v3(geoid1: Geoid, geoid2: Geoid, semantic_score: Optional[float] = None) -> float:
     """
     Advanced resonance using all four SWM pattern types.
     
     This implements a more complete SWM-aligned resonance detection
     by analyzing functional, structural, dynamic, and relational patterns.
+    ``semantic_score`` may be passed in when precomputed.
     """
     # Get base semantic resonance
-    semantic_score = semantic_resonance(geoid1, geoid2)
+    if semantic_score is None:
+        semantic_score = semantic_resonance(geoid1, geoid2)
     
     # Extract advanced patterns
     patterns1 = extract_patterns_advanced(geoid1.raw)
@@ -4,7 +4,7 @@ Implements Shannon entropy over term intensity distributions and entropy-based t
 """
 
 import math
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 
 def calculate_shannon_entropy(intensities: List[float]) -> float:
@@ -41,10 +41,46 @@ def calculate_shannon_entropy(intensities: List[float]) -> float:
     return entropy
 
 
+def calculate_grouped_entropy(intensities: List[float], groups: List[Tuple[float, float]]) -> float:
+    """
+    Calculate Shannon entropy over intensities some of which are summarized.
+    
+    Args:
+        intensities: List of individual intensity values
+        groups: (total, entropy) pairs, each standing for the positive
+            intensities it summarizes: their sum and their Shannon entropy
+        
+    Returns:
+        Shannon entropy in bits over the individual and summarized
+        intensities together (by the grouping property, the same as
+        over all of them individually)
+    """
+    weights = [i for i in intensities if i > 0]
+    groups = [(total, entropy) for total, entropy in groups if total > 0]
+    total = sum(weights) + sum(weight for weight, _ in groups)
+    if total <= 0:
+        return 0.0
+    
+    entropy = 0.0
+    for weight in weights:
+        p = weight / total
+        if p > 0:
+            entropy -= p * math.log2(p)
+    for weight, group_entropy in groups:
+        p = weight / total
+        if p > 0:
+            entropy += p * (group_entropy - math.log2(p))
+    
+    return entropy
+
+
 def calculate_term_entropy(terms: List[Dict[str, Any]]) -> float:
     """
     Calculate entropy from a list of term dictionaries.
     
+    Rollup terms (see ``EchoForm.compact_terms``) count as the terms they
+    merged, through their ``rollup_intensity`` and ``rollup_entropy``.
+    
     Args:
         terms: List of term dicts with 'intensity' field
         
@@ -52,12 +88,17 @@ def calculate_term_entropy(terms: List[Dict[str, Any]]) -> float:
         Shannon entropy of term intensities
     """
     intensities = []
+    groups = []
     for term in terms:
-        if isinstance(term, dict) and 'intensity' in term:
+        if isinstance(term, dict) and 'rollup_intensity' in term:
+            groups.append((term['rollup_intensity'], term.get('rollup_entropy', 0.0)))
+        elif isinstance(term, dict) and 'intensity' in term:
             intensity = term['intensity']
             if isinstance(intensity, (int, float)) and intensity > 0:
                 intensities.append(float(intensity))
     
+    if groups:
+        return calculate_grouped_entropy(intensities, groups)
     return calculate_shannon_entropy(intensities)
 
 
@@ -0,0 +1,100 @@
+"""
+Per-text token and negation features.
+
+Resonance and contradiction checks used to re-tokenize both texts of every
+pair. ``text_features`` does that work once per text; geoids compute it at
+construction (``Geoid.features``) so pairwise code only compares
+precomputed sets and flags.
+
+Two negation notions coexist and are kept distinct on purpose, matching
+the checks they replace: ``has_negation`` looks for whole ``\\w+`` tokens in
+``NEGATIONS`` (resonance), ``negated`` looks for any ``NEGATION_WORDS``
+substring (contradiction heuristics).
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet
+
+# Negation tokens for the resonance penalty
+NEGATIONS = {"not", "no", "never", "cannot", "can't", "won't", "doesn't", "isn't", "aren't", "wasn't", "weren't", "don't", "didn't", "hasn't", "haven't", "hadn't"}
+
+# Negation patterns for contradiction detection
+NEGATION_WORDS = {
+    "not", "no", "never", "cannot", "can't", "won't", "doesn't",
+    "isn't", "aren't", "wasn't", "weren't", "don't", "didn't",
+    "hasn't", "haven't", "hadn't", "none", "neither", "nor"
+}
+
+# Antonym patterns (expandable)
+ANTONYM_PAIRS = [
+    ("hot", "cold"), ("cold", "hot"),
+    ("black", "white"), ("white", "black"),
+    ("true", "false"), ("false", "true"),
+    ("round", "flat"), ("flat", "round"),
+    ("can", "cannot"), ("cannot", "can"),
+    ("is", "is not"), ("is not", "is"),
+    ("are", "are not"), ("are not", "are"),
+    ("fly", "cannot fly"), ("cannot fly", "fly"),
+]
+
+ANTONYM_TERMS = frozenset(term for pair in ANTONYM_PAIRS for term in pair)
+
+# Ignored when deciding whether two statements are about the same thing
+COMMON_WORDS = {"the", "a", "an", "is", "are", "in", "on", "at"}
+
+_CLAIM_PATTERNS = [
+    re.compile(r"(\w+)\s+(?:is|are)\s+(.+)"),
+    re.compile(r"(\w+)\s+(?:can|cannot)\s+(.+)"),
+    re.compile(r"(\w+)\s+(?:have|has)\s+(.+)"),
+    re.compile(r"(\w+)\s+(?:live|lives)\s+(.+)"),
+]
+_TOKEN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class TextFeatures:
+    """Token and claim features of one text."""
+    tokens: FrozenSet[str]         # lowercased \w+ tokens
+    has_negation: bool             # a token is in NEGATIONS
+    words: FrozenSet[str]          # whitespace-split words minus COMMON_WORDS
+    negated: bool                  # a NEGATION_WORDS entry occurs as a substring
+    subject: str
+    predicate: str
+    antonym_hits: FrozenSet[str]   # ANTONYM_TERMS occurring in the predicate
+
+
+def _core_claim(text: str):
+    """Subject and predicate of a lowercased, stripped text."""
+    for pattern in _CLAIM_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            return match.group(1), match.group(2)
+    words = text.split()
+    if len(words) >= 2:
+        return words[0], " ".join(words[1:])
+    return text, ""
+
+
+@lru_cache(maxsize=65536)
+def text_features(text: str) -> TextFeatures:
+    """Compute (and memoize) the features of ``text``."""
+    lowered = text.lower().strip()
+    tokens = frozenset(_TOKEN.findall(lowered))
+    subject, predicate = _core_claim(lowered)
+    return TextFeatures(
+        tokens=tokens,
+        has_negation=not tokens.isdisjoint(NEGATIONS),
+        words=frozenset(lowered.split()) - COMMON_WORDS,
+        negated=any(neg in lowered for neg in NEGATION_WORDS),
+        subject=subject,
+        predicate=predicate,
+        antonym_hits=frozenset(t for t in ANTONYM_TERMS if t in predicate),
+    )
+
+
+def features_of(obj) -> TextFeatures:
+    """Features of a geoid-like object, falling back to its ``raw`` text."""
+    features = getattr(obj, "features", None)
+    return features if features is not None else text_features(obj.raw)
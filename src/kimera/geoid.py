@@ -1,8 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 import numpy as np
+from .features import TextFeatures, text_features
+from .scar import ScarView
 
 @dataclass
 class Geoid:
@@ -14,9 +18,182 @@ class Geoid:
     sem_vec: np.ndarray
     sym_vec: np.ndarray
     vdr: float
-    scars: List[str] = field(default_factory=list)
+    # Live view of this gid's scars in kimera.scar.SCAR_LOG (bound in __post_init__)
+    scars: Sequence[int] = field(default=None, compare=False)
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
+    # Set by GeoidMatrix: sem_vec/sym_vec are then unit-norm row views.
+    # Not init fields, so dataclasses.replace() gives a copy outside the arena
+    arena: Optional["GeoidMatrix"] = field(default=None, init=False, repr=False, compare=False)
+    row: int = field(default=-1, init=False, repr=False, compare=False)
+    # Token/negation features of ``raw``, computed at construction. Not an
+    # init field, so dataclasses.replace(g, raw=...) recomputes them
+    features: Optional[TextFeatures] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.scars is None:
+            self.scars = ScarView(self.gid)
+        self.features = text_features(self.raw)
+
+    def __getstate__(self):
+        # Pickled geoids carry their own vectors, not the whole arena
+        state = dict(self.__dict__)
+        state["arena"] = None
+        state["row"] = -1
+        return state
+
+    def vector_key(self) -> str:
+        """``gid`` plus a fingerprint of ``sem_vec``, for caches of similarities.
+
+        Two geoids with one gid but different vectors (a ``replace()`` copy,
+        another encoder) get different keys. The fingerprint is recomputed
+        when ``sem_vec`` is rebound; in-place writes to it are not seen.
+        """
+        vec = self.sem_vec
+        if self.__dict__.get("_key_vec") is not vec:
+            digest = hashlib.blake2b(np.ascontiguousarray(vec).tobytes(), digest_size=8)
+            self._key = f"{self.gid}:{digest.hexdigest()}"
+            self._key_vec = vec
+        return self._key
+
+
+# ---- vector arena ----
+
+def unit_rows(m: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """L2-normalize the rows of ``m`` as ``dtype``; zero rows stay zero."""
+    m = np.asarray(m, dtype=dtype)
+    norms = np.sqrt(np.einsum("ij,ij->i", m, m))
+    norms[norms == 0.0] = 1.0
+    return m / norms[:, None]
+
+
+class GeoidMatrix:
+    """Arena of contiguous, L2-normalized float32 vectors for a run of geoids.
+
+    Adding a geoid copies its vectors into the next row and rebinds
+    ``sem_vec``/``sym_vec`` to views of that row, so batch code can use
+    ``arena.sem[start:stop]`` (zero-copy) or ``arena.sem[rows]`` instead of
+    stacking and normalizing per call. When the symbolic and semantic
+    vectors are the same, one matrix backs both.
+
+    Rows are only valid while geoids keep their vectors: once
+    ``geoid.sem_vec`` (or ``sym_vec``) is reassigned, :meth:`holds` is false
+    for it and batch code falls back to the geoid's own vectors.
+    """
+
+    def __init__(self, sem_dim: int, sym_dim: Optional[int] = None, capacity: int = 1024):
+        """
+        Args:
+            sem_dim: Width of semantic vectors.
+            sym_dim: Width of symbolic vectors, or ``None`` to share the
+                semantic matrix.
+            capacity: Initial number of rows; grows by doubling.
+        """
+        self._share_sym = sym_dim is None
+        self._n = 0
+        self._geoids: List[Geoid] = []
+        # (sem, sym) views handed to the geoid bound at each row
+        self._views: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._sem = np.empty((max(capacity, 1), sem_dim), dtype=np.float32)
+        self._sym = self._sem if self._share_sym else np.empty((max(capacity, 1), sym_dim), dtype=np.float32)
+
+    @classmethod
+    def from_geoids(cls, geoids: Sequence[Geoid]) -> "GeoidMatrix":
+        """Build an arena sized for ``geoids`` and add them in order."""
+        geoids = list(geoids)
+        if not geoids:
+            raise ValueError("from_geoids needs at least one geoid")
+        share = all(g.sym_vec is g.sem_vec for g in geoids)
+        first = geoids[0]
+        arena = cls(
+            len(first.sem_vec),
+            None if share else len(first.sym_vec),
+            capacity=len(geoids),
+        )
+        arena.extend(geoids)
+        return arena
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def sem(self) -> np.ndarray:
+        """``(n, sem_dim)`` view of all semantic rows."""
+        return self._sem[:self._n]
+
+    @property
+    def sym(self) -> np.ndarray:
+        """``(n, sym_dim)`` view of all symbolic rows."""
+        return self._sym[:self._n]
+
+    @property
+    def geoids(self) -> List[Geoid]:
+        return list(self._geoids)
+
+    def holds(self, g: Geoid) -> bool:
+        """Whether ``g`` is still backed by its row (vectors not reassigned)."""
+        if g.arena is not self:
+            return False
+        sem, sym = self._views[g.row]
+        return g.sem_vec is sem and g.sym_vec is sym
+
+    def _bind(self, g: Geoid, row: int) -> None:
+        g.arena = self
+        g.row = row
+        g.sem_vec = self._sem[row]
+        g.sym_vec = g.sem_vec if self._share_sym else self._sym[row]
+        self._views[row] = (g.sem_vec, g.sym_vec)
+
+    def _reserve(self, rows: int) -> None:
+        cap = self._sem.shape[0]
+        if rows <= cap:
+            return
+        new_cap = max(rows, cap * 2)
+        sem = np.empty((new_cap, self._sem.shape[1]), dtype=np.float32)
+        sem[:self._n] = self._sem[:self._n]
+        if self._share_sym:
+            sym = sem
+        else:
+            sym = np.empty((new_cap, self._sym.shape[1]), dtype=np.float32)
+            sym[:self._n] = self._sym[:self._n]
+        held = [self.holds(g) for g in self._geoids]
+        self._sem, self._sym = sem, sym
+        for row, (g, bound) in enumerate(zip(self._geoids, held)):
+            if bound:
+                self._bind(g, row)
+            elif g.arena is self:
+                # Reassigned vectors stay; the stale row is no longer theirs
+                g.arena, g.row = None, -1
+
+    def add(self, geoid: Geoid) -> int:
+        """Add one geoid; returns its row."""
+        return self.extend([geoid]).start
+
+    def extend(self, geoids: Sequence[Geoid]) -> slice:
+        """Add geoids in order; returns the slice of rows they occupy."""
+        geoids = list(geoids)
+        start = self._n
+        rows = slice(start, start + len(geoids))
+        if not geoids:
+            return rows
+        if self._share_sym and any(g.sym_vec is not g.sem_vec for g in geoids):
+            raise ValueError("Arena shares sem/sym rows but a geoid has a distinct sym_vec")
+        self._reserve(rows.stop)
+        self._sem[rows] = unit_rows(np.stack([g.sem_vec for g in geoids]))
+        if not self._share_sym:
+            self._sym[rows] = unit_rows(np.stack([g.sym_vec for g in geoids]))
+        self._n = rows.stop
+        self._geoids.extend(geoids)
+        self._views.extend([None] * len(geoids))
+        for row, g in enumerate(geoids, start):
+            self._bind(g, row)
+        return rows
+
+    def rows_of(self, geoids: Sequence[Geoid]) -> np.ndarray:
+        """Row indices of ``geoids`` (all must be held by this arena)."""
+        if not all(self.holds(g) for g in geoids):
+            raise ValueError("Geoid is not backed by this arena")
+        return np.fromiter((g.row for g in geoids), dtype=np.int64, count=len(geoids))
 
 
 # ---- helper functions ----
@@ -27,29 +204,131 @@ def calc_vdr(lang: str, layers: List[str]) -> float:
     return base * (1 + 0.05 * len(layers))
 
 
-# External – simple sentence encoder (CPU) with caching
-from sentence_transformers import SentenceTransformer
-from .cache import embed_cache
+# External – simple sentence encoder (CPU) with caching.
+# The model is loaded on first use so that importing kimera (CLI, storage-only
+# scripts) does not pay for it.
+from .cache import embed_cache, resonance_cache
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def _get_model():
+    """Return the shared SentenceTransformer, loading it on first call."""
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                from sentence_transformers import SentenceTransformer
+                _encoder = SentenceTransformer(MODEL_NAME)
+    return _encoder
+
+
+def warmup() -> None:
+    """Load the sentence encoder eagerly (e.g. at server start-up)."""
+    _get_model()
+
+
+# ---- encoder registry ----
+#
+# An encoder is ``fn(texts, batch_size) -> array of shape (len(texts), dim)``.
+# The semantic and symbolic roles each name one; when both name the same
+# encoder its output is computed once and shared by sem_vec and sym_vec.
+
+DEFAULT_ENCODER = "minilm"
 
-_encoder = SentenceTransformer("all-MiniLM-L6-v2")
+_encoders: Dict[str, Tuple[Callable[[List[str], int], np.ndarray], bool]] = {}
+_roles: Dict[str, str] = {"sem": DEFAULT_ENCODER, "sym": DEFAULT_ENCODER}
 
 
-def _encode_cached(text: str, lang: str = "en"):
+def register_encoder(name: str, fn: Callable[[List[str], int], np.ndarray], *, cached: bool = True) -> None:
+    """Register an encoder under ``name``.
+
+    Args:
+        name: Registry key, referenced by :func:`use_encoders`.
+        fn: Batch encoder ``fn(texts, batch_size) -> (n, dim) array``.
+        cached: Whether results go through ``embed_cache``. Cheap encoders
+            can opt out.
+    """
+    _encoders[name] = (fn, cached)
+
+
+def use_encoders(sem: Optional[str] = None, sym: Optional[str] = None) -> None:
+    """Select the registered encoders used for sem_vec and sym_vec."""
+    for role, name in (("sem", sem), ("sym", sym)):
+        if name is None:
+            continue
+        if name not in _encoders:
+            raise KeyError(f"Unknown encoder: {name}")
+        _roles[role] = name
+    # Cached similarities were computed with the previous vectors
+    resonance_cache.clear()
+
+
+def get_encoders() -> Dict[str, str]:
+    """Return the current ``{"sem": name, "sym": name}`` assignment."""
+    return dict(_roles)
+
+
+def _minilm_encode(texts: List[str], batch_size: int) -> np.ndarray:
+    return _get_model().encode(texts, batch_size=batch_size)
+
+
+register_encoder(DEFAULT_ENCODER, _minilm_encode)
+
+
+def _cache_lang(name: str, lang: str) -> str:
+    """Cache namespace; the default encoder keeps the historical key."""
+    return lang if name == DEFAULT_ENCODER else f"{name}/{lang}"
+
+
+def _encode_many(keys: List[tuple], batch_size: int = 64, encoder: str = DEFAULT_ENCODER) -> List[np.ndarray]:
+    """Encode unique ``(lang, echo)`` keys, consulting the cache in bulk.
+
+    Only cache misses go through the model, in batches of ``batch_size``.
+    """
+    fn, cached = _encoders[encoder]
+    if not cached:
+        return list(fn([echo for _, echo in keys], batch_size))
+
+    cache_keys = [(_cache_lang(encoder, lang), echo) for lang, echo in keys]
+    vecs = embed_cache.get_many(cache_keys)
+    misses = [i for i, v in enumerate(vecs) if v is None]
+    if misses:
+        encoded = fn([keys[i][1] for i in misses], batch_size)
+        for i, vec in zip(misses, encoded):
+            vecs[i] = vec
+        embed_cache.set_many([(*cache_keys[i], vecs[i]) for i in misses])
+    return vecs
+
+
+def _encode_roles(keys: List[tuple], batch_size: int = 64) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """Return ``(sem_vecs, sym_vecs)`` for ``keys``, sharing work when possible."""
+    sem = _encode_many(keys, batch_size, _roles["sem"])
+    if _roles["sym"] == _roles["sem"]:
+        return sem, sem
+    return sem, _encode_many(keys, batch_size, _roles["sym"])
+
+
+def _encode_cached(text: str, lang: str = "en", encoder: str = DEFAULT_ENCODER):
     """Encode text with caching support."""
-    cached = embed_cache.get(lang, text)
-    if cached is not None:
-        return cached
-    vec = _encoder.encode(text)
-    embed_cache.set(lang, text, vec)
-    return vec
+    return _encode_many([(lang, text)], encoder=encoder)[0]
 
 def sem_encoder(text: str, lang: str = "en"):
     """Semantic encoder with cache."""
-    return _encode_cached(text, lang)
+    return _encode_cached(text, lang, _roles["sem"])
 
 def sym_encoder(text: str, lang: str = "en"):
     """Symbolic encoder with cache (alias for semantic encoder in toy prototype)."""
-    return _encode_cached(text, lang)
+    return _encode_cached(text, lang, _roles["sym"])
+
+
+def _make_gid(lang: str, echo: str) -> str:
+    """Stable 16-char hex id from lang + echo."""
+    gid_input = f"{lang}:{echo}"
+    return hashlib.sha256(gid_input.encode()).hexdigest()[:16]
 
 
 def init_geoid(text: str = None, lang: str = "en", layers: List[str] = None, *, raw: str | None = None, tags=None, **_) -> Geoid:
@@ -69,13 +348,12 @@ def init_geoid(text: str = None, lang: str = "en", layers: List[str] = None, *,
     echo = raw.strip() if raw is not None else text.strip()
     
     # Generate stable hash from lang + echo
-    import hashlib
-    gid_input = f"{lang}:{echo}"
-    gid = hashlib.sha256(gid_input.encode()).hexdigest()[:16]  # 16-char hex
+    gid = _make_gid(lang, echo)  # 16-char hex
     
-    # Use echo for encoding (consistent with cache key)
-    sem_vec = sem_encoder(echo, lang)
-    sym_vec = sym_encoder(echo, lang)
+    # Use echo for encoding (consistent with cache key); one pass when the
+    # semantic and symbolic encoders are the same
+    sem_vecs, sym_vecs = _encode_roles([(lang, echo)])
+    sem_vec, sym_vec = sem_vecs[0], sym_vecs[0]
     
     return Geoid(
         raw=raw,               # Store original text (or provided raw)
@@ -87,3 +365,65 @@ def init_geoid(text: str = None, lang: str = "en", layers: List[str] = None, *,
         sym_vec=sym_vec,
         vdr=calc_vdr(lang, layers),
     )
+
+
+def init_geoids_batch(
+    texts: Sequence[str],
+    langs: Union[str, Sequence[str]] = "en",
+    layers: Optional[Sequence] = None,
+    *,
+    batch_size: int = 64,
+    arena: Optional[GeoidMatrix] = None,
+) -> List[Geoid]:
+    """Bulk counterpart of :func:`init_geoid`.
+
+    Texts are deduplicated on ``(lang, echo)``, looked up in ``embed_cache``
+    in one pass, and only the misses are encoded (``batch_size`` sentences per
+    model call). Geoids are returned in input order.
+
+    Args:
+        texts: Raw texts, one geoid per entry.
+        langs: A single language for all texts or one per text.
+        layers: Context layers shared by all texts (``["a", "b"]``) or one
+            list per text (``[["a"], ["b"]]``). Defaults to ``["default"]``.
+        batch_size: Sentences per encoder call.
+        arena: Optional :class:`GeoidMatrix` the new geoids are added to.
+    """
+    n = len(texts)
+    if isinstance(langs, str):
+        langs = [langs] * n
+    elif len(langs) != n:
+        raise ValueError(f"Expected {n} langs, got {len(langs)}")
+
+    if layers is None:
+        layers = [["default"]] * n
+    elif not layers or isinstance(layers[0], str):
+        layers = [list(layers)] * n
+    elif len(layers) != n:
+        raise ValueError(f"Expected {n} layer lists, got {len(layers)}")
+
+    echoes = [raw.strip() for raw in texts]
+
+    # Deduplicate on the cache key so each sentence is encoded at most once
+    slot = {}
+    for lang, echo in zip(langs, echoes):
+        slot.setdefault((lang, echo), len(slot))
+    keys = list(slot)
+    sem_vecs, sym_vecs = _encode_roles(keys, batch_size) if keys else ([], [])
+
+    geoids = []
+    for raw, echo, lang, row_layers in zip(texts, echoes, langs, layers):
+        i = slot[(lang, echo)]
+        geoids.append(Geoid(
+            raw=raw,
+            echo=echo,
+            gid=_make_gid(lang, echo),
+            lang_axis=lang,
+            context_layers=list(row_layers),
+            sem_vec=sem_vecs[i],
+            sym_vec=sym_vecs[i],
+            vdr=calc_vdr(lang, row_layers),
+        ))
+    if arena is not None:
+        arena.extend(geoids)
+    return geoids
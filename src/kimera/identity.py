@@ -239,7 +239,36 @@ class Identity:
             identity.metadata = data["metadata"]
             
         return identity
-    
+
+    @classmethod
+    def restore(cls, id: str, identity_type: str, raw: str, echo: str, lang_axis: str,
+                tags: List[str], weight: float, related_ids: List[str], meta: Dict[str, Any],
+                created_at: Optional[datetime], updated_at: Optional[datetime],
+                legacy: bool = False) -> 'Identity':
+        """Rebuild a stored Identity from its fields as they were saved.
+
+        Skips the constructor's defaulting and validation (storage decodes
+        rows with it). ``legacy`` restores the ``content``/``metadata``
+        attributes, which mirror ``raw``/``meta``.
+        """
+        identity = cls.__new__(cls)
+        identity.id = id
+        identity.identity_type = identity_type
+        identity.raw = raw
+        identity.echo = echo
+        identity.lang_axis = lang_axis
+        identity.tags = tags
+        identity.vector = None
+        identity.weight = weight
+        identity.related_ids = related_ids
+        identity.meta = meta
+        identity.created_at = created_at
+        identity.updated_at = updated_at
+        if legacy:
+            identity.content = raw
+            identity.metadata = meta
+        return identity
+
     def entropy(self) -> float:
         """
         Calculate Shannon entropy for this identity.
@@ -276,26 +305,33 @@ class Identity:
         entropy = self.entropy()
         return adaptive_tau(base_tau, entropy, k)
     
-    def age_seconds(self) -> float:
+    def age_seconds(self, at: Optional[datetime] = None) -> float:
         """
         Calculate age of identity in seconds.
         
+        Args:
+            at: Time to measure the age at (default: now)
+            
         Returns:
             Age in seconds since creation
         """
         if self.created_at is None:
             return 0.0
         
-        now = datetime.now(timezone.utc)
+        now = at or datetime.now(timezone.utc)
         age_delta = now - self.created_at
         return age_delta.total_seconds()
     
-    def decay_factor(self, tau_seconds: Optional[float] = None) -> float:
+    def decay_factor(self, tau_seconds: Optional[float] = None, at: Optional[datetime] = None) -> float:
         """
         Calculate current decay factor based on age.
         
+        Storage computes the same factor in SQL at read time (decayed
+        ``weight`` in ``LatticeStorage.list_identities``).
+        
         Args:
             tau_seconds: Time decay constant (default: uses effective_tau)
+            at: Time to evaluate the decay at (default: now)
             
         Returns:
             Decay factor between 0 and 1
@@ -303,7 +339,7 @@ class Identity:
         if tau_seconds is None:
             tau_seconds = self.effective_tau()
         
-        age = self.age_seconds()
+        age = self.age_seconds(at)
         if tau_seconds <= 0:
             return 0.0
         
@@ -61,6 +61,9 @@ active_identities_gauge = Gauge(
     registry=kimera_registry
 )
 
+# Identity types the active identities gauge has a label for
+_gauged_identity_types = set()
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -143,20 +146,26 @@ def track_lattice_operation(func: Callable) -> Callable:
     return wrapper
 
 
+def set_identity_gauges(counts: Dict[str, int]) -> None:
+    """
+    Set the active identity gauges to per-type counts
+    
+    Types with a gauge but no count are set to zero.
+    """
+    for identity_type in set(_gauged_identity_types) - set(counts):
+        active_identities_gauge.labels(identity_type=identity_type).set(0)
+    for identity_type, count in counts.items():
+        active_identities_gauge.labels(identity_type=identity_type).set(count)
+        _gauged_identity_types.add(identity_type)
+
+
 def update_identity_gauges(storage) -> None:
     """
-    Update gauge metrics for active identities
+    Reconcile the active identity gauges with storage (one GROUP BY query)
     """
     try:
-        # Get identity counts by type
-        geoid_count = len([i for i in storage.list_identities() if i.get('type') == 'geoid'])
-        scar_count = len([i for i in storage.list_identities() if i.get('type') == 'scar'])
-        
-        active_identities_gauge.labels(identity_type='geoid').set(geoid_count)
-        active_identities_gauge.labels(identity_type='scar').set(scar_count)
-        
-        logger.debug(f"Updated identity gauges: geoid={geoid_count}, scar={scar_count}")
-        
+        counts = storage.reconcile_identity_counts()
+        logger.debug(f"Reconciled identity gauges: {counts}")
     except Exception as e:
         logger.error(f"Error updating identity gauges: {e}")
 
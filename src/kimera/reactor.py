@@ -2,12 +2,22 @@ import random
 import time
 import psutil
 import os
-from typing import List
+from typing import List, Tuple
+import numpy as np
 from tqdm import tqdm
-from .resonance import resonance, THRESH
-from .scar import create_scar
+from .resonance import resonance_indexed, THRESH
+from .scar import create_scars
 
-__all__ = ["reactor_cycle", "reactor_cycle_batched"]
+__all__ = ["reactor_cycle", "reactor_cycle_batched", "pair_indices", "STRATEGIES"]
+
+# Pairing strategies understood by the reactor:
+#   random     shuffle and pair neighbours (each geoid once per cycle)
+#   window     pair each geoid with the next `window` geoids in order
+#   all_pairs  every pair within the chunk, scored in row blocks
+STRATEGIES = ("random", "window", "all_pairs")
+
+# Pairs scored per block by the all_pairs strategy
+ALL_PAIRS_BLOCK = 1 << 16
 
 
 def random_pairs(seq: List):
@@ -17,18 +27,92 @@ def random_pairs(seq: List):
         yield items[i], items[i + 1]
 
 
-def reactor_cycle(geoids, cycles: int = 1):
-    """Single‑thread cycle for ≤ 1 K geoids (legacy)."""
+def pair_indices(n: int, strategy: str = "random", window: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+    """Index pairs ``(left, right)`` over ``n`` geoids for a pairing strategy.
+
+    ``random`` draws the same shuffle as `random_pairs`, so seeding the
+    `random` module reproduces the legacy pairing.
+    """
+    if strategy == "random":
+        order = list(range(n))
+        random.shuffle(order)
+        order = np.asarray(order, dtype=np.intp)
+        m = n - n % 2
+        return order[0:m:2], order[1:m:2]
+    if strategy == "window":
+        offsets = range(1, min(window, n - 1) + 1)
+        left = np.concatenate([np.arange(n - d) for d in offsets] or [np.empty(0, dtype=np.intp)])
+        right = np.concatenate([np.arange(d, n) for d in offsets] or [np.empty(0, dtype=np.intp)])
+        return left.astype(np.intp), right.astype(np.intp)
+    if strategy == "all_pairs":
+        left, right = np.triu_indices(n, 1)
+        return left.astype(np.intp), right.astype(np.intp)
+    raise ValueError(f"Unknown pairing strategy {strategy!r}; expected one of {STRATEGIES}")
+
+
+def _triu_blocks(n: int, max_pairs: int):
+    """The pairs of ``pair_indices(n, "all_pairs")`` as ``(left, right)`` row blocks.
+
+    Each block holds whole rows of the upper triangle, about ``max_pairs``
+    pairs (at least one row), in the same row-major order.
+    """
+    start = 0
+    while start < n - 1:
+        stop, count = start + 1, n - 1 - start
+        while stop < n - 1 and count + n - 1 - stop <= max_pairs:
+            count += n - 1 - stop
+            stop += 1
+        rows = np.arange(start, stop, dtype=np.intp)
+        left = np.repeat(rows, n - 1 - rows)
+        right = np.concatenate([np.arange(i + 1, n, dtype=np.intp) for i in range(start, stop)])
+        yield left, right
+        start = stop
+
+
+def _react(geoids: List, strategy: str, window: int) -> Tuple[int, int]:
+    """Score one chunk with vectorized passes and scar sub-threshold pairs.
+
+    ``all_pairs`` is scored in blocks of about `ALL_PAIRS_BLOCK` pairs,
+    other strategies in one pass; every strategy pushes its pairs to the
+    rope buffer. All pairs are scored against the scar state at the start
+    of the chunk. Returns ``(pairs scored, scars created)``.
+    """
+    if strategy == "all_pairs":
+        blocks = _triu_blocks(len(geoids), ALL_PAIRS_BLOCK)
+    else:
+        blocks = [pair_indices(len(geoids), strategy, window)]
+    pairs, scarred, weights = 0, [], []
+    for left, right in blocks:
+        # Geoids before the lowest index in the block take no part in it
+        base = int(min(left.min(), right.min())) if len(left) else 0
+        scores = resonance_indexed(geoids[base:], left - base, right - base)
+        hit = np.flatnonzero(scores < THRESH)
+        scarred.extend((geoids[left[k]], geoids[right[k]]) for k in hit)
+        weights.extend((1 - scores[hit]).tolist())
+        pairs += len(left)
+    create_scars(scarred, weights)
+    return pairs, len(weights)
+
+
+def reactor_cycle(geoids, cycles: int = 1, strategy: str = "random", window: int = 4):
+    """Single‑thread reactor cycle over ``geoids``.
+
+    Each cycle pairs the geoids with ``strategy`` (see `STRATEGIES`),
+    scores every pair at once and records all sub‑threshold pairs as
+    scars in one batch. With ``random`` (the default) every geoid is
+    paired once per cycle, so results match scoring pairs one by one.
+    """
+    geoids = list(geoids)
     for _ in range(cycles):
-        for g1, g2 in random_pairs(geoids):
-            r = resonance(g1, g2)
-            if r < THRESH:
-                create_scar(g1, g2, 1 - r)
+        _react(geoids, strategy, window)
 
 
-def reactor_cycle_batched(geoids, chunk: int = 200, verbose: bool = True):
+def reactor_cycle_batched(geoids, chunk: int = 200, verbose: bool = True,
+                          strategy: str = "random", window: int = 4):
     """Process *all* geoids in chunks, log latency & memory.
 
+    Pairs never cross a chunk boundary; see `reactor_cycle` for strategies.
+
     Returns dict(stats).
     """
     start = time.perf_counter()
@@ -43,8 +127,8 @@ def reactor_cycle_batched(geoids, chunk: int = 200, verbose: bool = True):
 
     for offset in it:
         batch = geoids[offset : offset + chunk]
-        reactor_cycle(batch)  # one internal cycle
-        pairs_proc += len(batch) // 2
+        pairs, _ = _react(batch, strategy, window)  # one internal cycle
+        pairs_proc += pairs
 
     delta_mem = psutil.Process(os.getpid()).memory_info().rss / (1024 ** 2) - rss0
     elapsed = (time.perf_counter() - start) * 1000  # ms
@@ -7,23 +7,34 @@ to distribute work across multiple CPU cores for improved performance on large d
 Note: On Windows, multiprocessing has high overhead due to process spawning and model
 reloading. For smaller datasets (<10k geoids), single-threaded processing may be faster.
 Consider using threading mode or larger chunk sizes (1000+) for better performance.
+
+`reactor_cycle_shared` avoids pickling geoids altogether: workers read the
+embeddings from shared memory and send back scar records, which the parent
+applies, so scars are kept (the forked mode only reports their count).
 """
 
 import time
 import psutil
 import os
 import platform
+import random
 import multiprocessing
-from multiprocessing import Pool, cpu_count
-from typing import List, Optional, Dict
+from multiprocessing import Pool, cpu_count, shared_memory
+from typing import List, Optional, Dict, Tuple
+import numpy as np
 from .reactor import reactor_cycle
 from .geoid import Geoid
+from .features import features_of
+from .resonance import (
+    THRESH, _apply_penalties, _cosine_rows, _penalty_from_totals, _scar_totals, _shared_totals, _unit_stack,
+)
+from .scar import SCAR_LOG
 
 # Windows multiprocessing guard
 if __name__ == '__main__':
     multiprocessing.freeze_support()
 
-__all__ = ["reactor_cycle_parallel", "reactor_cycle_threaded"]
+__all__ = ["reactor_cycle_parallel", "reactor_cycle_threaded", "reactor_cycle_shared"]
 
 
 def _run_cycle(batch: List[Geoid]) -> int:
@@ -153,6 +164,144 @@ def reactor_cycle_parallel(geoids: List[Geoid], workers: Optional[int] = None, c
     }
 
 
+# ---- shared-memory reactor ----
+
+# Worker-side views of the parent's shared arrays, set by _attach_shared
+_SHARED: Dict[str, np.ndarray] = {}
+_SHARED_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+def _share(arr: np.ndarray, blocks: List[shared_memory.SharedMemory]) -> Tuple[str, tuple, str]:
+    """Copy ``arr`` into a new shared memory block; returns its (name, shape, dtype)."""
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    blocks.append(shm)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm.name, arr.shape, arr.dtype.str
+
+
+def _attach_shared(spec: Dict[str, Tuple[str, tuple, str]]) -> None:
+    """Pool initializer: map the parent's arrays without copying them."""
+    for key, (name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _SHARED_BLOCKS.append(shm)
+        _SHARED[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _scar_range(bounds: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Worker: score the pairs in positions ``[start, stop)`` of the shuffled order.
+
+    Pairs are consecutive positions, as in ``random_pairs``. Returns the
+    geoid indices and weights of the pairs that should be scarred.
+    """
+    start, stop = bounds
+    sh = _SHARED
+    pos = np.arange(start, stop - 1, 2)
+    a = sh["order"][pos]
+    b = sh["order"][pos + 1]
+    sims = _cosine_rows(sh["unit"][a], sh["unit"][b])
+
+    penalty = _penalty_from_totals(
+        sh["scar_sum"][a] + sh["scar_sum"][b] - sh["shared_sum"][pos],
+        sh["scar_count"][a] + sh["scar_count"][b] - sh["shared_count"][pos],
+    )
+
+    score = _apply_penalties(sims, penalty, sh["negated"][a] ^ sh["negated"][b])
+    hit = score < THRESH
+    return a[hit].astype(np.int32), b[hit].astype(np.int32), 1 - score[hit]
+
+
+def reactor_cycle_shared(geoids: List[Geoid], workers: Optional[int] = None, chunk: int = 1000) -> Dict:
+    """Process-parallel reactor cycle over shared memory.
+
+    Unlike `reactor_cycle_parallel`, geoids are never pickled: the parent
+    puts the normalized embedding matrix, a shuffled pairing order and the
+    per-geoid penalty inputs in `multiprocessing.shared_memory`, workers
+    receive position ranges and return ``(i, j, weight)`` scar records,
+    and the parent appends the scars to `SCAR_LOG`, where the caller's
+    geoids see them.
+
+    Each geoid is paired at most once per cycle, as in `reactor_cycle`, so
+    scoring from the pre-cycle scar state gives the same scores the
+    sequential loop would. The resonance cache and rope buffer are bypassed.
+
+    Parameters
+    ----------
+    geoids : List[Geoid]
+        Full list of geoids.
+    workers : int | None
+        Number of worker processes; default = `cpu_count() - 1` (min 1).
+    chunk : int
+        Shuffled positions per task; pairs never cross a chunk boundary.
+
+    Returns
+    -------
+    dict : stats including latency_ms, mem_mb, new_scars, workers, geoids, chunks, mode
+    """
+    if workers is None:
+        workers = max(cpu_count() - 1, 1)
+
+    t0 = time.perf_counter()
+    rss0 = psutil.Process(os.getpid()).memory_info().rss / (1024 ** 2)
+
+    n = len(geoids)
+    bounds = [(i, min(i + chunk, n)) for i in range(0, n, chunk)]
+    new_scars = 0
+    if n >= 2:
+        order = list(range(n))
+        random.shuffle(order)
+        order = np.asarray(order, dtype=np.int64)
+        scar_sum, scar_count = _scar_totals(geoids)
+        # Totals of the scars each pair shares, stored at the pair's first position
+        pos = np.concatenate([np.arange(start, stop - 1, 2) for start, stop in bounds])
+        idx = SCAR_LOG.indices_of(g.gid for g in geoids)
+        shared_sum = np.zeros(n)
+        shared_count = np.zeros(n, dtype=np.int64)
+        shared_sum[pos], shared_count[pos] = _shared_totals(idx[order[pos]], idx[order[pos + 1]])
+
+        arrays = {
+            "unit": np.ascontiguousarray(_unit_stack(geoids)),
+            "order": order,
+            "negated": np.array([features_of(g).has_negation for g in geoids], dtype=bool),
+            "scar_sum": scar_sum,
+            "scar_count": scar_count,
+            "shared_sum": shared_sum,
+            "shared_count": shared_count,
+        }
+        blocks: List[shared_memory.SharedMemory] = []
+        try:
+            spec = {key: _share(arr, blocks) for key, arr in arrays.items()}
+            del arrays
+            ctx = multiprocessing.get_context("spawn") if platform.system() == "Windows" else multiprocessing
+            with ctx.Pool(workers, initializer=_attach_shared, initargs=(spec,)) as pool:
+                records = pool.map(_scar_range, bounds)
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+        # Merge worker records into SCAR_LOG in one append
+        if records:
+            a = np.concatenate([r[0] for r in records])
+            b = np.concatenate([r[1] for r in records])
+            w = np.concatenate([r[2] for r in records])
+            gids = [g.gid for g in geoids]
+            SCAR_LOG.append([gids[i] for i in a], [gids[j] for j in b], w)
+            new_scars = len(w)
+
+    delta_mem = psutil.Process(os.getpid()).memory_info().rss / (1024 ** 2) - rss0
+    latency = (time.perf_counter() - t0) * 1000  # Convert to milliseconds
+
+    return {
+        "workers": workers,
+        "geoids": n,
+        "latency_ms": round(latency, 2),
+        "mem_mb": round(delta_mem, 2),
+        "new_scars": new_scars,
+        "chunks": len(bounds),
+        "mode": "shared_memory"
+    }
+
+
 if __name__ == "__main__":
     from multiprocessing import freeze_support
     freeze_support()
\ No newline at end of file
@@ -1,39 +1,246 @@
 import numpy as np
-import re
 import os
-from sklearn.metrics.pairwise import cosine_similarity
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+from .cache import resonance_cache
+from .features import NEGATIONS, features_of, text_features
+from .geoid import unit_rows
 from .rope import rope_buffer
-from .scar import fetch_scars  # <- only fetch_scars now
+from .scar import SCAR_LOG
 
 THRESH = 0.3  # resonance threshold
 
 # Control negation fix via environment variable
 ENABLE_NEGATION_FIX = os.getenv("KIMERA_NEGATION_FIX", "1") == "1"
 
-# --- Negation-aware distance -------------------------------------------
-NEGATIONS = {"not", "no", "never", "cannot", "can't", "won't", "doesn't", "isn't", "aren't", "wasn't", "weren't", "don't", "didn't", "hasn't", "haven't", "hadn't"}
+# Weigh scars by age (exp(-age / SCAR_LOG.tau_seconds)) in the scar penalty
+ENABLE_SCAR_DECAY = os.getenv("KIMERA_SCAR_DECAY", "0") == "1"
 
+# --- Negation-aware distance -------------------------------------------
 def _has_negation(tokens: list[str]) -> bool:
     return any(tok.lower() in NEGATIONS for tok in tokens)
 
 def negation_mismatch(txt1: str, txt2: str) -> bool:
-    t1 = re.findall(r"\w+", txt1)
-    t2 = re.findall(r"\w+", txt2)
-    return _has_negation(t1) ^ _has_negation(t2)   # XOR
+    return text_features(txt1).has_negation ^ text_features(txt2).has_negation   # XOR
+# ------------------------------------------------------------------------
+
+
+# --- Shared arithmetic ----------------------------------------------------
+# The scalar and vectorized paths go through the same helpers so that
+# resonance(), resonance_many() and resonance_matrix() agree bit for bit.
+
+def _held(g) -> bool:
+    """Whether ``g``'s vectors are still the rows of its arena."""
+    arena = getattr(g, "arena", None)
+    return arena is not None and arena.holds(g)
+
+
+def _unit_stack(geoids: Sequence) -> np.ndarray:
+    """Unit-norm sem_vecs of ``geoids`` as an ``(n, d)`` float64 matrix.
+
+    Rows of geoids held by a :class:`~kimera.geoid.GeoidMatrix` are
+    already normalized and are only widened (one gather, or one slice when
+    the geoids are consecutive rows of one arena); others, including
+    geoids whose vectors were reassigned after joining an arena, are
+    normalized here in float64.
+    """
+    arena = getattr(geoids[0], "arena", None)
+    if arena is not None and all(arena.holds(g) for g in geoids):
+        rows = arena.rows_of(geoids)
+        start = int(rows[0])
+        if np.array_equal(rows, np.arange(start, start + len(rows))):
+            return arena.sem[start:start + len(rows)].astype(np.float64)
+        return arena.sem[rows].astype(np.float64)
+    m = np.stack([g.sem_vec for g in geoids]).astype(np.float64)
+    loose = [i for i, g in enumerate(geoids) if not _held(g)]
+    if loose:
+        m[loose] = unit_rows(m[loose], dtype=np.float64)
+    return m
+
+
+def _cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise dot product of two ``(n, d)`` unit-row matrices."""
+    return np.einsum("ij,ij->i", a, b)
+
+
+def _cosine_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Dot product of every row of ``a`` with every row of ``b``.
+
+    einsum runs the same contiguous sum-of-products loop over ``d`` for
+    each entry as :func:`_cosine_rows` does per row, so entries equal the
+    scalar path exactly. A BLAS matmul is faster (about 2-3x at d=384) but
+    blocks and orders the sums differently.
+    """
+    return np.einsum("ik,jk->ij", a, b)
+
+
+def _penalty_from_totals(total, count):
+    """Mean scar weight from summed totals and counts (0 where there are none)."""
+    penalty = np.zeros(np.shape(total))
+    np.divide(total, count, out=penalty, where=count > 0)
+    return penalty
+
+
+def _scar_totals(geoids: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-geoid scar weight sums (decayed if enabled) and counts."""
+    gids = (g.gid for g in geoids)
+    if ENABLE_SCAR_DECAY:
+        return SCAR_LOG.decayed_totals_many(gids)
+    return SCAR_LOG.totals_many(gids)
+
+
+def _shared_totals(idx_a, idx_b) -> Tuple[np.ndarray, np.ndarray]:
+    """Sums (decayed if enabled) and counts of the scars both sides share.
+
+    Takes interned scar indices (``SCAR_LOG.indices_of``), broadcast
+    against each other.
+    """
+    return SCAR_LOG.shared_totals_indexed(idx_a, idx_b, decayed=ENABLE_SCAR_DECAY)
+
+
+def _scar_penalty(a, b) -> float:
+    """Mean weight over the union of both geoids' scars, from running totals.
+
+    Constant time however many scars the geoids carry. Scars between
+    ``a`` and ``b`` are in both per-geoid totals and are subtracted once,
+    so each counts once; a geoid paired with itself gets its own mean.
+    """
+    if ENABLE_SCAR_DECAY:
+        now = datetime.utcnow()
+        sum_a, n_a = SCAR_LOG.decayed_totals(a.gid, now)
+        sum_b, n_b = SCAR_LOG.decayed_totals(b.gid, now)
+        sum_ab, n_ab = SCAR_LOG.decayed_shared_totals(a.gid, b.gid, now)
+    else:
+        sum_a, n_a = SCAR_LOG.totals(a.gid)
+        sum_b, n_b = SCAR_LOG.totals(b.gid)
+        sum_ab, n_ab = SCAR_LOG.shared_totals(a.gid, b.gid)
+    n = n_a + n_b - n_ab
+    return (sum_a + sum_b - sum_ab) / n if n else 0.0
+
+
+def _apply_penalties(sims: np.ndarray, penalty: np.ndarray, mismatch: np.ndarray) -> np.ndarray:
+    score = sims * (1 - penalty)
+    if ENABLE_NEGATION_FIX:
+        score = np.where(mismatch, np.maximum(score - 0.25, -1.0), score)
+    return score
 # ------------------------------------------------------------------------
 
 
 def resonance(a, b):
     """Return resonance score between two geoids (0–1)."""
-    sim = cosine_similarity(a.sem_vec.reshape(1, -1), b.sem_vec.reshape(1, -1))[0][0]
+    # Only the raw similarity is cached; scar and negation penalties change
+    # over time and are applied below on every call. Keys carry a vector
+    # fingerprint so geoids sharing a gid but not a vector get separate entries
+    key_a, key_b = a.vector_key(), b.vector_key()
+    sim = resonance_cache.get(key_a, key_b)
+    if sim is None:
+        sim = float(_cosine_rows(_unit_stack([a]), _unit_stack([b]))[0])
+        resonance_cache.set(key_a, key_b, sim)
     rope_buffer.push(a.gid, b.gid, sim)
-    penalty = (np.mean([s.weight for s in fetch_scars(a, b)]) if (a.scars or b.scars) else 0.0)
+    penalty = _scar_penalty(a, b)
     score = sim * (1 - penalty)
     
     # Apply negation mismatch penalty (if enabled)
-    if ENABLE_NEGATION_FIX and negation_mismatch(a.raw, b.raw):
+    if ENABLE_NEGATION_FIX and features_of(a).has_negation ^ features_of(b).has_negation:
         score -= 0.25          # push them further apart
         score = max(-1.0, score)
     
     return score
 
+
+def resonance_many(pairs: Sequence[Tuple]) -> np.ndarray:
+    """Score many ``(a, b)`` geoid pairs at once.
+
+    Similarities for all pairs come from one stacked pass; scar totals and
+    negation flags are computed once per distinct geoid. Returns a float64
+    array equal element for element to ``[resonance(a, b) for a, b in pairs]``
+    (the resonance cache is bypassed).
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return np.empty(0)
+    geoids: List = []
+    slot: Dict[int, int] = {}
+    index = np.empty((len(pairs), 2), dtype=np.intp)
+    for k, pair in enumerate(pairs):
+        for side, g in enumerate(pair):
+            i = slot.get(id(g))
+            if i is None:
+                i = slot[id(g)] = len(geoids)
+                geoids.append(g)
+            index[k, side] = i
+    return resonance_indexed(geoids, index[:, 0], index[:, 1])
+
+
+def resonance_indexed(geoids: Sequence, left, right, push_rope: bool = True) -> np.ndarray:
+    """Resonance of ``geoids[left[k]]`` with ``geoids[right[k]]`` for every ``k``.
+
+    Index-based form of :func:`resonance_many` for callers that already
+    hold a geoid list (e.g. a reactor chunk): vectors are normalized once
+    per geoid and the scar penalty comes from the store's per-geoid and
+    per-pair totals, so there is no per-pair Python work.
+    Results equal :func:`resonance` element for element.
+    """
+    geoids = list(geoids)
+    left = np.asarray(left, dtype=np.intp)
+    right = np.asarray(right, dtype=np.intp)
+    if left.size == 0:
+        return np.empty(0)
+    unit = _unit_stack(geoids)
+    sims = _cosine_rows(unit[left], unit[right])
+    if push_rope:
+        gids = [g.gid for g in geoids]
+        rope_buffer.push_many([gids[i] for i in left], [gids[j] for j in right], sims.tolist())
+
+    sums, counts = _scar_totals(geoids)
+    idx = SCAR_LOG.indices_of(g.gid for g in geoids)
+    shared_sums, shared_counts = _shared_totals(idx[left], idx[right])
+    penalty = _penalty_from_totals(
+        sums[left] + sums[right] - shared_sums,
+        counts[left] + counts[right] - shared_counts,
+    )
+    mismatch = None
+    if ENABLE_NEGATION_FIX:
+        negated = np.array([features_of(g).has_negation for g in geoids], dtype=bool)
+        mismatch = negated[left] ^ negated[right]
+    return _apply_penalties(sims, penalty, mismatch)
+
+
+def resonance_matrix(geoids_a: Sequence, geoids_b: Sequence = None) -> np.ndarray:
+    """Resonance of every geoid in ``geoids_a`` against every one in ``geoids_b``.
+
+    Both sides are normalized once (or taken straight from their
+    ``GeoidMatrix``) and multiplied in one pass (see :func:`_cosine_matrix`);
+    scar and negation penalties are applied as matrix operations. With
+    ``geoids_b=None`` the matrix is ``geoids_a`` against itself. Entries equal
+    :func:`resonance` element for element. The rope buffer and resonance
+    cache are bypassed.
+
+    Returns:
+        float64 array of shape ``(len(geoids_a), len(geoids_b))``.
+    """
+    geoids_a = list(geoids_a)
+    geoids_b = geoids_a if geoids_b is None else list(geoids_b)
+    if not geoids_a or not geoids_b:
+        return np.empty((len(geoids_a), len(geoids_b)))
+
+    ua = _unit_stack(geoids_a)
+    ub = ua if geoids_b is geoids_a else _unit_stack(geoids_b)
+    sims = _cosine_matrix(ua, ub)
+
+    sum_a, cnt_a = _scar_totals(geoids_a)
+    sum_b, cnt_b = _scar_totals(geoids_b)
+    idx_a = SCAR_LOG.indices_of(g.gid for g in geoids_a)
+    idx_b = idx_a if geoids_b is geoids_a else SCAR_LOG.indices_of(g.gid for g in geoids_b)
+    shared_sums, shared_counts = _shared_totals(idx_a[:, None], idx_b[None, :])
+    penalty = _penalty_from_totals(
+        sum_a[:, None] + sum_b[None, :] - shared_sums,
+        cnt_a[:, None] + cnt_b[None, :] - shared_counts,
+    )
+    if ENABLE_NEGATION_FIX:
+        neg_a = np.array([features_of(g).has_negation for g in geoids_a], dtype=bool)
+        neg_b = np.array([features_of(g).has_negation for g in geoids_b], dtype=bool)
+        mismatch = neg_a[:, None] ^ neg_b[None, :]
+    else:
+        mismatch = None
+    return _apply_penalties(sims, penalty, mismatch)
@@ -15,6 +15,7 @@ from enum import Enum
 from .patterns import PatternAbstractionEngine, PatternType, AbstractedPatternSet
 from .linguistics import MultiLanguageAnalyzer
 from .dimensions.geoid_v2 import GeoidV2, DimensionType
+from .vector_index import FlatIndex
 
 
 class ResonanceType(Enum):
@@ -328,25 +329,55 @@ class EnhancedResonanceDetector:
         return insights
     
     def find_resonant_cluster(self, geoids: List[GeoidV2], 
-                            threshold: float = 0.5) -> List[Tuple[str, str, float]]:
+                            threshold: float = 0.5,
+                            neighbors: Optional[int] = None,
+                            index: Optional[FlatIndex] = None) -> List[Tuple[str, str, float]]:
         """
         Find clusters of resonant Geoids
         
+        Every pair is compared by default. With ``neighbors`` set, full
+        resonance is only evaluated for each Geoid's ``neighbors``
+        semantically nearest Geoids, so large inputs cost O(n * neighbors)
+        detect_resonance calls instead of O(n^2). Neighbours come from an
+        exact ``FlatIndex`` built for the call, or from ``index``: a
+        prebuilt index keyed by ``gid`` (e.g. a trained ``IVFIndex`` reused
+        across calls). Hits for gids not in ``geoids`` are skipped.
+        
         Returns list of (geoid1_id, geoid2_id, resonance_score) tuples
         """
+        if index is not None and neighbors is None:
+            raise ValueError("index is only used together with neighbors")
+        n = len(geoids)
+        if neighbors is None or n <= neighbors + 1:
+            candidates = [(i, j) for i in range(n) for j in range(i + 1, n)]
+        else:
+            if index is None:
+                index = FlatIndex(len(geoids[0].sem_vec), capacity=n)
+                index.add_geoids(geoids)
+            slots: Dict[str, List[int]] = {}
+            for i, g in enumerate(geoids):
+                slots.setdefault(g.gid, []).append(i)
+            pairs = set()
+            for i, g in enumerate(geoids):
+                # k + 1 because a Geoid is its own nearest neighbour
+                for hit, _ in index.top_k(g.sem_vec, neighbors + 1):
+                    for j in slots.get(hit, ()):
+                        if j != i:
+                            pairs.add((min(i, j), max(i, j)))
+            candidates = sorted(pairs)
+        
         resonant_pairs = []
         
-        for i in range(len(geoids)):
-            for j in range(i + 1, len(geoids)):
-                result = self.detect_resonance(geoids[i], geoids[j], 
-                                             analyze_languages=False)
-                
-                if result.overall_resonance >= threshold:
-                    resonant_pairs.append(
-                        (geoids[i].gid, geoids[j].gid, result.overall_resonance)
-                    )
+        for i, j in candidates:
+            result = self.detect_resonance(geoids[i], geoids[j], 
+                                         analyze_languages=False)
+            
+            if result.overall_resonance >= threshold:
+                resonant_pairs.append(
+                    (geoids[i].gid, geoids[j].gid, result.overall_resonance)
+                )
         
         # Sort by resonance strength
         resonant_pairs.sort(key=lambda x: x[2], reverse=True)
         
-        return resonant_pairs
\ No newline at end of file
+        return resonant_pairs
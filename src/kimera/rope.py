@@ -1,12 +1,181 @@
-from collections import deque
-from collections import deque
-from typing import Deque, Tuple
+"""
+Rope buffer: a fixed-size ring of recent resonance readings.
+
+Every resonance call pushes ``(gid_from, gid_to, weight)``. Entries live in
+preallocated numpy columns (interned gid indices and float32 weights), so
+a push allocates nothing, and the window queries (mean, percentiles,
+per-gid activity, histograms) are vectorized over the last N entries.
+Interned gids no longer in the ring are dropped once the intern table
+outgrows ``4 * capacity``, so memory stays bounded however many distinct
+gids pass through.
+
+The module-level ``rope_buffer`` is pushed to by every ``resonance()``
+call, including threaded reactors and the API server, so pushes,
+compaction and window snapshots serialize on one lock. A push holds it
+for a few slot writes; queries hold it only while copying the window.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 
 class RopeBuffer:
     def __init__(self, capacity: int = 1024):
-        self.stack: Deque[Tuple[str, str, float]] = deque(maxlen=capacity)
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.src = np.zeros(capacity, dtype=np.int32)
+        self.dst = np.zeros(capacity, dtype=np.int32)
+        self.weight = np.zeros(capacity, dtype=np.float32)
+        self._pushed = 0  # total pushes; the next slot is _pushed % capacity
+        self._lock = threading.Lock()
+        self._gids: List[str] = []
+        self._index: Dict[str, int] = {}
+        # The ring references at most 2 * capacity gids; compact past twice that
+        self._max_gids = 4 * capacity
+
+    def _intern(self, gid: str) -> int:
+        idx = self._index.get(gid)
+        if idx is None:
+            idx = self._index[gid] = len(self._gids)
+            self._gids.append(gid)
+        return idx
+
+    def _compact(self) -> None:
+        """Re-intern the gids still referenced by the ring, dropping the rest (caller holds the lock)."""
+        n = len(self)
+        keep, inverse = np.unique(np.concatenate([self.src[:n], self.dst[:n]]), return_inverse=True)
+        gids = [self._gids[i] for i in keep.tolist()]
+        self.src[:n] = inverse[:n]
+        self.dst[:n] = inverse[n:]
+        self._gids = gids
+        self._index = {g: i for i, g in enumerate(gids)}
+
+    # ---- writes ----
 
     def push(self, gid_from: str, gid_to: str, weight: float):
-        self.stack.append((gid_from, gid_to, weight))
+        with self._lock:
+            slot = self._pushed % self.capacity
+            self.src[slot] = self._intern(gid_from)
+            self.dst[slot] = self._intern(gid_to)
+            self.weight[slot] = weight
+            self._pushed += 1
+            if len(self._gids) > self._max_gids:
+                self._compact()
+
+    def push_many(self, gids_from, gids_to, weights):
+        weights = np.asarray(weights, dtype=np.float32).reshape(-1)
+        gids_from, gids_to = list(gids_from), list(gids_to)
+        if not (len(gids_from) == len(gids_to) == len(weights)):
+            raise ValueError("gids_from, gids_to and weights must have the same length")
+        k = len(weights)
+        if k == 0:
+            return
+        # Only the newest `capacity` entries survive; skip interning the rest
+        keep = min(k, self.capacity)
+        with self._lock:
+            slots = (self._pushed + k - keep + np.arange(keep)) % self.capacity
+            self.src[slots] = [self._intern(g) for g in gids_from[k - keep:]]
+            self.dst[slots] = [self._intern(g) for g in gids_to[k - keep:]]
+            self.weight[slots] = weights[k - keep:]
+            self._pushed += k
+            if len(self._gids) > self._max_gids:
+                self._compact()
+
+    def clear(self):
+        """Forget all entries and interned gids."""
+        with self._lock:
+            self._pushed = 0
+            self._gids = []
+            self._index = {}
+
+    # ---- window queries ----
+
+    def __len__(self) -> int:
+        return min(self._pushed, self.capacity)
+
+    @property
+    def pushed(self) -> int:
+        """Total pushes since creation (or the last ``clear``)."""
+        return self._pushed
+
+    def _snapshot_locked(self, last: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """Copies of the newest ``last`` entries (all if None), oldest first, and the gid table they index."""
+        pushed = self._pushed
+        n = min(pushed, self.capacity)
+        if last is not None:
+            n = max(0, min(n, last))
+        slots = (pushed - n + np.arange(n)) % self.capacity
+        # Pushes only append to the table and compaction replaces it, so the
+        # returned reference keeps resolving the copied indices
+        return self.src[slots], self.dst[slots], self.weight[slots], self._gids
+
+    def _snapshot(self, last: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        with self._lock:
+            return self._snapshot_locked(last)
+
+    def window(self, last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Copies of ``(src, dst, weight)`` for the newest ``last`` entries, oldest first."""
+        return self._snapshot(last)[:3]
+
+    def entries(self, last: Optional[int] = None) -> List[Tuple[str, str, float]]:
+        """The newest ``last`` entries as ``(gid_from, gid_to, weight)`` tuples."""
+        src, dst, weight, gids = self._snapshot(last)
+        return [(gids[a], gids[b], w) for a, b, w in zip(src.tolist(), dst.tolist(), weight.tolist())]
+
+    def mean(self, last: Optional[int] = None) -> float:
+        """Mean weight over the window (nan when empty)."""
+        weights = self.window(last)[2]
+        return float(weights.mean(dtype=np.float64)) if len(weights) else float("nan")
+
+    def percentile(self, q, last: Optional[int] = None):
+        """Weight percentile(s) ``q`` (0-100) over the window (nan when empty)."""
+        weights = self.window(last)[2]
+        if not len(weights):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        result = np.percentile(weights.astype(np.float64), q)
+        return result if np.ndim(result) else float(result)
+
+    def activity(self, last: Optional[int] = None, top: Optional[int] = None) -> Dict[str, int]:
+        """Entries touching each gid in the window, most active first.
+
+        A self-pair counts once.
+        """
+        src, dst, _, gids = self._snapshot(last)
+        ends = np.concatenate([src, dst[src != dst]])
+        counts = np.bincount(ends, minlength=0)
+        active = np.flatnonzero(counts)
+        order = active[np.argsort(-counts[active], kind="stable")]
+        if top is not None:
+            order = order[:top]
+        return {gids[i]: int(counts[i]) for i in order}
+
+    def gid_activity(self, gid: str, last: Optional[int] = None) -> int:
+        """Entries touching ``gid`` in the window."""
+        with self._lock:
+            idx = self._index.get(gid)
+            if idx is None:
+                return 0
+            src, dst, _, _ = self._snapshot_locked(last)
+        return int(np.count_nonzero((src == idx) | (dst == idx)))
+
+    def histogram(self, bins: int = 20, last: Optional[int] = None,
+                  value_range: Tuple[float, float] = (-1.0, 1.0)) -> Dict[str, list]:
+        """Weight histogram over the window as JSON-ready ``{"edges", "counts"}``."""
+        counts, edges = np.histogram(self.window(last)[2], bins=bins, range=value_range)
+        return {"edges": edges.tolist(), "counts": counts.tolist()}
+
+    def stats(self, last: Optional[int] = None) -> Dict[str, float]:
+        """Summary of the window: entries, mean and p50/p90/p99 weight."""
+        weights = self.window(last)[2].astype(np.float64)
+        if not len(weights):
+            return {"entries": 0, "mean": float("nan"), "p50": float("nan"),
+                    "p90": float("nan"), "p99": float("nan")}
+        p50, p90, p99 = np.percentile(weights, [50, 90, 99]).tolist()
+        return {"entries": len(weights), "mean": float(weights.mean()),
+                "p50": p50, "p90": p90, "p99": p99}
+
 
 rope_buffer = RopeBuffer()
@@ -1,27 +1,565 @@
+"""
+Scars: weighted records of failed resonance between two geoids.
+
+Scars live in a columnar ``ScarStore``: int32 geoid-index pairs, float32
+weights and int64 timestamps (microseconds since the epoch, UTC), 20
+bytes per scar. Geoid ids are interned once. Running weight sums and
+counts per geoid, and per geoid pair for the scars two geoids share, make
+the resonance penalty a lookup (pairs are found by binary search in
+sorted int64 pair codes; each distinct pair adds 48 bytes, see
+``ScarStore.nbytes``); a time-decayed weight sum
+(``exp(-age / tau)`` per scar, see ``kimera.entropy.decay_factor``) is
+kept alongside, anchored at the newest scar so it never has to be
+recomputed from the rows.
+
+``SCAR_LOG`` is the process-wide store. It still behaves like the old
+``{scar_id: Scar}`` dict for reading (``len``, ``in``, ``[]``, ``values()``);
+``Scar`` objects are materialized on access. ``Geoid.scars`` is a
+``ScarView``, a live sequence of that geoid's scar ids.
+"""
+
+import threading
+from collections.abc import Sequence as _SequenceABC
 from dataclasses import dataclass
-from dataclasses import dataclass
-from datetime import datetime
-from uuid import uuid4
-from typing import Tuple
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .entropy import DEFAULT_TAU_SECONDS, decay_factor
+
+_EPOCH = datetime(1970, 1, 1)
+
 
 @dataclass
 class Scar:
-    scar_id: str
+    scar_id: int
     gid_pair: Tuple[str, str]
     weight: float
     timestamp: datetime
 
 
-SCAR_LOG = {}
+# New pair codes kept in the small sorted buffer before merging into the index
+_PAIR_BUFFER = 4096
+_EMPTY_PAIRS = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+
+def _merge_sorted(keys: np.ndarray, slots: np.ndarray, new_keys: np.ndarray, new_slots: np.ndarray,
+                  extra: Tuple[np.ndarray, np.ndarray] = _EMPTY_PAIRS) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge sorted ``new_keys`` (and the sorted ``extra`` pair) into sorted ``keys``, carrying slots."""
+    if len(extra[0]):
+        order = np.argsort(np.concatenate([extra[0], new_keys]), kind="stable")
+        new_keys = np.concatenate([extra[0], new_keys])[order]
+        new_slots = np.concatenate([extra[1], new_slots])[order]
+    pos = np.searchsorted(keys, new_keys)
+    return np.insert(keys, pos, new_keys), np.insert(slots, pos, new_slots)
+
+
+def _to_micros(ts: datetime) -> int:
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(us))
+
+
+class ScarStore:
+    """Append-only columnar scar table with per-geoid aggregates.
+
+    Scar ids are row numbers. Scars are keyed by geoid *id* (``gid``), so
+    every geoid object with the same gid shares its scars. ``tau_seconds``
+    is the time constant of the decayed sums.
+    """
+
+    def __init__(self, capacity: int = 1024, tau_seconds: float = DEFAULT_TAU_SECONDS):
+        if tau_seconds <= 0:
+            raise ValueError("tau_seconds must be positive")
+        self.tau_seconds = float(tau_seconds)
+        self._lock = threading.Lock()
+        self._init(capacity)
+
+    def _init(self, capacity: int) -> None:
+        capacity = max(capacity, 1)
+        self._n = 0
+        self.src = np.empty(capacity, dtype=np.int32)
+        self.dst = np.empty(capacity, dtype=np.int32)
+        self.weight = np.empty(capacity, dtype=np.float32)
+        self.ts = np.empty(capacity, dtype=np.int64)
+        self._gids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._sum = np.zeros(capacity, dtype=np.float64)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._decayed = np.zeros(capacity, dtype=np.float64)  # valid at _anchor
+        self._anchor = np.zeros(capacity, dtype=np.int64)     # newest scar ts, µs
+        self._adj: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # The same aggregates per unordered geoid pair, in slots numbered by
+        # first appearance. Slots are found by pair code (_pair_codes) in a
+        # sorted (codes, slots) index plus a small sorted buffer of recent
+        # pairs, merged into the index once it outgrows _PAIR_BUFFER
+        self._n_pairs = 0
+        self._pair_index: Tuple[np.ndarray, np.ndarray] = _EMPTY_PAIRS
+        self._pair_buffer: Tuple[np.ndarray, np.ndarray] = _EMPTY_PAIRS
+        self._pair_sum = np.zeros(capacity, dtype=np.float64)
+        self._pair_count = np.zeros(capacity, dtype=np.int64)
+        self._pair_decayed = np.zeros(capacity, dtype=np.float64)
+        self._pair_anchor = np.zeros(capacity, dtype=np.int64)
+
+    # ---- geoid interning ----
+
+    def _intern(self, gid: str) -> int:
+        idx = self._index.get(gid)
+        if idx is None:
+            idx = self._index[gid] = len(self._gids)
+            self._gids.append(gid)
+        return idx
+
+    def index_of(self, gid: str) -> int:
+        """Interned index of ``gid``, or -1 if it has no scars."""
+        return self._index.get(gid, -1)
+
+    def gid_of(self, idx: int) -> str:
+        return self._gids[idx]
+
+    def indices_of(self, gids: Iterable[str]) -> np.ndarray:
+        """Interned index of each gid (int64), -1 for gids without scars."""
+        return np.fromiter((self._index.get(g, -1) for g in gids), dtype=np.int64)
+
+    @staticmethod
+    def _pair_codes(idx_a, idx_b) -> np.ndarray:
+        """Order-independent int64 key of each geoid-index pair."""
+        idx_a = np.asarray(idx_a, dtype=np.int64)
+        idx_b = np.asarray(idx_b, dtype=np.int64)
+        return (np.minimum(idx_a, idx_b) << 32) | np.maximum(idx_a, idx_b)
+
+    def _find_pairs(self, codes: np.ndarray) -> np.ndarray:
+        """Aggregate slot of each pair code, -1 for pairs without scars."""
+        slots = np.full(len(codes), -1, dtype=np.int64)
+        for keys, key_slots in (self._pair_index, self._pair_buffer):
+            if len(keys):
+                pos = np.minimum(np.searchsorted(keys, codes), len(keys) - 1)
+                found = keys[pos] == codes
+                slots[found] = key_slots[pos[found]]
+        return slots
+
+    def _pair_slots(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        """Aggregate slot of each scar's geoid pair, adding new pairs (caller holds the lock)."""
+        codes = self._pair_codes(src, dst)
+        slots = self._find_pairs(codes)
+        missing = slots < 0
+        if missing.any():
+            new_codes, inverse = np.unique(codes[missing], return_inverse=True)
+            new_slots = np.arange(self._n_pairs, self._n_pairs + len(new_codes), dtype=np.int64)
+            slots[missing] = new_slots[inverse]
+            self._n_pairs += len(new_codes)
+            # Grow the aggregates before readers can find the new slots
+            self._grow(("_pair_sum", "_pair_count", "_pair_decayed", "_pair_anchor"), self._n_pairs)
+            keys, key_slots = self._pair_buffer
+            if len(keys) + len(new_codes) > _PAIR_BUFFER:
+                keys, key_slots = self._pair_index
+                self._pair_index = _merge_sorted(keys, key_slots, new_codes, new_slots, self._pair_buffer)
+                self._pair_buffer = _EMPTY_PAIRS
+            else:
+                self._pair_buffer = _merge_sorted(keys, key_slots, new_codes, new_slots)
+        return slots
+
+    # ---- writes ----
+
+    def _reserve(self, rows: int, geoids: int) -> None:
+        cap = len(self.src)
+        if self._n + rows > cap:
+            while cap < self._n + rows:
+                cap *= 2
+            for name in ("src", "dst", "weight", "ts"):
+                old = getattr(self, name)
+                new = np.empty(cap, dtype=old.dtype)
+                new[:self._n] = old[:self._n]
+                setattr(self, name, new)
+        self._grow(("_sum", "_count", "_decayed", "_anchor"), geoids)
+
+    def _grow(self, names: Tuple[str, ...], size: int) -> None:
+        """Double the zero-filled aggregate arrays ``names`` until ``size`` fits."""
+        cap = len(getattr(self, names[0]))
+        if size <= cap:
+            return
+        while cap < size:
+            cap *= 2
+        for name in names:
+            old = getattr(self, name)
+            new = np.zeros(cap, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _accumulate(self, keys: np.ndarray, w: np.ndarray, ts: np.ndarray, total: np.ndarray,
+                    count: np.ndarray, decayed: np.ndarray, anchor: np.ndarray) -> None:
+        """Add weights ``w`` stamped ``ts`` to the aggregates at ``keys``.
+
+        Each touched key's decayed sum is first moved forward to its newest
+        scar, then the new weights are added decayed to that anchor.
+        """
+        np.add.at(total, keys, w)
+        count += np.bincount(keys, minlength=len(count))
+        touched = np.unique(keys)
+        before = anchor[touched]
+        np.maximum.at(anchor, keys, ts)
+        decayed[touched] *= self._decay(anchor[touched] - before)
+        np.add.at(decayed, keys, w * self._decay(anchor[keys] - ts))
+
+    def append(self, gids_a: Sequence[str], gids_b: Sequence[str], weights,
+               timestamp: Optional[datetime] = None) -> range:
+        """Append one scar per ``(gids_a[k], gids_b[k])``; returns the new scar ids."""
+        weights = np.asarray(weights, dtype=np.float32).reshape(-1)
+        if not (len(gids_a) == len(gids_b) == len(weights)):
+            raise ValueError("gids_a, gids_b and weights must have the same length")
+        us = _to_micros(timestamp or datetime.utcnow())
+        with self._lock:
+            src = np.fromiter((self._intern(g) for g in gids_a), dtype=np.int32, count=len(weights))
+            dst = np.fromiter((self._intern(g) for g in gids_b), dtype=np.int32, count=len(weights))
+            return self._append_rows(src, dst, weights, np.full(len(weights), us, dtype=np.int64))
+
+    def _append_rows(self, src: np.ndarray, dst: np.ndarray, weights: np.ndarray, ts: np.ndarray) -> range:
+        start = self._n
+        k = len(weights)
+        pairs = self._pair_slots(src, dst)
+        self._reserve(k, len(self._gids))
+        end = start + k
+        self.src[start:end] = src
+        self.dst[start:end] = dst
+        self.weight[start:end] = weights
+        self.ts[start:end] = ts
+
+        # A scar counts once per endpoint; a self-scar counts once
+        w = weights.astype(np.float64)
+        other = src != dst
+        self._accumulate(
+            np.concatenate([src, dst[other]]), np.concatenate([w, w[other]]), np.concatenate([ts, ts[other]]),
+            self._sum, self._count, self._decayed, self._anchor,
+        )
+        self._accumulate(pairs, w, ts, self._pair_sum, self._pair_count, self._pair_decayed, self._pair_anchor)
+        self._n = end
+        self._adj = None
+        return range(start, end)
+
+    def _decay(self, age_us: np.ndarray) -> np.ndarray:
+        """Vectorized ``decay_factor`` for ages in microseconds."""
+        return np.exp(-np.asarray(age_us, dtype=np.float64) / (self.tau_seconds * 1e6))
+
+    def clear(self) -> None:
+        """Drop all scars and interned geoids."""
+        with self._lock:
+            self._init(1024)
+
+    # ---- aggregates ----
+
+    def totals(self, gid: str) -> Tuple[float, int]:
+        """Weight sum and scar count for one geoid."""
+        idx = self._index.get(gid)
+        if idx is None:
+            return 0.0, 0
+        return float(self._sum[idx]), int(self._count[idx])
+
+    def totals_many(self, gids: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-geoid weight sums (float64) and counts (int64), 0 for unknown gids."""
+        idx = np.fromiter((self._index.get(g, -1) for g in gids), dtype=np.int64)
+        known = idx >= 0
+        sums = np.zeros(len(idx))
+        counts = np.zeros(len(idx), dtype=np.int64)
+        sums[known] = self._sum[idx[known]]
+        counts[known] = self._count[idx[known]]
+        return sums, counts
+
+    def decayed_totals(self, gid: str, now: Optional[datetime] = None) -> Tuple[float, int]:
+        """Time-decayed weight sum at ``now`` (default: current time) and scar count."""
+        idx = self._index.get(gid)
+        if idx is None:
+            return 0.0, 0
+        age = (_to_micros(now or datetime.utcnow()) - int(self._anchor[idx])) / 1e6
+        return float(self._decayed[idx]) * decay_factor(age, self.tau_seconds), int(self._count[idx])
+
+    def decayed_totals_many(self, gids: Iterable[str],
+                            now: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """``decayed_totals`` for many geoids, 0 for unknown gids."""
+        idx = np.fromiter((self._index.get(g, -1) for g in gids), dtype=np.int64)
+        known = idx >= 0
+        us = _to_micros(now or datetime.utcnow())
+        sums = np.zeros(len(idx))
+        counts = np.zeros(len(idx), dtype=np.int64)
+        sums[known] = self._decayed[idx[known]] * self._decay(us - self._anchor[idx[known]])
+        counts[known] = self._count[idx[known]]
+        return sums, counts
+
+    def shared_totals(self, gid_a: str, gid_b: str) -> Tuple[float, int]:
+        """Weight sum and count of the scars touching both geoids.
+
+        For two gids these are the scars between them, in either direction;
+        a gid paired with itself shares all of its scars.
+        """
+        if gid_a == gid_b:
+            return self.totals(gid_a)
+        slot = self._pair_slot(gid_a, gid_b)
+        if slot < 0:
+            return 0.0, 0
+        return float(self._pair_sum[slot]), int(self._pair_count[slot])
+
+    def decayed_shared_totals(self, gid_a: str, gid_b: str,
+                              now: Optional[datetime] = None) -> Tuple[float, int]:
+        """``shared_totals`` with the sum time-decayed at ``now``."""
+        if gid_a == gid_b:
+            return self.decayed_totals(gid_a, now)
+        slot = self._pair_slot(gid_a, gid_b)
+        if slot < 0:
+            return 0.0, 0
+        age = (_to_micros(now or datetime.utcnow()) - int(self._pair_anchor[slot])) / 1e6
+        return float(self._pair_decayed[slot]) * decay_factor(age, self.tau_seconds), int(self._pair_count[slot])
+
+    def _pair_slot(self, gid_a: str, gid_b: str) -> int:
+        a = self._index.get(gid_a)
+        b = self._index.get(gid_b)
+        if a is None or b is None:
+            return -1
+        code = (min(a, b) << 32) | max(a, b)
+        for keys, key_slots in (self._pair_index, self._pair_buffer):
+            pos = int(keys.searchsorted(code))
+            if pos < len(keys) and keys[pos] == code:
+                return int(key_slots[pos])
+        return -1
+
+    def shared_totals_indexed(self, idx_a, idx_b, decayed: bool = False,
+                              now: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """``shared_totals`` for arrays of interned indices (see ``indices_of``).
+
+        ``idx_a`` and ``idx_b`` broadcast against each other; -1 shares
+        nothing. With ``decayed`` the sums are time-decayed at ``now``.
+        Returns float64 sums and int64 counts of the broadcast shape.
+        """
+        idx_a, idx_b = np.broadcast_arrays(np.asarray(idx_a, dtype=np.int64), np.asarray(idx_b, dtype=np.int64))
+        shape = idx_a.shape
+        idx_a, idx_b = idx_a.ravel(), idx_b.ravel()
+        sums = np.zeros(idx_a.size)
+        counts = np.zeros(idx_a.size, dtype=np.int64)
+        us = _to_micros(now or datetime.utcnow()) if decayed else 0
+
+        same = np.flatnonzero((idx_a == idx_b) & (idx_a >= 0))
+        own = idx_a[same]
+        counts[same] = self._count[own]
+        sums[same] = self._decayed[own] * self._decay(us - self._anchor[own]) if decayed else self._sum[own]
+
+        pair = np.flatnonzero((idx_a != idx_b) & (idx_a >= 0) & (idx_b >= 0))
+        if pair.size and self._n_pairs:
+            slot = self._find_pairs(self._pair_codes(idx_a[pair], idx_b[pair]))
+            found = slot >= 0
+            pair, slot = pair[found], slot[found]
+            counts[pair] = self._pair_count[slot]
+            if decayed:
+                sums[pair] = self._pair_decayed[slot] * self._decay(us - self._pair_anchor[slot])
+            else:
+                sums[pair] = self._pair_sum[slot]
+        return sums.reshape(shape), counts.reshape(shape)
+
+    # ---- reads ----
+
+    def _adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR offsets and scar ids per geoid index, rebuilt after appends."""
+        adj = self._adj
+        if adj is None:
+            n = self._n
+            src, dst = self.src[:n], self.dst[:n]
+            other = np.flatnonzero(src != dst)
+            ends = np.concatenate([src, dst[other]])
+            rows = np.concatenate([np.arange(n), other])
+            order = np.lexsort((rows, ends))
+            offsets = np.zeros(len(self._gids) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(ends, minlength=len(self._gids)), out=offsets[1:])
+            adj = self._adj = (offsets, rows[order])
+        return adj
+
+    def scar_ids(self, gid: str) -> np.ndarray:
+        """Ids of the scars touching ``gid``, oldest first."""
+        idx = self._index.get(gid)
+        if idx is None:
+            return np.empty(0, dtype=np.int64)
+        offsets, rows = self._adjacency()
+        if idx + 1 >= len(offsets):
+            return np.empty(0, dtype=np.int64)
+        return rows[offsets[idx]:offsets[idx + 1]]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, scar_id) -> bool:
+        return isinstance(scar_id, (int, np.integer)) and 0 <= scar_id < self._n
+
+    def __getitem__(self, scar_id) -> Scar:
+        if scar_id not in self:
+            raise KeyError(scar_id)
+        i = int(scar_id)
+        return Scar(
+            i,
+            (self._gids[self.src[i]], self._gids[self.dst[i]]),
+            float(self.weight[i]),
+            _from_micros(self.ts[i]),
+        )
+
+    def get(self, scar_id, default=None):
+        return self[scar_id] if scar_id in self else default
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._n))
+
+    def keys(self) -> range:
+        return range(self._n)
+
+    def values(self) -> Iterator[Scar]:
+        return (self[i] for i in range(self._n))
+
+    def items(self) -> Iterator[Tuple[int, Scar]]:
+        return ((i, self[i]) for i in range(self._n))
+
+    def nbytes(self) -> int:
+        """Bytes used by the scar columns and aggregates (excluding spare capacity).
+
+        20 bytes per scar, 32 per scarred geoid and 48 per scarred geoid pair
+        (32 of aggregates, 16 of index). The gid intern table is not counted.
+        """
+        scars = self.src.itemsize + self.dst.itemsize + self.weight.itemsize + self.ts.itemsize
+        geoids = self._sum.itemsize + self._count.itemsize + self._decayed.itemsize + self._anchor.itemsize
+        pairs = (self._pair_sum.itemsize + self._pair_count.itemsize + self._pair_decayed.itemsize
+                 + self._pair_anchor.itemsize + 2 * np.dtype(np.int64).itemsize)
+        return self._n * scars + len(self._gids) * geoids + self._n_pairs * pairs
+
+    # ---- snapshot / restore ----
+
+    def to_frame(self):
+        """Scars as a pandas DataFrame ``(gid_a, gid_b, weight, ts)``."""
+        import pandas as pd
+
+        n = self._n
+        gids = np.array(self._gids, dtype=object)
+        return pd.DataFrame({
+            "gid_a": gids[self.src[:n]],
+            "gid_b": gids[self.dst[:n]],
+            "weight": self.weight[:n],
+            "ts": self.ts[:n],
+        })
+
+    def load_frame(self, frame) -> range:
+        """Append scars from a frame shaped like ``to_frame()``."""
+        import pandas as pd
+
+        if not len(frame):
+            return range(self._n, self._n)
+        with self._lock:
+            codes, uniques = pd.factorize(pd.concat([frame["gid_a"], frame["gid_b"]], ignore_index=True))
+            remap = np.fromiter((self._intern(g) for g in uniques), dtype=np.int32, count=len(uniques))
+            k = len(frame)
+            return self._append_rows(
+                remap[codes[:k]], remap[codes[k:]],
+                frame["weight"].to_numpy(dtype=np.float32),
+                frame["ts"].to_numpy(dtype=np.int64),
+            )
+
+    def snapshot(self, target: Union[str, Path], table: str = "scars") -> None:
+        """Write all scars to a DuckDB database or, for ``*.parquet``, a Parquet file.
+
+        A DuckDB table is replaced wholesale.
+        """
+        import duckdb
+
+        target = Path(target)
+        frame = self.to_frame()
+        path = target.as_posix().replace("'", "''")
+        if target.suffix == ".parquet":
+            conn = duckdb.connect()
+            try:
+                conn.register("scar_frame", frame)
+                conn.execute(f"COPY scar_frame TO '{path}' (FORMAT PARQUET)")
+            finally:
+                conn.close()
+            return
+        conn = duckdb.connect(str(target))
+        try:
+            conn.register("scar_frame", frame)
+            conn.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM scar_frame")
+        finally:
+            conn.close()
+
+    def restore(self, source: Union[str, Path], table: str = "scars") -> range:
+        """Append scars from a ``snapshot()``; returns the new scar ids."""
+        import duckdb
+
+        source = Path(source)
+        if source.suffix == ".parquet":
+            conn = duckdb.connect()
+            path = source.as_posix().replace("'", "''")
+            query = f"SELECT * FROM read_parquet('{path}')"
+        else:
+            conn = duckdb.connect(str(source), read_only=True)
+            query = f"SELECT * FROM {table}"
+        try:
+            frame = conn.execute(query).df()
+        finally:
+            conn.close()
+        return self.load_frame(frame)
+
+
+class ScarView(_SequenceABC):
+    """Live, read-only list of one geoid's scar ids in a ``ScarStore``."""
+
+    __slots__ = ("gid", "store")
+
+    def __init__(self, gid: str, store: Optional[ScarStore] = None):
+        self.gid = gid
+        self.store = store if store is not None else SCAR_LOG
+
+    def __len__(self) -> int:
+        return self.store.totals(self.gid)[1]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.store.scar_ids(self.gid).tolist())
+
+    def __getitem__(self, i):
+        ids = self.store.scar_ids(self.gid).tolist()
+        return ids[i]
+
+    def __contains__(self, scar_id) -> bool:
+        if scar_id not in self.store:
+            return False
+        idx = self.store.index_of(self.gid)
+        return idx >= 0 and idx in (self.store.src[scar_id], self.store.dst[scar_id])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ScarView):
+            return self.gid == other.gid and self.store is other.store
+        return list(self) == other
+
+    def __repr__(self) -> str:
+        return f"ScarView({self.gid!r}, n={len(self)})"
+
+    def __reduce__(self):
+        # Rebind to the receiving process's store instead of pickling it
+        return (ScarView, (self.gid,))
+
+
+SCAR_LOG = ScarStore()
+
 
 def create_scar(g1, g2, weight):
-    s = Scar(str(uuid4()), (g1.gid, g2.gid), weight, datetime.utcnow())
-    SCAR_LOG[s.scar_id] = s
-    g1.scars.append(s.scar_id)
-    g2.scars.append(s.scar_id)
-    return s
+    ids = SCAR_LOG.append([g1.gid], [g2.gid], [weight])
+    return SCAR_LOG[ids[0]]
+
+
+def create_scars(pairs: Sequence[Tuple], weights: Sequence[float]) -> range:
+    """Create one scar per ``(g1, g2)`` pair in a single append.
+
+    Equivalent to calling ``create_scar`` for each pair in order (sharing
+    one timestamp). Returns the new scar ids.
+    """
+    return SCAR_LOG.append([g1.gid for g1, _ in pairs], [g2.gid for _, g2 in pairs], weights)
 
 
 def fetch_scars(g1, g2):
-    ids = set(g1.scars) | set(g2.scars)
-    return [SCAR_LOG[i] for i in ids]
+    ids = set(SCAR_LOG.scar_ids(g1.gid).tolist()) | set(SCAR_LOG.scar_ids(g2.gid).tolist())
+    return [SCAR_LOG[i] for i in sorted(ids)]
@@ -2,26 +2,36 @@
 Persistent lattice storage using DuckDB.
 Very first cut - only what the current tests need.Now with observability and entropy tracking."""
 
+import re
+import itertools
 import time
 import threading
+import weakref
 import json
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from contextlib import contextmanager
 from collections import Counter
 from uuid import uuid4
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 try:
     import duckdb
 except ImportError:
     raise ImportError("DuckDB is required for persistent storage. Install with: pip install duckdb")
+# Upserts rewrite indexed columns (updated_at, identity_type), which DuckDB
+# only supports from 1.4; older releases reject or mangle those updates
+if tuple(int(part) for part in duckdb.__version__.split(".")[:2]) < (1, 4):
+    raise ImportError(f"DuckDB >= 1.4 is required for persistent storage (found {duckdb.__version__}). "
+                      "Install with: pip install 'duckdb>=1.4'")
 
-from .echoform import EchoForm
+from .echoform import EchoForm, TIME_DECAY_TAU
+from .entropy import DEFAULT_ENTROPY_SCALING, DEFAULT_TAU_SECONDS
 from .identity import Identity
+from .term_table import TermTable
 # Import observability hooks
 try:
-    from .observability import track_entropy, storage_operations_timer, update_identity_gauges, log_entropy_event
+    from .observability import track_entropy, storage_operations_timer, set_identity_gauges, log_entropy_event
     OBSERVABILITY_AVAILABLE = True
 except ImportError:
     # Fallback if prometheus_client is not available
@@ -55,14 +65,234 @@ def reset_storage_metrics():
 _storage_instance = None
 _storage_lock = threading.RLock()
 
+def _decayed_terms_sql(terms: str, factor: str) -> str:
+    """SQL list of JSON ``terms`` with every numeric ``intensity`` scaled by ``factor``."""
+    return f"""list_transform({terms}, t -> CASE
+        WHEN json_type(t, '$.intensity') IN ('BIGINT', 'UBIGINT', 'DOUBLE')
+        THEN json_merge_patch(t, json_object('intensity', CAST(t->>'intensity' AS DOUBLE) * {factor}))
+        ELSE t END)"""
+
+
+# Secondary indexes: name -> "table(columns)"
+_INDEXES = {
+    "idx_echoforms_updated_at": "echoforms(updated_at DESC)",
+    "idx_echoforms_domain": "echoforms(domain)",
+    "idx_identities_updated_at": "identities(updated_at DESC)",
+    "idx_identities_type": "identities(identity_type)",
+    "idx_identities_entropy": "identities(entropy_score DESC)",
+    "idx_identity_edges_src": "identity_edges(src_id)",
+    "idx_identity_edges_dst": "identity_edges(dst_id)",
+    "idx_identity_edges_type": "identity_edges(edge_type)",
+    # No index on identity_terms.term: postings are kept sorted by term
+    # (see compact_search_index) and a range scan beats fetching them one
+    # by one through an index
+    "idx_identity_terms_id": "identity_terms(id)",
+}
+
+# Staged row layouts for bulk merges: key, created_at, updated_at, then the
+# columns an upsert overwrites. created_at is only written for new keys.
+# term_scale is the factor apply_time_decay has applied to the form's term
+# intensities since its blob was written (see _reinflate_form).
+_FORM_COLUMNS = ("anchor", "created_at", "updated_at", "blob", "domain", "phase", "intensity_sum",
+                 "base_intensity", "last_decay_ts", "decay_tau", "topology", "term_scale")
+_IDENTITY_COLUMNS = ("id", "created_at", "updated_at", "identity_type", "lang_axis", "entropy_score",
+                     "base_weight", "last_decay_ts", "decay_tau", "tags", "related_ids", "meta",
+                     "created_us", "updated_us", "legacy", "raw", "echo", "doc_len")
+
+# Identity fields are typed columns; only ``meta`` is JSON. The stored
+# weight is ``base_weight``; ``created_us``/``updated_us`` are the
+# Identity's own timestamps (microseconds since the epoch, UTC), unlike
+# the ``created_at``/``updated_at`` write times; ``legacy`` marks
+# identities carrying the ``content``/``metadata`` attributes. Each entry
+# maps a column to its type and its backfill from the ``data`` JSON
+# document older databases kept instead.
+_IDENTITY_FIELDS = {
+    "raw": ("TEXT", "coalesce(data->>'raw', '')"),
+    "echo": ("TEXT", "coalesce(data->>'echo', '')"),
+    "lang_axis": ("TEXT", "coalesce(data->>'lang_axis', lang_axis, 'en')"),
+    "tags": ("VARCHAR[]", "coalesce(TRY_CAST(data->'tags' AS VARCHAR[]), [])"),
+    "base_weight": ("DOUBLE", "coalesce(TRY_CAST(data->>'weight' AS DOUBLE), base_weight, 1.0)"),
+    "related_ids": ("VARCHAR[]", "coalesce(TRY_CAST(data->'related_ids' AS VARCHAR[]), [])"),
+    "meta": ("JSON", "coalesce(data->'meta', '{}')"),
+    "created_us": ("BIGINT", "epoch_us(TRY_CAST(data->>'created_at' AS TIMESTAMPTZ))"),
+    "updated_us": ("BIGINT", "epoch_us(TRY_CAST(data->>'updated_at' AS TIMESTAMPTZ))"),
+    "legacy": ("BOOLEAN", "json_exists(data, '$.content')"),
+}
+# Columns an Identity is decoded from (see _decode_identities)
+_IDENTITY_SELECT = ("id, identity_type, raw, echo, lang_axis, tags, base_weight, related_ids, meta, "
+                    "created_us, updated_us, legacy")
+# Ids per fetch_identities_many query: an IN list DuckDB still answers
+# from the primary key index (index_scan_max_count is 2048)
+_FETCH_MANY_CHUNK = 1024
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Decay-on-read: rows persist a base value, the time it was taken at and
+# their tau; the current value is base * exp(-(now - last_decay_ts) / tau).
+# Parameterized on the read time ($now).
+_DECAYED_INTENSITY_SQL = "base_intensity * exp(-($now - last_decay_ts) / decay_tau)"
+_DECAYED_WEIGHT_SQL = "base_weight * exp(-($now - last_decay_ts) / decay_tau)"
+
+# identity_edges rows for the identities in {source} (any relation with the
+# identities columns): one per entry of related_ids, typed by the
+# meta.relationship_type when set (else the identity_type), weighted by the
+# stored weight.
+_EDGES_SQL = """
+    SELECT id, unnest(related_ids),
+           coalesce(json_extract_string(meta, '$.relationship_type'), identity_type),
+           base_weight
+    FROM {source}
+"""
+
+# Full-text search: identities.raw/echo are tokenized into identity_terms
+# postings (term, id, tf, doc_len) and ranked with BM25
+_SEARCH_TOKEN = re.compile(r"\w+")
+_IDENTITY_TERMS_DDL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        term TEXT NOT NULL,
+        id TEXT NOT NULL,
+        tf INTEGER NOT NULL,
+        doc_len INTEGER NOT NULL
+    );
+"""
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_BM25_SQL = f"""
+    WITH query AS (SELECT DISTINCT unnest($terms::VARCHAR[]) AS term),
+    postings AS (
+        SELECT term, id, tf, doc_len FROM identity_terms WHERE term IN (SELECT term FROM query)
+    ),
+    corpus AS (SELECT count(*) AS n, coalesce(avg(doc_len), 0.0) AS avgdl FROM identities),
+    idf AS (
+        SELECT term, ln(1 + (any_value(n) - count(*) + 0.5) / (count(*) + 0.5)) AS idf
+        FROM postings, corpus GROUP BY term
+    ),
+    scores AS (
+        SELECT id, sum(idf * tf * ($k1 + 1) / (tf + $k1 * (1 - $b + $b * doc_len / greatest(avgdl, 1.0)))) AS score
+        FROM postings JOIN idf USING (term), corpus
+        GROUP BY id ORDER BY score DESC, id LIMIT $limit
+    )
+    SELECT {_IDENTITY_SELECT} FROM scores JOIN identities USING (id)
+    ORDER BY scores.score DESC, id
+"""
+
+
+def _search_terms(*texts: Optional[str]) -> Counter:
+    """Term frequencies of ``texts`` as indexed for search (lowercased words)."""
+    counts = Counter()
+    for text in texts:
+        if text:
+            counts.update(_SEARCH_TOKEN.findall(text.lower()))
+    return counts
+
+
+def _to_micros(moment: Optional[datetime]) -> Optional[int]:
+    """Microseconds since the epoch of ``moment`` (naive means local time, as in ``timestamp()``)."""
+    if moment is None:
+        return None
+    return (moment.astimezone(timezone.utc) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: List[Optional[int]]) -> List[Optional[datetime]]:
+    """Aware UTC datetimes for microsecond timestamps (``None`` stays ``None``).
+
+    Batches are converted as one array; a datetime per value costs more
+    than the array setup only for a handful of values.
+    """
+    if len(micros) < 16:
+        return [None if us is None else _EPOCH + timedelta(microseconds=us) for us in micros]
+    import numpy as np
+    import pandas as pd
+
+    stamps = pd.DatetimeIndex(np.array(micros, dtype="datetime64[us]"))
+    moments = stamps.tz_localize(timezone.utc).to_pydatetime()
+    moments[stamps.isna()] = None
+    return moments.tolist()
+
+
+def _decode_identities(rows: List[tuple]) -> List[Identity]:
+    """Identities from rows of the ``_IDENTITY_SELECT`` columns."""
+    created = _from_micros([row[9] for row in rows])
+    updated = _from_micros([row[10] for row in rows])
+    return [
+        Identity.restore(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
+                         json.loads(row[8]) if row[8] else {}, created_at, updated_at, row[11])
+        for row, created_at, updated_at in zip(rows, created, updated)
+    ]
+
+
+def _reinflate_form(blob, term_scale: Optional[float], term_table: bool = False) -> EchoForm:
+    """The EchoForm in ``blob`` with its numeric term intensities scaled by ``term_scale``."""
+    form = EchoForm.reinflate(blob, term_table)
+    if term_scale is None or term_scale == 1.0:
+        return form
+    if isinstance(form.terms, TermTable):
+        form.terms.scale_intensities(term_scale)
+    else:
+        for term in form.terms:
+            intensity = term.get("intensity")
+            if type(intensity) in (int, float):
+                term["intensity"] = intensity * term_scale
+    return form
+
+
+def _staged_identity_row(staged: tuple) -> tuple:
+    """The ``_IDENTITY_SELECT`` columns of a staged ``_IDENTITY_COLUMNS`` row."""
+    fields = dict(zip(_IDENTITY_COLUMNS, staged))
+    return tuple(fields[name] for name in _IDENTITY_SELECT.split(", "))
+
+
+class _ThreadCursor:
+    """One thread's read cursor, held in that thread's ``threading.local``.
+
+    The local drops it when the thread exits; a finalizer then closes the
+    cursor, so short-lived threads do not leave cursors behind.
+    """
+
+    __slots__ = ("cursor", "__weakref__")
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+
 class LatticeStorage:
-    """DuckDB-based persistent storage for EchoForms"""
+    """DuckDB-based persistent storage for EchoForms
+
+    With ``write_behind=True`` (or after ``enable_write_behind()``),
+    ``store_form``/``store_identity`` only stage rows in memory; the rows
+    are merged in bulk once ``flush_rows`` are pending or every
+    ``flush_interval`` seconds, and on ``flush()``/``close()``. Point
+    fetches see staged rows and every other query flushes first, so reads
+    always reflect earlier writes.
+
+    Identity counts per type are kept in process: writes add the rows
+    they insert, and a background timer (every ``gauge_interval``
+    seconds) reconciles them with one ``GROUP BY`` query, which also
+    catches type changes and deletes made elsewhere. With observability
+    available the counts drive the active identities gauges.
+
+    Concurrency: every thread reads through its own cursor (a separate
+    DuckDB connection to the same database), so reads run concurrently
+    with each other and with writes and see the last committed state. A
+    thread's cursor is closed when the thread exits, so servers that cycle
+    through threads do not accumulate cursors. Writes go through the single writer connection one at a time, under
+    the writer lock; write-behind turns them into a queue drained by the
+    flusher thread. With ``read_only=True`` the database is opened
+    read-only for reporting processes: no schema changes, no writes, and
+    (being a DuckDB file lock) only while no process has it open for
+    writing.
+    """
     
-    def __init__(self, db_path: str = "kimera_lattice.db"):
+    def __init__(self, db_path: str = "kimera_lattice.db", write_behind: bool = False,
+                 flush_rows: int = 1000, flush_interval: float = 1.0, gauge_interval: float = 60.0,
+                 read_only: bool = False):
         self.db_path = Path(db_path)
+        self.read_only = read_only
+        if read_only and write_behind:
+            raise ValueError("a read-only storage cannot write behind")
         
         # Handle existing file that might not be a valid DuckDB
-        if self.db_path.exists():
+        if self.db_path.exists() and not read_only:
             try:
                 # Test if it's a valid DuckDB file
                 test_conn = duckdb.connect(str(self.db_path))
@@ -71,9 +301,35 @@ class LatticeStorage:
                 # Not a valid DuckDB file - remove it
                 self.db_path.unlink()
         
-        self._conn = duckdb.connect(str(self.db_path), read_only=False)
-        self._lock = threading.RLock()
-        self._init_schema()
+        self._conn = duckdb.connect(str(self.db_path), read_only=read_only)
+        self._lock = threading.RLock()  # the writer lock
+        self._local = threading.local()
+        self._cursors: Dict[int, Any] = {}  # open read cursors by key, for close()
+        self._cursor_keys = itertools.count()
+        self._cursors_lock = threading.Lock()
+        if not read_only:
+            self._init_schema()
+
+        # Write-behind buffers: key -> staged row (see _FORM_COLUMNS / _IDENTITY_COLUMNS)
+        self._pending_forms: Dict[str, tuple] = {}
+        self._pending_identities: Dict[str, tuple] = {}
+        self._write_behind = False
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+        if write_behind:
+            self.enable_write_behind(flush_rows, flush_interval)
+
+        self._identity_counts: Counter = Counter()
+        self.reconcile_identity_counts()
+        self._stop_reconciler = threading.Event()
+        self._reconciler: Optional[threading.Thread] = None
+        if gauge_interval > 0:
+            # The timer only holds a weak reference, so an unclosed storage can still be collected
+            self._reconciler = threading.Thread(
+                target=self._reconcile_loop, args=(weakref.ref(self), self._stop_reconciler, gauge_interval),
+                name="lattice-gauge-reconcile", daemon=True
+            )
+            self._reconciler.start()
     
     def _init_schema(self):
         """Initialize the database schema"""
@@ -83,12 +339,17 @@ class LatticeStorage:
                 self._conn.execute("""
                     CREATE TABLE IF NOT EXISTS echoforms (
                         anchor TEXT PRIMARY KEY,
-                        blob JSON,
+                        blob BLOB,
                         created_at DOUBLE,
                         updated_at DOUBLE,
                         domain TEXT,
                         phase TEXT,
-                        intensity_sum DOUBLE
+                        intensity_sum DOUBLE,
+                        base_intensity DOUBLE,
+                        last_decay_ts DOUBLE,
+                        decay_tau DOUBLE,
+                        topology JSON,
+                        term_scale DOUBLE DEFAULT 1.0
                     );
                 """)
                 
@@ -97,90 +358,301 @@ class LatticeStorage:
                     CREATE TABLE IF NOT EXISTS identities (
                         id TEXT PRIMARY KEY,
                         identity_type TEXT NOT NULL,
-                        data JSON NOT NULL,
                         created_at DOUBLE NOT NULL,
                         updated_at DOUBLE NOT NULL,
                         lang_axis TEXT,
-                        entropy_score DOUBLE
+                        entropy_score DOUBLE,
+                        base_weight DOUBLE,
+                        last_decay_ts DOUBLE,
+                        decay_tau DOUBLE,
+                        raw TEXT,
+                        echo TEXT,
+                        doc_len INTEGER,
+                        tags VARCHAR[],
+                        related_ids VARCHAR[],
+                        meta JSON,
+                        created_us BIGINT,
+                        updated_us BIGINT,
+                        legacy BOOLEAN
                     );
                 """)
                 
-                # Create indexes for performance
-                self._conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_echoforms_updated_at 
-                    ON echoforms(updated_at DESC);
-                """)
-                
-                self._conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_echoforms_domain 
-                    ON echoforms(domain);
-                """)
-                
-                self._conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_identities_updated_at 
-                    ON identities(updated_at DESC);
-                """)
-                
-                self._conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_identities_type 
-                    ON identities(identity_type);
-                """)
+                self._migrate_form_codec()
+                self._migrate_identity_columns()
+                self._migrate_lazy_decay()
+                self._migrate_identity_edges()
+                self._migrate_search_index()
                 
+                # Create indexes for performance
+                for name, target in _INDEXES.items():
+                    self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target};")
+
+    def _migrate_form_codec(self):
+        """Re-encode JSON form blobs with the binary codec in databases that predate it.
+
+        The blobs are converted in batches through a second cursor, and
+        ``topology`` is split out for SQL. Forms read from JSON blobs
+        either way (``EchoForm.reinflate`` takes both), so a database
+        left half-converted still works.
+        """
+        kind = self._conn.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'echoforms' AND column_name = 'blob'
+        """).fetchone()[0]
+        if kind == "BLOB":
+            return
+        self._conn.execute("ALTER TABLE echoforms ADD COLUMN IF NOT EXISTS packed BLOB")
+        self._conn.execute("ALTER TABLE echoforms ADD COLUMN IF NOT EXISTS topology JSON")
+        reader = self._conn.cursor()
+        try:
+            reader.execute("SELECT anchor, blob FROM echoforms WHERE packed IS NULL")
+            while True:
+                rows = reader.fetchmany(10_000)
+                if not rows:
+                    break
+                forms = [EchoForm.reinflate(blob) for _, blob in rows]
                 self._conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_identities_entropy 
-                    ON identities(entropy_score DESC);
-                """)
+                    UPDATE echoforms SET packed = p.packed, topology = p.topology
+                    FROM (SELECT unnest($anchors) AS anchor, unnest($packed) AS packed,
+                                 unnest($topology) AS topology) AS p
+                    WHERE echoforms.anchor = p.anchor
+                """, {"anchors": [anchor for anchor, _ in rows], "packed": [form.pack() for form in forms],
+                      "topology": [json.dumps(form.topology) for form in forms]})
+        finally:
+            reader.close()
+        # DuckDB refuses to drop a column while an index covers a later one
+        indexes = [name for name, target in _INDEXES.items() if target.startswith("echoforms(")]
+        with self._indexes_dropped(*indexes):
+            self._conn.execute("ALTER TABLE echoforms DROP COLUMN blob")
+            self._conn.execute("ALTER TABLE echoforms RENAME COLUMN packed TO blob")
+
+    def _migrate_identity_columns(self):
+        """Move identity fields out of the ``data`` JSON column in databases that still have it.
+
+        Every field becomes its typed column (see ``_IDENTITY_FIELDS``),
+        then ``data`` is dropped.
+        """
+        columns = {name for (name,) in self._conn.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = 'identities'"
+        ).fetchall()}
+        if "data" not in columns:
+            return
+        for column, (kind, _) in _IDENTITY_FIELDS.items():
+            self._conn.execute(f"ALTER TABLE identities ADD COLUMN IF NOT EXISTS {column} {kind}")
+        assignments = ", ".join(f"{column} = {backfill}" for column, (_, backfill) in _IDENTITY_FIELDS.items())
+        self._conn.execute(f"UPDATE identities SET {assignments}")
+        # DuckDB refuses to drop a column while an index covers a later one
+        indexes = [name for name, target in _INDEXES.items() if target.startswith("identities(")]
+        with self._indexes_dropped(*indexes):
+            self._conn.execute("ALTER TABLE identities DROP COLUMN data")
+
+    def _migrate_lazy_decay(self):
+        """Add and backfill the decay-on-read columns in databases that predate them.
+
+        Forms decay from their last stored ``intensity_sum`` (at
+        ``updated_at``, with the base tau since their entropy is unknown
+        here); identities decay from their stored weight since
+        ``created_at``. Rows are exact again on their next write. Forms
+        also get a ``term_scale`` of 1.0 (no decay applied to their terms).
+        """
+        for table, columns in (("echoforms", ("base_intensity", "last_decay_ts", "decay_tau")),
+                               ("identities", ("base_weight", "last_decay_ts", "decay_tau"))):
+            for column in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} DOUBLE")
+        self._conn.execute("ALTER TABLE echoforms ADD COLUMN IF NOT EXISTS term_scale DOUBLE DEFAULT 1.0")
+        self._conn.execute("""
+            UPDATE echoforms
+            SET base_intensity = coalesce(intensity_sum, 0.0), last_decay_ts = updated_at, decay_tau = ?
+            WHERE decay_tau IS NULL
+        """, (TIME_DECAY_TAU,))
+        self._conn.execute("""
+            UPDATE identities
+            SET base_weight = coalesce(base_weight, 1.0),
+                last_decay_ts = created_at,
+                decay_tau = ? * (1 + ? * coalesce(entropy_score, 0.0))
+            WHERE decay_tau IS NULL
+        """, (DEFAULT_TAU_SECONDS, DEFAULT_ENTROPY_SCALING))
+
+    def _migrate_identity_edges(self):
+        """Create ``identity_edges``, backfilling it from ``related_ids`` when new.
+
+        The table is the normalized form of ``identities.related_ids``:
+        ``src_id`` is the identity holding the list, ``dst_id`` one of its
+        entries. Every identity write rewrites the edges of that identity.
+        """
+        exists = self._conn.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = 'identity_edges'"
+        ).fetchone()[0]
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS identity_edges (
+                src_id TEXT NOT NULL,
+                dst_id TEXT NOT NULL,
+                edge_type TEXT,
+                weight DOUBLE
+            );
+        """)
+        if not exists:
+            self._conn.execute(f"INSERT INTO identity_edges {_EDGES_SQL.format(source='identities')}")
+
+    def _migrate_search_index(self):
+        """Add ``doc_len`` and ``identity_terms``, backfilling both from ``raw``/``echo`` when new."""
+        self._conn.execute("ALTER TABLE identities ADD COLUMN IF NOT EXISTS doc_len INTEGER")
+        exists = self._conn.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = 'identity_terms'"
+        ).fetchone()[0]
+        self._conn.execute(_IDENTITY_TERMS_DDL.format(name="identity_terms"))
+        if exists:
+            return
+        # Read through a second cursor so postings can be written while iterating
+        reader = self._conn.cursor()
+        try:
+            reader.execute("SELECT id, raw, echo FROM identities")
+            while True:
+                docs = reader.fetchmany(50_000)
+                if not docs:
+                    break
+                self._insert_postings(docs)
+        finally:
+            reader.close()
+        self._conn.execute("""
+            UPDATE identities SET doc_len = coalesce(p.doc_len, 0)
+            FROM identities AS i
+            LEFT JOIN (SELECT id, any_value(doc_len) AS doc_len FROM identity_terms GROUP BY id) AS p USING (id)
+            WHERE identities.id = i.id
+        """)
+        self._rewrite_search_index()
+
+    def _rewrite_search_index(self):
+        """Rewrite ``identity_terms`` sorted by term (indexes are created by the caller)."""
+        self._conn.execute("DROP TABLE IF EXISTS identity_terms_sorted")
+        self._conn.execute(_IDENTITY_TERMS_DDL.format(name="identity_terms_sorted"))
+        self._conn.execute("INSERT INTO identity_terms_sorted SELECT * FROM identity_terms ORDER BY term, id")
+        self._conn.execute("DROP TABLE identity_terms")
+        self._conn.execute("ALTER TABLE identity_terms_sorted RENAME TO identity_terms")
+
+    def compact_search_index(self) -> int:
+        """Cluster the search postings by term; returns the number of postings.
+
+        Postings written since the last compaction sit unsorted at the end
+        of ``identity_terms``, and a frequent term's postings there are
+        scattered over the whole tail. After a rewrite sorted by term, a
+        lookup only reads the row groups holding that term. Worth running
+        after bulk loads.
+        """
+        with self._lock:
+            self.flush()
+            with storage_timer("compact_search_index"):
+                with self._transaction():
+                    self._rewrite_search_index()
+                for name, target in _INDEXES.items():
+                    if target.startswith("identity_terms("):
+                        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+                return self._conn.execute("SELECT count(*) FROM identity_terms").fetchone()[0]
+
+    def _insert_postings(self, docs: Iterable[tuple]):
+        """Write the search postings of ``(id, raw, echo)`` docs."""
+        terms, ids, tfs, lens = [], [], [], []
+        for identity_id, raw, echo in docs:
+            counts = _search_terms(raw, echo if echo != raw else None)
+            doc_len = sum(counts.values())
+            for term, tf in counts.items():
+                terms.append(term)
+                ids.append(identity_id)
+                tfs.append(tf)
+                lens.append(doc_len)
+        if terms:
+            self._conn.execute(
+                "INSERT INTO identity_terms SELECT unnest($terms), unnest($ids), unnest($tfs), unnest($lens)",
+                {"terms": terms, "ids": ids, "tfs": tfs, "lens": lens},
+            )
+
+    def _sync_terms(self, source: str, params: tuple, docs: Iterable[tuple]):
+        """Replace the search postings of the identities in ``source`` with those of ``docs``."""
+        self._conn.execute(self._statement(f"DELETE FROM identity_terms WHERE id IN (SELECT id FROM {source})"),
+                           params)
+        self._insert_postings(docs)
+
+    def _sync_edges(self, source: str, params: tuple = ()):
+        """Replace the edges of the identities in ``source`` with their current ``related_ids``."""
+        self._conn.execute(self._statement(f"DELETE FROM identity_edges WHERE src_id IN (SELECT id FROM {source})"),
+                           params)
+        self._conn.execute(self._statement(f"INSERT INTO identity_edges {_EDGES_SQL.format(source=source)}"),
+                           params)
+
+    @contextmanager
+    def _indexes_dropped(self, *names: str):
+        """Drop secondary indexes around a full-table rewrite and rebuild them after.
+
+        DuckDB updates indexed columns row by row (delete + insert); for a
+        rewrite of every row, rebuilding the index once is far cheaper. The
+        drop must not be inside an explicit transaction to take effect.
+        """
+        for name in names:
+            self._conn.execute(f"DROP INDEX IF EXISTS {name}")
+        try:
+            yield
+        finally:
+            for name in names:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {_INDEXES[name]}")
     
     def store_form(self, form: EchoForm):
         """Store or update an EchoForm"""
         with self._lock:
-            blob = form.flatten()
-            now = time.time()
-            
+            if self._write_behind:
+                self._stage(self._pending_forms, self._form_row(form, time.time()))
+                return
+            row = self._form_row(form, time.time())
             with storage_timer("store_form"):
-                self._conn.execute("""
-                    INSERT OR REPLACE INTO echoforms 
-                    (anchor, blob, created_at, updated_at, domain, phase, intensity_sum)
-                    VALUES (?, ?, 
-                        COALESCE((SELECT created_at FROM echoforms WHERE anchor = ?), ?),
-                        ?, ?, ?, ?)
-                """, (
-                    form.anchor, blob, form.anchor, now, now,
-                    form.domain, form.phase, form.intensity_sum()
-                ))
+                self._upsert("echoforms", _FORM_COLUMNS, row)
     
-    def fetch_form(self, anchor: str) -> Optional[EchoForm]:
-        """Fetch an EchoForm by anchor"""
+    def fetch_form(self, anchor: str, term_table: bool = False) -> Optional[EchoForm]:
+        """Fetch an EchoForm by anchor
+
+        With ``term_table`` its terms come back as a TermTable (see
+        ``EchoForm.reinflate``).
+        """
+        # A flush merges rows before unstaging them, so a row is always in
+        # the buffer or committed
+        staged = self._pending_forms.get(anchor)
+        if staged is not None:
+            return EchoForm.reinflate(staged[3], term_table)
         with storage_timer("fetch_form"):
-            result = self._conn.execute(
-                "SELECT blob FROM echoforms WHERE anchor = ?", (anchor,)
-            ).fetchone()
+            result = self._cursor().execute(
+                self._statement("SELECT blob, term_scale FROM echoforms WHERE anchor = ?"), (anchor,)
+            ).fetchall()
         
         if result:
-            return EchoForm.reinflate(result[0])
+            return _reinflate_form(*result[0], term_table)
         return None
     
     def update_form(self, form: EchoForm):
         """Update an existing form (alias for store_form)"""
         self.store_form(form)
     
-    def list_forms(self, limit: int = 10, domain: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List recent forms with metadata"""
-        query = """
-            SELECT anchor, created_at, updated_at, domain, phase, intensity_sum
+    def list_forms(self, limit: int = 10, domain: Optional[str] = None,
+                   order_by: str = "updated_at") -> List[Dict[str, Any]]:
+        """List recent forms with metadata
+
+        ``intensity_sum`` is the decayed intensity at read time. ``order_by``
+        is ``"updated_at"`` (most recent first) or ``"intensity"`` (most
+        intense first, ranked on the same read-time value).
+        """
+        if order_by not in ("updated_at", "intensity"):
+            raise ValueError(f"order_by must be 'updated_at' or 'intensity', not {order_by!r}")
+        query = f"""
+            SELECT anchor, created_at, updated_at, domain, phase, {_DECAYED_INTENSITY_SQL} AS intensity
             FROM echoforms
         """
-        params = []
+        params: Dict[str, Any] = {"now": time.time(), "limit": limit}
         
         if domain:
-            query += " WHERE domain = ?"
-            params.append(domain)
+            query += " WHERE domain = $domain"
+            params["domain"] = domain
         
-        query += " ORDER BY updated_at DESC LIMIT ?"
-        params.append(limit)
+        query += f" ORDER BY {order_by} DESC LIMIT $limit"
         
-        with storage_timer("list_forms"):
-            rows = self._conn.execute(query, params).fetchall()
+        with self._reading() as cur, storage_timer("list_forms"):
+            rows = cur.execute(query, params).fetchall()
         
         return [
             {
@@ -196,15 +668,15 @@ class LatticeStorage:
     
     def get_form_count(self, domain: Optional[str] = None) -> int:
         """Get count of stored forms"""
-        with storage_timer("get_form_count"):
+        with self._reading() as cur, storage_timer("get_form_count"):
             if domain:
-                result = self._conn.execute(
+                result = cur.execute(
                     "SELECT COUNT(*) FROM echoforms WHERE domain = ?", (domain,)
-                ).fetchone()
+                ).fetchall()
             else:
-                result = self._conn.execute("SELECT COUNT(*) FROM echoforms").fetchone()
+                result = cur.execute("SELECT COUNT(*) FROM echoforms").fetchall()
         
-        return result[0] if result else 0
+        return result[0][0] if result else 0
     
     def prune_old_forms(self, older_than_seconds: float = None, older_than_days: float = None):
         """Remove forms older than specified time
@@ -222,6 +694,7 @@ class LatticeStorage:
             
         cutoff = time.time() - cutoff_seconds
         with self._lock:
+            self.flush()
             with storage_timer("prune_old_forms"):
                 cursor = self._conn.execute(
                     "DELETE FROM echoforms WHERE created_at < ?", (cutoff,)
@@ -230,39 +703,74 @@ class LatticeStorage:
                 self._conn.commit()
                 return deleted
     
-    def apply_time_decay(self, tau_days: float = 14.0):
-        """Apply exponential time decay to all forms"""
-        tau_seconds = tau_days * 24 * 3600
-        now = time.time()
-        
+    def apply_time_decay(self, tau_days: float = 14.0) -> int:
+        """Apply exponential time decay to all forms
+
+        Every numeric term intensity is scaled by ``exp(-age / tau)`` (age
+        since the form's ``created_at``), in one set-based ``UPDATE``: the
+        factor is multiplied into the form's ``term_scale``, which reading
+        the form applies to the terms in its blob, and into its read-time
+        intensity, which becomes the new ``intensity_sum``. Scaling every
+        intensity leaves the term entropy, and so the form's tau, as it
+        was. Returns the number of forms updated.
+
+        Reads already decay lazily (see ``list_forms``); this bakes the
+        creation-age decay in on top of that.
+        """
         with self._lock:
-            with storage_timer("apply_time_decay"):
-                # Get all forms
-                rows = self._conn.execute(
-                    "SELECT anchor, blob, created_at FROM echoforms"
-                ).fetchall()
-                
-                for anchor, blob, created_at in rows:
-                    form = EchoForm.reinflate(blob)
-                    age_seconds = now - created_at
-                    
-                    # Apply decay to all terms
-                    import math
-                    decay_factor = math.exp(-age_seconds / tau_seconds)
-                    
-                    for term in form.terms:
-                        if 'intensity' in term:
-                            term['intensity'] *= decay_factor
-                    
-                    # Update the form
-                    self.store_form(form)
+            self.flush()
+            with storage_timer("apply_time_decay"), self._indexes_dropped("idx_echoforms_updated_at"):
+                row = self._conn.execute(f"""
+                    UPDATE echoforms
+                    SET term_scale = coalesce(term_scale, 1.0) * exp(-($now - created_at) / $tau),
+                        intensity_sum = exp(-($now - created_at) / $tau) * {_DECAYED_INTENSITY_SQL},
+                        base_intensity = exp(-($now - created_at) / $tau) * {_DECAYED_INTENSITY_SQL},
+                        last_decay_ts = $now, updated_at = $now
+                """, {"now": time.time(), "tau": tau_days * 24 * 3600}).fetchone()
+        return row[0] if row else 0
     
-    def close(self):
-        """Close the database connection"""
+    def compact_forms(self, threshold: Optional[int] = None, max_age: Optional[float] = None,
+                      keep: Optional[int] = None, tolerance: Optional[float] = None,
+                      domain: Optional[str] = "cls") -> int:
+        """Roll up old cls_event terms of stored forms (see ``EchoForm.compact_terms``)
+
+        Forms in ``domain`` (all forms if None) with at least ``threshold``
+        terms (default ``EchoForm.COMPACT_THRESHOLD``) keep their ``keep``
+        most recent cls_event terms; with ``max_age`` (seconds) the
+        cls_event terms older than that are merged in every form. Forms
+        are decoded and merged back in batches. Returns the number of
+        forms compacted.
+        """
+        threshold = EchoForm.COMPACT_THRESHOLD if threshold is None else threshold
+        now = time.time()
+        compacted = 0
+
         with self._lock:
-            if hasattr(self, '_conn') and self._conn:
-                self._conn.close()
-                self._conn = None
+            self.flush()
+            with storage_timer("compact_forms"), self._indexes_dropped("idx_echoforms_updated_at"):
+                # Read through a second cursor so batches can be merged while iterating
+                reader = self._conn.cursor()
+                try:
+                    if domain is None:
+                        reader.execute("SELECT blob, term_scale FROM echoforms")
+                    else:
+                        reader.execute("SELECT blob, term_scale FROM echoforms WHERE domain = ?", (domain,))
+                    while True:
+                        rows = reader.fetchmany(10_000)
+                        if not rows:
+                            break
+                        forms = []
+                        for blob, term_scale in rows:
+                            form = _reinflate_form(blob, term_scale, term_table=True)
+                            hot = len(form.terms) >= threshold
+                            if not hot and max_age is None:
+                                continue
+                            if form.compact_terms(keep if hot else len(form.terms), max_age, tolerance, at=now):
+                                forms.append(self._form_row(form, now))
+                        compacted += self._merge("echoforms", _FORM_COLUMNS, forms) if forms else 0
+                finally:
+                    reader.close()
+        return compacted
 
     # Identity storage methods
     
@@ -270,71 +778,87 @@ class LatticeStorage:
     def store_identity(self, identity: Identity):
         """Store or update an Identity with entropy tracking"""
         with self._lock:
-            import json
-            data_json = json.dumps(identity.to_dict())
-            now = time.time()
-            entropy_score = identity.entropy()
-            effective_tau = identity.effective_tau()
-            
-            # Log entropy event for observability
-            if OBSERVABILITY_AVAILABLE:
-                log_entropy_event(identity.id, entropy_score, effective_tau, "store")
-            
+            if self._write_behind:
+                self._stage(self._pending_identities, self._identity_row(identity, time.time()))
+                return
+            # Logs the entropy event for observability
+            row = self._identity_row(identity, time.time())
             with storage_timer("store_identity"):
-                self._conn.execute("""
-                    INSERT OR REPLACE INTO identities 
-                    (id, identity_type, data, created_at, updated_at, lang_axis, entropy_score)
-                    VALUES (?, ?, ?, 
-                        COALESCE((SELECT created_at FROM identities WHERE id = ?), ?),
-                        ?, ?, ?)
-                """, (
-                    identity.id, identity.identity_type, data_json,
-                    identity.id, now, now, identity.lang_axis, entropy_score
-                ))
-                
-            # Update gauge metrics
-            if OBSERVABILITY_AVAILABLE:
-                update_identity_gauges(self)
+                self._upsert("identities", _IDENTITY_COLUMNS, row)
     
     def fetch_identity(self, identity_id: str) -> Optional[Identity]:
         """Fetch an Identity by ID"""
+        staged = self._pending_identities.get(identity_id)
+        if staged is not None:
+            return _decode_identities([_staged_identity_row(staged)])[0]
         with storage_timer("fetch_identity"):
-            result = self._conn.execute(
-                "SELECT data FROM identities WHERE id = ?", (identity_id,)
-            ).fetchone()
+            result = self._cursor().execute(
+                self._statement(f"SELECT {_IDENTITY_SELECT} FROM identities WHERE id = ?"), (identity_id,)
+            ).fetchall()
         
         if result:
-            import json
-            data = json.loads(result[0])
-            return Identity.from_dict(data)
+            return _decode_identities(result)[0]
         return None
+
+    def fetch_identities_many(self, identity_ids: Iterable[str]) -> List[Optional[Identity]]:
+        """Fetch Identities by ID in bulk; ``None`` where an ID is not stored
+
+        Results follow ``identity_ids``. IDs are looked up
+        ``_FETCH_MANY_CHUNK`` per query and all rows are decoded together,
+        with the timestamps converted as one array.
+        """
+        identity_ids = list(identity_ids)
+        rows: Dict[str, tuple] = {}
+        stored = []
+        for identity_id in dict.fromkeys(identity_ids):
+            staged = self._pending_identities.get(identity_id)
+            if staged is not None:
+                rows[identity_id] = _staged_identity_row(staged)
+            else:
+                stored.append(identity_id)
+        cur = self._cursor()
+        with storage_timer("fetch_identities_many"):
+            for start in range(0, len(stored), _FETCH_MANY_CHUNK):
+                chunk = stored[start:start + _FETCH_MANY_CHUNK]
+                sql = f"SELECT {_IDENTITY_SELECT} FROM identities WHERE id IN ({', '.join('?' * len(chunk))})"
+                for row in cur.execute(sql, chunk).fetchall():
+                    rows[row[0]] = row
+        found = dict(zip(rows, _decode_identities(list(rows.values()))))
+        return [found.get(identity_id) for identity_id in identity_ids]
     
     def list_identities(self, limit: int = 10, identity_type: Optional[str] = None, 
-                       lang_axis: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List identities with metadata"""
-        query = """
-            SELECT id, identity_type, created_at, updated_at, lang_axis, entropy_score
+                       lang_axis: Optional[str] = None, order_by: str = "updated_at") -> List[Dict[str, Any]]:
+        """List identities with metadata
+
+        ``weight`` is the decayed weight at read time (``Identity.weight *
+        Identity.decay_factor()``). ``order_by`` is ``"updated_at"`` or
+        ``"weight"``.
+        """
+        if order_by not in ("updated_at", "weight"):
+            raise ValueError(f"order_by must be 'updated_at' or 'weight', not {order_by!r}")
+        query = f"""
+            SELECT id, identity_type, created_at, updated_at, lang_axis, entropy_score,
+                   {_DECAYED_WEIGHT_SQL} AS weight
             FROM identities
         """
-        params = []
+        params: Dict[str, Any] = {"now": time.time(), "limit": limit}
         conditions = []
         
         if identity_type:
-            conditions.append("identity_type = ?")
-            params.append(identity_type)
+            conditions.append("identity_type = $identity_type")
+            params["identity_type"] = identity_type
         
         if lang_axis:
-            conditions.append("lang_axis = ?")
-            params.append(lang_axis)
+            conditions.append("lang_axis = $lang_axis")
+            params["lang_axis"] = lang_axis
         
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        query += " ORDER BY updated_at DESC LIMIT ?"
-        params.append(limit)
+        query += f" ORDER BY {order_by} DESC LIMIT $limit"
         
-        with storage_timer("list_identities"):
-            rows = self._conn.execute(query, params).fetchall()
+        with self._reading() as cur, storage_timer("list_identities"):
+            rows = cur.execute(query, params).fetchall()
         
         return [
             {
@@ -343,77 +867,347 @@ class LatticeStorage:
                 "created_at": row[2],
                 "updated_at": row[3],
                 "lang_axis": row[4],
-                "entropy_score": row[5]
+                "entropy_score": row[5],
+                "weight": row[6]
             }
             for row in rows
         ]
     
     def get_identity_count(self, identity_type: Optional[str] = None) -> int:
         """Get count of stored identities"""
-        with storage_timer("get_identity_count"):
+        with self._reading() as cur, storage_timer("get_identity_count"):
             if identity_type:
-                result = self._conn.execute(
+                result = cur.execute(
                     "SELECT COUNT(*) FROM identities WHERE identity_type = ?", (identity_type,)
-                ).fetchone()
+                ).fetchall()
             else:
-                result = self._conn.execute("SELECT COUNT(*) FROM identities").fetchone()
+                result = cur.execute("SELECT COUNT(*) FROM identities").fetchall()
         
-        return result[0] if result else 0
+        return result[0][0] if result else 0
     
     def find_identities_by_entropy(self, min_entropy: float = 0.0, 
                                   max_entropy: float = float('inf'), 
                                   limit: int = 10) -> List[Identity]:
         """Find identities within entropy range"""
-        with storage_timer("find_identities_by_entropy"):
-            rows = self._conn.execute("""
-                SELECT data FROM identities 
+        with self._reading() as cur, storage_timer("find_identities_by_entropy"):
+            rows = cur.execute(f"""
+                SELECT {_IDENTITY_SELECT} FROM identities 
                 WHERE entropy_score >= ? AND entropy_score <= ?
                 ORDER BY entropy_score DESC 
                 LIMIT ?
             """, (min_entropy, max_entropy, limit)).fetchall()
         
-        identities = []
-        for row in rows:
-            import json
-            data = json.loads(row[0])
-            identities.append(Identity.from_dict(data))
-        
-        return identities
+        return _decode_identities(rows)
     
-    def apply_identity_decay(self, base_tau_days: float = 14.0):
-        """Apply entropy-adjusted time decay to all identities"""
+    def apply_identity_decay(self, base_tau_days: float = 14.0) -> int:
+        """Apply entropy-adjusted time decay to all identities
+
+        Each identity's ``weight`` and ``meta.terms`` intensities are scaled
+        by ``exp(-age / effective_tau)``, with the effective tau taken from
+        the stored ``entropy_score``; scar entropy (which scales with weight)
+        is updated to match. One set-based ``UPDATE``; returns the number of
+        identities updated.
+        """
         now = time.time()
         
         with self._lock:
-            with storage_timer("apply_identity_decay"):
-                # Get all identities
-                rows = self._conn.execute(
-                    "SELECT id, data, created_at FROM identities"
-                ).fetchall()
-                
-                for identity_id, data_json, created_at in rows:
-                    import json
-                    identity = Identity.from_dict(json.loads(data_json))
-                    
-                    # Calculate effective tau based on entropy
-                    effective_tau = identity.effective_tau(base_tau_days * 24 * 3600)
-                    age_seconds = now - created_at
-                    
-                    # Apply decay factor
-                    import math
-                    decay_factor = math.exp(-age_seconds / effective_tau)
-                    
-                    # Apply decay to identity weight and related metadata
-                    identity.weight *= decay_factor
-                    
-                    # If identity has terms in meta, decay their intensities
-                    if "terms" in identity.meta:
-                        for term in identity.meta["terms"]:
-                            if "intensity" in term:
-                                term["intensity"] *= decay_factor
-                    
-                    # Update the identity
-                    self.store_identity(identity)
+            self.flush()
+            with storage_timer("apply_identity_decay"), \
+                    self._indexes_dropped("idx_identities_updated_at", "idx_identities_entropy"):
+                row = self._conn.execute(f"""
+                    UPDATE identities
+                    SET meta = d.meta, updated_at = d.now, entropy_score = d.entropy_score,
+                        base_weight = d.weight, last_decay_ts = d.now,
+                        decay_tau = $tau * (1 + $k * coalesce(d.entropy_score, 0.0))
+                    FROM (
+                        WITH src AS (
+                            SELECT id, meta, identity_type, entropy_score, $now AS now,
+                                   exp(-($now - created_at) / ($tau * (1 + $k * coalesce(entropy_score, 0.0)))) AS factor,
+                                   coalesce(base_weight, 1.0) AS stored_weight,
+                                   len(related_ids) AS n_related
+                            FROM identities
+                        ), weighted AS (
+                            SELECT *, stored_weight * factor AS weight FROM src
+                        )
+                        SELECT id, now, weight,
+                               CASE WHEN json_type(meta, '$.terms') = 'ARRAY'
+                                    THEN json_merge_patch(meta, json_object('terms', to_json(
+                                        {_decayed_terms_sql("CAST(json_extract(meta, '$.terms') AS JSON[])", "factor")})))
+                                    ELSE meta END AS meta,
+                               CASE WHEN identity_type = 'scar'
+                                    THEN CASE WHEN n_related > 1 THEN log2(n_related) * weight ELSE 0.0 END
+                                    ELSE entropy_score END AS entropy_score
+                        FROM weighted
+                    ) AS d
+                    WHERE identities.id = d.id
+                """, {"now": now, "tau": base_tau_days * 24 * 3600,
+                      "k": DEFAULT_ENTROPY_SCALING}).fetchone()
+                # Edges carry their identity's stored weight
+                self._conn.execute("""
+                    UPDATE identity_edges SET weight = i.base_weight
+                    FROM identities AS i
+                    WHERE identity_edges.src_id = i.id
+                """)
+        return row[0] if row else 0
+
+    # ─── Bulk ingest and write-behind ─────────────────────────────────────────
+
+    @staticmethod
+    def _form_row(form: EchoForm, now: float) -> tuple:
+        # intensity_sum() decays every term with the same entropy-adjusted tau,
+        # so its value at `now` decays as a whole from there on
+        intensity = form.intensity_sum(at=now)
+        return (form.anchor, now, now, form.pack(), form.domain, form.phase, intensity,
+                intensity, now, form.effective_tau(), json.dumps(form.topology), 1.0)
+
+    @staticmethod
+    def _identity_row(identity: Identity, now: float) -> tuple:
+        entropy_score = identity.entropy()
+        if OBSERVABILITY_AVAILABLE:
+            log_entropy_event(identity.id, entropy_score, identity.effective_tau(), "store")
+        # Identity.decay_factor() decays the weight from created_at
+        created = identity.created_at.timestamp() if identity.created_at else now
+        raw, echo = identity.raw or "", identity.echo or ""
+        doc_len = sum(_search_terms(raw, echo if echo != raw else None).values())
+        return (identity.id, now, now, identity.identity_type, identity.lang_axis, entropy_score,
+                identity.weight, created, identity.effective_tau(), list(identity.tags),
+                list(identity.related_ids), json.dumps(identity.meta), _to_micros(identity.created_at),
+                _to_micros(identity.updated_at), hasattr(identity, "content"), raw, echo, doc_len)
+
+    def _merge(self, table: str, columns: Tuple[str, ...], rows: Iterable[tuple]) -> int:
+        """Upsert staged rows into ``table`` as one set-based write.
+
+        New keys are inserted; existing keys keep their ``created_at`` and
+        get every other column replaced. For a key staged twice the last
+        row wins. Returns the number of rows merged.
+
+        Identities are inserted with ``ON CONFLICT DO NOTHING RETURNING`` and
+        the ids that were not returned are then updated, so the new rows
+        (and the per-type counts they add) come back without a pre-read.
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame.from_records(list(rows), columns=list(columns))
+        if frame.empty:
+            return 0
+        frame = frame.drop_duplicates(subset=columns[0], keep="last")
+        cols = ", ".join(columns)
+        view = f"_staged_{table}"
+        with self._lock:
+            self._conn.register(view, frame)
+            try:
+                with self._transaction():
+                    if table != "identities":
+                        updates = ", ".join(f"{c} = excluded.{c}" for c in columns[2:])
+                        self._conn.execute(f"""
+                            INSERT INTO {table} ({cols})
+                            SELECT {cols} FROM {view}
+                            ON CONFLICT ({columns[0]}) DO UPDATE SET {updates}
+                        """)
+                    else:
+                        new = self._conn.execute(f"""
+                            INSERT INTO identities ({cols})
+                            SELECT {cols} FROM {view}
+                            ON CONFLICT (id) DO NOTHING
+                            RETURNING id, identity_type
+                        """).fetchall()
+                        self._update_identities(frame[~frame["id"].isin([i for i, _ in new])], columns)
+                        self._sync_edges(view)
+                        self._sync_terms(view, (), zip(frame["id"], frame["raw"], frame["echo"]))
+                if table == "identities" and new:
+                    self._adjust_identity_counts(Counter(t for _, t in new))
+            finally:
+                self._conn.unregister(view)
+        return len(frame)
+
+    def _update_identities(self, frame, columns: Tuple[str, ...]):
+        """Replace every column but ``id`` and ``created_at`` of the stored ``frame`` rows."""
+        if frame.empty:
+            return
+        view = "_staged_identities_existing"
+        self._conn.register(view, frame)
+        try:
+            self._conn.execute(f"""
+                UPDATE identities SET {", ".join(f"{c} = staged.{c}" for c in columns[2:])}
+                FROM {view} AS staged WHERE identities.id = staged.id
+            """)
+        finally:
+            self._conn.unregister(view)
+
+    def _upsert(self, table: str, columns: Tuple[str, ...], row: tuple):
+        """Single-row form of ``_merge``."""
+        values = f"VALUES ({', '.join('?' * len(columns))})"
+        with self._transaction():
+            if table != "identities":
+                updates = ", ".join(f"{c} = excluded.{c}" for c in columns[2:])
+                self._conn.execute(self._statement(f"""
+                    INSERT INTO {table} ({", ".join(columns)}) {values}
+                    ON CONFLICT ({columns[0]}) DO UPDATE SET {updates}
+                """), row)
+                return
+            new = self._conn.execute(self._statement(f"""
+                INSERT INTO identities ({", ".join(columns)}) {values}
+                ON CONFLICT (id) DO NOTHING
+                RETURNING identity_type
+            """), row).fetchall()
+            if not new:
+                self._conn.execute(self._statement(f"""
+                    UPDATE identities SET {", ".join(f"{c} = ?" for c in columns[2:])}
+                    WHERE id = ?
+                """), tuple(row[2:]) + (row[0],))
+            source = "(SELECT * FROM identities WHERE id = ?)"
+            self._sync_edges(source, (row[0],))
+            self._sync_terms(source, (row[0],), [row[:1] + row[-3:-1]])
+        if new:
+            self._adjust_identity_counts(Counter(t for t, in new))
+
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements atomically (caller holds the lock)."""
+        self._conn.begin()
+        try:
+            yield
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    def store_forms_bulk(self, forms: Iterable[EchoForm]) -> int:
+        """Store or update many EchoForms in one merge; returns rows written."""
+        now = time.time()
+        rows = [self._form_row(form, now) for form in forms]
+        with self._lock:
+            self.flush()
+            with storage_timer("store_forms_bulk"):
+                return self._merge("echoforms", _FORM_COLUMNS, rows)
+
+    def store_identities_bulk(self, identities: Iterable[Identity]) -> int:
+        """Store or update many Identities in one merge; returns rows written."""
+        now = time.time()
+        rows = [self._identity_row(identity, now) for identity in identities]
+        with self._lock:
+            self.flush()
+            with storage_timer("store_identities_bulk"):
+                return self._merge("identities", _IDENTITY_COLUMNS, rows)
+
+    def _stage(self, pending: Dict[str, tuple], row: tuple):
+        """Buffer ``row`` (caller holds the lock), flushing when the buffer is full."""
+        earlier = pending.get(row[0])
+        if earlier is not None:
+            row = row[:1] + earlier[1:2] + row[2:]  # keep the first created_at
+        pending[row[0]] = row
+        if len(self._pending_forms) + len(self._pending_identities) >= self._flush_rows:
+            self.flush()
+
+    def _cursor(self):
+        """This thread's read cursor, closed when the thread exits.
+
+        Read its results with ``fetchall``: a result left half-read keeps the
+        cursor's snapshot open, and a later write to a row it saw then fails
+        to commit with a write-write conflict.
+        """
+        owner = getattr(self._local, "cursor", None)
+        if owner is None:
+            with self._cursors_lock:
+                key = next(self._cursor_keys)
+                owner = _ThreadCursor(self._conn.cursor())
+                self._cursors[key] = owner.cursor
+            # Weak reference, so a thread's cursor does not keep the storage alive
+            weakref.finalize(owner, LatticeStorage._release_cursor, weakref.ref(self), key)
+            self._local.cursor = owner
+        return owner.cursor
+
+    @staticmethod
+    def _release_cursor(ref, key: int):
+        storage = ref()
+        if storage is None:
+            return
+        with storage._cursors_lock:
+            cursor = storage._cursors.pop(key, None)
+        if cursor is not None:
+            cursor.close()
+
+    def _statement(self, sql: str):
+        """``sql`` parsed once per thread, for repeated execution on any cursor.
+
+        DuckDB's Python API has no prepare call, but a statement from
+        ``extract_statements`` executes with new parameters without being
+        parsed again. Only for fixed SQL text: the cache is never evicted.
+        Builds without ``extract_statements`` get ``sql`` back unchanged,
+        which ``execute`` parses on every call.
+        """
+        extract = getattr(self._conn, "extract_statements", None)
+        if extract is None:
+            return sql
+        statements = getattr(self._local, "statements", None)
+        if statements is None:
+            statements = self._local.statements = {}
+        statement = statements.get(sql)
+        if statement is None:
+            statement = statements[sql] = extract(sql)[0]
+        return statement
+
+    @contextmanager
+    def _reading(self):
+        """This thread's read cursor, after making staged writes visible to it.
+
+        Only a flush of staged rows takes the writer lock; the query runs
+        without it.
+        """
+        if self._pending_forms or self._pending_identities:
+            self.flush()
+        yield self._cursor()
+
+    def flush(self) -> int:
+        """Merge all staged writes into the database; returns rows written."""
+        with self._lock:
+            if not (self._pending_forms or self._pending_identities):
+                return 0
+            forms, identities = self._pending_forms, self._pending_identities
+            with storage_timer("flush"):
+                # Rows stay staged (and visible to fetches) until merged
+                written = self._merge("echoforms", _FORM_COLUMNS, forms.values())
+                self._pending_forms = {}
+                written += self._merge("identities", _IDENTITY_COLUMNS, identities.values())
+                self._pending_identities = {}
+            return written
+
+    def enable_write_behind(self, flush_rows: int = 1000, flush_interval: float = 1.0):
+        """Stage single-row writes and merge them by size or time."""
+        if self.read_only:
+            raise ValueError("a read-only storage cannot write behind")
+        if flush_rows < 1 or flush_interval <= 0:
+            raise ValueError("flush_rows and flush_interval must be positive")
+        with self._lock:
+            self._flush_rows = flush_rows
+            self._flush_interval = flush_interval
+            self._write_behind = True
+            if self._flusher is None:
+                self._stop_flusher.clear()
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="lattice-write-behind", daemon=True
+                )
+                self._flusher.start()
+
+    def disable_write_behind(self):
+        """Flush staged writes and go back to writing each row immediately."""
+        flusher = self._flusher
+        if flusher is not None:
+            self._stop_flusher.set()
+            flusher.join()
+            self._flusher = None
+        with self._lock:
+            self._write_behind = False
+            if getattr(self, "_conn", None) is not None:
+                self.flush()
+
+    def _flush_loop(self):
+        while not self._stop_flusher.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                # Rows stay staged; the next flush retries them
+                print(f"Error flushing staged writes: {e}")
 
     # ─── Compatibility Stubs ──────────────────────────────────────────────────
 
@@ -487,27 +1281,33 @@ class LatticeStorage:
         """Alias for fetch_identity for backward compatibility"""
         return self.fetch_identity(identity_id)
 
-    def search_identities(self, query: str, limit: int = 10) -> List[Identity]:
-        """Search for identities by content"""
+    def search_identities(self, query: str, limit: int = 10, mode: str = "bm25") -> List[Identity]:
+        """Search for identities by content
+
+        ``mode="bm25"`` ranks identities whose ``raw``/``echo`` contain any
+        word of ``query`` by BM25 over the ``identity_terms`` index (see
+        ``compact_search_index``); ``mode="substring"`` returns the most recent identities containing
+        ``query`` verbatim (a full scan).
+        """
+        if mode not in ("bm25", "substring"):
+            raise ValueError(f"mode must be 'bm25' or 'substring', not {mode!r}")
         try:
-            with storage_timer("search_identities"):
-                # Search in the JSON data field - DuckDB uses json_extract_string
-                rows = self._conn.execute("""
-                    SELECT data FROM identities 
-                    WHERE json_extract_string(data, '$.raw') LIKE ? 
-                       OR json_extract_string(data, '$.echo') LIKE ?
-                    ORDER BY updated_at DESC
-                    LIMIT ?
-                """, (f"%{query}%", f"%{query}%", limit)).fetchall()
-            
-            results = []
-            for row in rows:
-                import json
-                data = json.loads(row[0])
-                identity = Identity.from_dict(data)
-                results.append(identity)
-            
-            return results
+            with self._reading() as cur, storage_timer("search_identities"):
+                if mode == "bm25":
+                    terms = list(_search_terms(query))
+                    if not terms:
+                        return []
+                    rows = cur.execute(_BM25_SQL, {
+                        "terms": terms, "k1": _BM25_K1, "b": _BM25_B, "limit": limit
+                    }).fetchall()
+                else:
+                    rows = cur.execute(f"""
+                        SELECT {_IDENTITY_SELECT} FROM identities
+                        WHERE contains(raw, $q) OR contains(echo, $q)
+                        ORDER BY updated_at DESC
+                        LIMIT $limit
+                    """, {"q": query, "limit": limit}).fetchall()
+            return _decode_identities(rows)
         except Exception as e:
             print(f"Error searching identities: {e}")
             return []
@@ -515,53 +1315,121 @@ class LatticeStorage:
     def get_related_scars(self, identity_id: str) -> List[Identity]:
         """Get all scar-type identities related to a given identity"""
         try:
-            # Fallback: iterate through all scars since DuckDB doesn't have JSON array contains operator
-            all_scars = self.list_identities(limit=1000, identity_type="scar")
-            related = []
-            for scar_meta in all_scars:
-                scar = self.fetch_identity(scar_meta["id"])
-                if scar and identity_id in scar.related_ids:
-                    related.append(scar)
-            return related
+            with self._reading() as cur, storage_timer("get_related_scars"):
+                # The type is checked here rather than in SQL: a filter on
+                # identity_type keeps DuckDB from narrowing the identities
+                # scan to the ids the edges lookup returns
+                rows = cur.execute(f"""
+                    SELECT {_IDENTITY_SELECT} FROM identities
+                    WHERE id IN (SELECT src_id FROM identity_edges WHERE dst_id = ?)
+                    ORDER BY updated_at DESC
+                """, (identity_id,)).fetchall()
+            return _decode_identities([row for row in rows if row[1] == "scar"])
         except Exception as e:
             print(f"Error getting related scars: {e}")
             return []
 
     def get_scars_by_type(self, relationship_type: str) -> List[Identity]:
-        """Get all scars with a specific relationship type"""
+        """Get all scars with a specific relationship type
+
+        Matches through ``identity_edges``, so only scars that relate at
+        least one identity are found.
+        """
         try:
-            with storage_timer("get_scars_by_type"):
-                # Find scars with the specified relationship type in metadata
-                rows = self._conn.execute("""
-                    SELECT data FROM identities 
-                    WHERE identity_type = 'scar' 
-                    AND json_extract_string(json_extract(data, '$.meta'), '$.relationship_type') = ?
+            with self._reading() as cur, storage_timer("get_scars_by_type"):
+                rows = cur.execute(f"""
+                    SELECT {_IDENTITY_SELECT} FROM identities
+                    WHERE identity_type = 'scar'
+                    AND id IN (SELECT src_id FROM identity_edges WHERE edge_type = ?)
                     ORDER BY updated_at DESC
                 """, (relationship_type,)).fetchall()
-            
-            results = []
-            for row in rows:
-                import json
-                data = json.loads(row[0])
-                identity = Identity.from_dict(data)
-                results.append(identity)
-            
-            return results
+            return _decode_identities(rows)
         except Exception as e:
             print(f"Error getting scars by type: {e}")
-            # Fallback: iterate through all scars
-            all_scars = self.list_identities(limit=1000, identity_type="scar")
-            matching = []
-            for scar_meta in all_scars:
-                scar = self.fetch_identity(scar_meta["id"])
-                if scar and scar.meta.get("relationship_type") == relationship_type:
-                    matching.append(scar)
-            return matching
+            return []
+
+    def get_identity_lattice_stats(self, identity_id: str, domain: str = "cls") -> Dict[str, Any]:
+        """Relationship and lattice-form aggregates for one identity, in one query
+
+        ``relationship_count``/``relationship_weight`` count and sum the
+        stored weight of the identities whose ``related_ids`` name it;
+        ``related_forms_count``/``total_lattice_intensity`` cover the
+        ``domain`` forms whose topology mentions it, with intensities
+        decayed to read time.
+        """
+        with self._reading() as cur, storage_timer("get_identity_lattice_stats"):
+            row = cur.execute(f"""
+                SELECT
+                    (SELECT count(DISTINCT src_id) FROM identity_edges WHERE dst_id = $id),
+                    (SELECT coalesce(sum(weight), 0.0) FROM identity_edges WHERE dst_id = $id),
+                    count(*),
+                    coalesce(sum({_DECAYED_INTENSITY_SQL}), 0.0)
+                FROM echoforms
+                WHERE domain = $domain
+                AND contains(CAST(topology AS VARCHAR), $id)
+            """, {"id": identity_id, "domain": domain, "now": time.time()}).fetchall()[0]
+        return {
+            "relationship_count": row[0],
+            "relationship_weight": row[1],
+            "related_forms_count": row[2],
+            "total_lattice_intensity": row[3],
+        }
+
+    # ─── Identity counts ──────────────────────────────────────────────────────
+
+    def identity_counts(self) -> Dict[str, int]:
+        """In-process identity counts per type (see the class docstring)."""
+        with self._lock:
+            return dict(self._identity_counts)
+
+    def _adjust_identity_counts(self, deltas: Dict[str, int]):
+        """Apply per-type count changes from inserts (positive) or deletes (negative)."""
+        with self._lock:
+            self._identity_counts.update(deltas)
+            counts = +self._identity_counts
+            self._identity_counts = counts
+        if OBSERVABILITY_AVAILABLE:
+            set_identity_gauges(counts)
+
+    def reconcile_identity_counts(self) -> Dict[str, int]:
+        """Reset the identity counts from storage with one ``GROUP BY``; returns them."""
+        # Under the writer lock, so no insert is counted between the query and the reset
+        with self._lock, self._reading() as cur, storage_timer("reconcile_identity_counts"):
+            rows = cur.execute(
+                "SELECT identity_type, count(*) FROM identities GROUP BY identity_type"
+            ).fetchall()
+            self._identity_counts = Counter(dict(rows))
+        if OBSERVABILITY_AVAILABLE:
+            set_identity_gauges(dict(rows))
+        return dict(rows)
+
+    @staticmethod
+    def _reconcile_loop(ref, stop: threading.Event, interval: float):
+        while not stop.wait(interval):
+            storage = ref()
+            if storage is None or storage._conn is None:
+                return
+            try:
+                storage.reconcile_identity_counts()
+            except Exception as e:
+                print(f"Error reconciling identity counts: {e}")
+            del storage
 
     def close(self):
-        """Close the database connection"""
-        if hasattr(self, '_conn') and self._conn:
-            self._conn.close()
+        """Flush staged writes and close the database connection"""
+        reconciler = getattr(self, "_reconciler", None)
+        if reconciler is not None:
+            self._stop_reconciler.set()
+            reconciler.join()
+            self._reconciler = None
+        self.disable_write_behind()
+        with self._lock, self._cursors_lock:
+            for cursor in self._cursors.values():
+                cursor.close()
+            self._cursors = {}
+            if hasattr(self, '_conn') and self._conn:
+                self._conn.close()
+                self._conn = None
 
 
 def get_storage(db_path: str = "kimera_lattice.db") -> LatticeStorage:
@@ -0,0 +1,376 @@
+"""
+Columnar storage for EchoForm terms.
+
+A ``TermTable`` keeps terms as columns instead of one dict per term:
+symbol and role ids into a string table, intensity and timestamp as
+float64 arrays, and a flags byte per term recording which of those it
+has. Every other key, and any value a column cannot hold exactly (a
+non-string symbol, a bool intensity, ...), lives in a per-key overflow
+dict of row -> value. The layout is the one ``echoform_codec`` writes.
+
+The table behaves as the list of term dicts it replaces: indexing gives
+``Term`` views that read and write the columns, and it compares equal
+to the equivalent list. ``numbers`` exposes a numeric column so that
+``EchoForm.intensity_sum`` and ``EchoForm.entropy`` can be numpy
+reductions.
+"""
+
+from collections.abc import MutableMapping, MutableSequence, Sequence
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# flags: which term fields sit in the fixed columns (ints are stored as
+# float64 and converted back)
+SYMBOL = 1
+ROLE = 2
+INTENSITY = 4
+INTENSITY_INT = 8
+TIMESTAMP = 16
+TIMESTAMP_INT = 32
+
+_MAX_EXACT_INT = 2 ** 53  # largest magnitude a float64 holds exactly
+_FIELD_FLAGS = {
+    "symbol": SYMBOL,
+    "role": ROLE,
+    "intensity": INTENSITY | INTENSITY_INT,
+    "timestamp": TIMESTAMP | TIMESTAMP_INT,
+}
+
+
+def _number_flag(value: Any, flag: int, int_flag: int) -> int:
+    """Flags for a numeric value kept in a float64 column, 0 if it does not fit."""
+    kind = type(value)
+    if kind is float:
+        return flag
+    if kind is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+        return flag | int_flag
+    return 0
+
+
+class Term(MutableMapping):
+    """One row of a ``TermTable``, as a dict-like view."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "TermTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table._get(self._row, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._table._discard(self._row, key)
+        self._table._set(self._row, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self._table._discard(self._row, key):
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._table._keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._table._keys(self._row))
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class TermTable(MutableSequence):
+    """A list of term dicts stored column by column (see the module docstring)."""
+
+    def __init__(self, terms: Iterable[Dict[str, Any]] = ()):
+        self.strings: List[str] = []
+        self.extras: Dict[str, Dict[int, Any]] = {}
+        self._ids: Dict[str, int] = {}
+        self._n = 0
+        self._allocate(0)
+        self.extend(terms)
+
+    @classmethod
+    def from_columns(cls, strings: List[str], flags, symbols, roles, intensities, timestamps,
+                     extras: Dict[str, Dict[int, Any]]) -> "TermTable":
+        """A table over copies of the given columns (as returned by ``columns``)."""
+        table = cls.__new__(cls)
+        table.strings = list(strings)
+        table._ids = {text: index for index, text in enumerate(table.strings)}
+        table.extras = {key: dict(column) for key, column in extras.items() if column}
+        table._n = len(flags)
+        table._flags = np.array(flags, dtype=np.uint8)
+        table._symbols = np.array(symbols, dtype="<u4")
+        table._roles = np.array(roles, dtype="<u4")
+        table._intensities = np.array(intensities, dtype="<f8")
+        table._timestamps = np.array(timestamps, dtype="<f8")
+        return table
+
+    def columns(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+                               Dict[str, Dict[int, Any]]]:
+        """The string table, flags, symbol ids, role ids, intensities, timestamps and overflow.
+
+        The arrays are views of the live columns, trimmed to the table's length.
+        """
+        n = self._n
+        return (self.strings, self._flags[:n], self._symbols[:n], self._roles[:n],
+                self._intensities[:n], self._timestamps[:n], self.extras)
+
+    def numbers(self, key: str) -> Tuple[np.ndarray, np.ndarray, Dict[int, Any]]:
+        """``key``'s float64 column, the mask of terms it holds, and its overflow values.
+
+        ``key`` is ``"intensity"`` or ``"timestamp"``. Terms whose value
+        is not a float or an exactly representable int are only in the
+        overflow dict (row -> value).
+        """
+        n = self._n
+        if key == "intensity":
+            values, flag = self._intensities[:n], INTENSITY
+        elif key == "timestamp":
+            values, flag = self._timestamps[:n], TIMESTAMP
+        else:
+            raise KeyError(key)
+        return values, (self._flags[:n] & flag) != 0, self.extras.get(key, {})
+
+    def scale_intensities(self, factor: float) -> None:
+        """Multiply every numeric (int or float, not bool) intensity by ``factor``."""
+        n = self._n
+        scaled = (self._flags[:n] & INTENSITY) != 0
+        self._intensities[:n][scaled] *= factor
+        self._flags[:n][scaled] &= np.uint8(~INTENSITY_INT & 0xFF)
+        overflow = self.extras.get("intensity", {})
+        for row, value in overflow.items():
+            if type(value) in (int, float):
+                overflow[row] = value * factor
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """The terms as plain dicts."""
+        strings = self.strings
+        terms = []
+        for bits, symbol, role, intensity, timestamp in zip(*(column.tolist() for column in self.columns()[1:6])):
+            term = {}
+            if bits & SYMBOL:
+                term["symbol"] = strings[symbol]
+            if bits & ROLE:
+                term["role"] = strings[role]
+            if bits & INTENSITY:
+                term["intensity"] = int(intensity) if bits & INTENSITY_INT else intensity
+            if bits & TIMESTAMP:
+                term["timestamp"] = int(timestamp) if bits & TIMESTAMP_INT else timestamp
+            terms.append(term)
+        for key, column in self.extras.items():
+            for row, value in column.items():
+                terms[row][key] = value
+        return terms
+
+    def copy(self) -> "TermTable":
+        return self.from_columns(*self.columns())
+
+    # ─── Sequence protocol ────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Term(self, row) for row in range(*index.indices(self._n))]
+        return Term(self, self._index(index))
+
+    def __setitem__(self, index, term) -> None:
+        if isinstance(index, slice):
+            terms = self.to_list()
+            terms[index] = [dict(t) for t in term]
+            self._reload(terms)
+            return
+        row = self._index(index)
+        items = list(term.items())  # ``term`` may be a view of this row
+        self._flags[row] = 0
+        for key in list(self.extras):
+            self._discard_extra(row, key)
+        for key, value in items:
+            self._set(row, key, value)
+
+    def __delitem__(self, index) -> None:
+        terms = self.to_list()
+        del terms[index]
+        self._reload(terms)
+
+    def insert(self, index: int, term: Dict[str, Any]) -> None:
+        if index >= self._n:
+            self.append(term)
+            return
+        terms = self.to_list()
+        terms.insert(index, dict(term))
+        self._reload(terms)
+
+    def append(self, term: Dict[str, Any]) -> None:
+        self._reserve(1)
+        row = self._n
+        self._n += 1
+        self._flags[row] = 0
+        for key, value in term.items():
+            self._set(row, key, value)
+
+    def extend(self, terms: Iterable[Dict[str, Any]]) -> None:
+        terms = [dict(term) for term in terms] if terms is self else terms
+        flags, symbols, roles, intensities, timestamps = [], [], [], [], []
+        start = self._n
+        row = start
+        intern = self._intern
+        extras = self.extras
+        for term in terms:
+            bits = symbol = role = 0
+            intensity = timestamp = 0.0
+            for key, value in term.items():
+                if key == "symbol" and type(value) is str:
+                    bits |= SYMBOL
+                    symbol = intern(value)
+                    continue
+                if key == "role" and type(value) is str:
+                    bits |= ROLE
+                    role = intern(value)
+                    continue
+                if key == "intensity":
+                    number = _number_flag(value, INTENSITY, INTENSITY_INT)
+                    if number:
+                        bits |= number
+                        intensity = value
+                        continue
+                elif key == "timestamp":
+                    number = _number_flag(value, TIMESTAMP, TIMESTAMP_INT)
+                    if number:
+                        bits |= number
+                        timestamp = value
+                        continue
+                column = extras.get(key)
+                if column is None:
+                    column = extras[key] = {}
+                column[row] = value
+            flags.append(bits)
+            symbols.append(symbol)
+            roles.append(role)
+            intensities.append(intensity)
+            timestamps.append(timestamp)
+            row += 1
+        self._reserve(row - start)
+        self._flags[start:row] = flags
+        self._symbols[start:row] = symbols
+        self._roles[start:row] = roles
+        self._intensities[start:row] = intensities
+        self._timestamps[start:row] = timestamps
+        self._n = row
+
+    def clear(self) -> None:
+        self._n = 0
+        self.extras = {}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TermTable({self.to_list()!r})"
+
+    # ─── Columns ──────────────────────────────────────────────────────────────
+
+    def _allocate(self, capacity: int) -> None:
+        self._flags = np.zeros(capacity, dtype=np.uint8)
+        self._symbols = np.zeros(capacity, dtype="<u4")
+        self._roles = np.zeros(capacity, dtype="<u4")
+        self._intensities = np.zeros(capacity, dtype="<f8")
+        self._timestamps = np.zeros(capacity, dtype="<f8")
+
+    def _reserve(self, count: int) -> None:
+        """Grow the columns (doubling) to hold ``count`` more rows."""
+        needed = self._n + count
+        if needed <= len(self._flags):
+            return
+        columns = self.columns()[1:6]
+        self._allocate(max(needed, 2 * len(self._flags), 16))
+        for target, source in zip((self._flags, self._symbols, self._roles, self._intensities,
+                                   self._timestamps), columns):
+            target[:self._n] = source
+
+    def _reload(self, terms: List[Dict[str, Any]]) -> None:
+        self._n = 0
+        self.extras = {}
+        self.extend(terms)
+
+    def _index(self, index: int) -> int:
+        row = index + self._n if index < 0 else index
+        if not 0 <= row < self._n:
+            raise IndexError("term index out of range")
+        return row
+
+    def _intern(self, text: str) -> int:
+        index = self._ids.get(text)
+        if index is None:
+            index = self._ids[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def _get(self, row: int, key: str) -> Any:
+        bits = int(self._flags[row])
+        if key == "symbol" and bits & SYMBOL:
+            return self.strings[self._symbols[row]]
+        if key == "role" and bits & ROLE:
+            return self.strings[self._roles[row]]
+        if key == "intensity" and bits & INTENSITY:
+            value = float(self._intensities[row])
+            return int(value) if bits & INTENSITY_INT else value
+        if key == "timestamp" and bits & TIMESTAMP:
+            value = float(self._timestamps[row])
+            return int(value) if bits & TIMESTAMP_INT else value
+        column = self.extras.get(key)
+        if column is not None and row in column:
+            return column[row]
+        raise KeyError(key)
+
+    def _set(self, row: int, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` for a row that does not hold ``key``."""
+        if key == "symbol" and type(value) is str:
+            self._flags[row] |= SYMBOL
+            self._symbols[row] = self._intern(value)
+            return
+        if key == "role" and type(value) is str:
+            self._flags[row] |= ROLE
+            self._roles[row] = self._intern(value)
+            return
+        if key == "intensity":
+            number = _number_flag(value, INTENSITY, INTENSITY_INT)
+            if number:
+                self._flags[row] |= number
+                self._intensities[row] = value
+                return
+        elif key == "timestamp":
+            number = _number_flag(value, TIMESTAMP, TIMESTAMP_INT)
+            if number:
+                self._flags[row] |= number
+                self._timestamps[row] = value
+                return
+        self.extras.setdefault(key, {})[row] = value
+
+    def _discard(self, row: int, key: str) -> bool:
+        """Remove ``key`` from a row; whether it was there."""
+        mask = _FIELD_FLAGS.get(key, 0)
+        if self._flags[row] & mask:
+            self._flags[row] &= ~mask & 0xFF
+            return True
+        return self._discard_extra(row, key)
+
+    def _discard_extra(self, row: int, key: str) -> bool:
+        column = self.extras.get(key)
+        if column is None or row not in column:
+            return False
+        del column[row]
+        if not column:
+            del self.extras[key]
+        return True
+
+    def _keys(self, row: int) -> List[str]:
+        bits = int(self._flags[row])
+        keys = [key for key, mask in _FIELD_FLAGS.items() if bits & mask]
+        keys.extend(key for key, column in self.extras.items() if row in column)
+        return keys
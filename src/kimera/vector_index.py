@@ -0,0 +1,422 @@
+"""
+Vector indexes over geoid ``sem_vec``s.
+
+Two implementations share one interface (``add``/``remove``/``top_k`` and
+``save``/``load_index``):
+
+- ``FlatIndex`` scores every live vector. It is exact and the baseline the
+  approximate index is measured against.
+- ``IVFIndex`` clusters vectors with spherical k-means and only scores the
+  ``n_probe`` inverted lists nearest the query, so a query touches roughly
+  ``n_probe / n_lists`` of the collection. Until it holds ``min_train``
+  vectors it searches exhaustively, like ``FlatIndex``.
+
+Vectors are stored L2-normalized in float32, so scores are cosine
+similarities, the same raw similarity ``resonance()`` starts from.
+Indexes persist as ``.npz`` files; ``index_path`` puts them next to the
+DuckDB lattice file.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .geoid import unit_rows
+
+PathLike = Union[str, Path]
+
+
+def index_path(db_path: PathLike = "kimera_lattice.db", name: str = "sem") -> Path:
+    """Where the ``name`` index for the lattice at ``db_path`` lives."""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.name}.{name}.index.npz")
+
+
+class FlatIndex:
+    """Exact cosine index: every live vector is scored on each query."""
+
+    kind = "flat"
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._n = 0
+        self._vecs = np.empty((max(capacity, 1), dim), dtype=np.float32)
+        self._alive = np.zeros(max(capacity, 1), dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        """Live ids in insertion order."""
+        return [i for i in self._ids if i is not None]
+
+    def _reserve(self, extra: int) -> None:
+        need = self._n + extra
+        cap = len(self._vecs)
+        if need <= cap:
+            return
+        while cap < need:
+            cap *= 2
+        vecs = np.empty((cap, self.dim), dtype=np.float32)
+        vecs[:self._n] = self._vecs[:self._n]
+        alive = np.zeros(cap, dtype=bool)
+        alive[:self._n] = self._alive[:self._n]
+        self._vecs, self._alive = vecs, alive
+
+    def _prepare(self, ids: Sequence[str], vecs) -> np.ndarray:
+        vecs = np.asarray(vecs, dtype=np.float32)
+        if vecs.ndim == 1:
+            vecs = vecs[None, :]
+        if vecs.shape != (len(ids), self.dim):
+            raise ValueError(
+                f"Expected {len(ids)} vectors of width {self.dim}, got shape {vecs.shape}"
+            )
+        return unit_rows(vecs)
+
+    def add(self, ids: Sequence[str], vecs) -> np.ndarray:
+        """Insert vectors under ``ids``; an existing id is overwritten in place.
+
+        Returns the row index of each id.
+        """
+        ids = [str(i) for i in ids]
+        vecs = self._prepare(ids, vecs)
+        rows = np.empty(len(ids), dtype=np.int64)
+        fresh = []
+        for pos, id_ in enumerate(ids):
+            row = self._rows.get(id_)
+            if row is None:
+                fresh.append(pos)
+            else:
+                self._vecs[row] = vecs[pos]
+                rows[pos] = row
+        # Ids repeated within one call keep their last vector
+        last: Dict[str, int] = {}
+        for pos in fresh:
+            last[ids[pos]] = pos
+        self._reserve(len(last))
+        for id_, pos in last.items():
+            row = self._n
+            self._n += 1
+            self._vecs[row] = vecs[pos]
+            self._alive[row] = True
+            self._ids.append(id_)
+            self._rows[id_] = row
+        for pos in fresh:
+            rows[pos] = self._rows[ids[pos]]
+        self._assign(rows, vecs)
+        return rows
+
+    def add_geoids(self, geoids: Iterable) -> np.ndarray:
+        """Index geoids by ``gid`` using their ``sem_vec``."""
+        geoids = list(geoids)
+        if not geoids:
+            return np.empty(0, dtype=np.int64)
+        return self.add([g.gid for g in geoids], np.stack([g.sem_vec for g in geoids]))
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Drop ``ids`` from the index; unknown ids are ignored.
+
+        Returns how many were removed. Rows are tombstoned and reclaimed by
+        ``compact()``.
+        """
+        removed = 0
+        for id_ in ids:
+            row = self._rows.pop(str(id_), None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._ids[row] = None
+            removed += 1
+        return removed
+
+    def compact(self) -> None:
+        """Rewrite storage without tombstoned rows."""
+        keep = np.flatnonzero(self._alive[:self._n])
+        if len(keep) == self._n:
+            return
+        vecs = self._vecs[keep]
+        ids = [self._ids[r] for r in keep]
+        self._reset()
+        if ids:
+            self.add(ids, vecs)
+
+    def _reset(self) -> None:
+        self._n = 0
+        self._alive[:] = False
+        self._ids = []
+        self._rows = {}
+
+    def _assign(self, rows: np.ndarray, vecs: np.ndarray) -> None:
+        """Hook for subclasses that track where rows live."""
+
+    def _candidates(self, q: np.ndarray) -> Optional[np.ndarray]:
+        """Rows to score for ``q``, or ``None`` for every live row."""
+        return None
+
+    def top_k(self, query, k: int = 10, threshold: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Return up to ``k`` ``(id, cosine)`` pairs, best first.
+
+        Args:
+            query: Query vector of width ``dim`` (need not be normalized).
+            k: Maximum number of hits.
+            threshold: If given, drop hits scoring below it.
+        """
+        if k <= 0 or not self._rows:
+            return []
+        q = unit_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        if q.shape[0] != self.dim:
+            raise ValueError(f"Query has width {q.shape[0]}, index has {self.dim}")
+        rows = self._candidates(q)
+        if rows is None:
+            # Score the contiguous block rather than gathering live rows
+            alive = self._alive[:self._n]
+            scores = self._vecs[:self._n] @ q
+            rows = np.flatnonzero(alive)
+            if rows.size < self._n:
+                scores = scores[rows]
+        else:
+            rows = rows[self._alive[rows]]
+            scores = self._vecs[rows] @ q
+        if rows.size == 0:
+            return []
+        if threshold is not None:
+            keep = scores >= threshold
+            rows, scores = rows[keep], scores[keep]
+        if rows.size > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[part], scores[part]
+        order = np.argsort(-scores, kind="stable")
+        return [(self._ids[rows[i]], float(scores[i])) for i in order]
+
+    # ---- persistence ----
+
+    def _state(self) -> Dict[str, np.ndarray]:
+        live = np.flatnonzero(self._alive[:self._n])
+        return {
+            "kind": np.array(self.kind),
+            "dim": np.array(self.dim),
+            "ids": np.array([self._ids[r] for r in live], dtype=str),
+            "vecs": self._vecs[live],
+        }
+
+    def save(self, path: PathLike) -> Path:
+        """Write the index to ``path`` atomically (tombstones are dropped)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **self._state())
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def _from_state(cls, state) -> "FlatIndex":
+        ids = [str(i) for i in state["ids"]]
+        index = cls(int(state["dim"]), capacity=max(len(ids), 1))
+        if ids:
+            index.add(ids, state["vecs"])
+        return index
+
+
+class IVFIndex(FlatIndex):
+    """Inverted-file index: k-means coarse quantizer plus per-cluster lists.
+
+    Training picks ``n_lists`` centroids (``sqrt(n)`` by default) from the
+    live vectors; later additions are routed to their nearest centroid
+    without retraining. Once the collection has grown ``retrain_factor``
+    times past its size at training, the next query retrains.
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        dim: int,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        min_train: int = 1024,
+        retrain_factor: float = 4.0,
+        capacity: int = 1024,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            dim: Vector width.
+            n_lists: Number of clusters; ``None`` picks ``sqrt(n)`` at training.
+            n_probe: Clusters scored per query. Higher is slower and more exact.
+            min_train: Below this many vectors queries stay exhaustive.
+            retrain_factor: Growth since the last training that triggers a
+                retrain on the next query; ``0`` disables retraining.
+            capacity: Initial number of rows.
+            seed: Seed for centroid initialization.
+        """
+        super().__init__(dim, capacity)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train = min_train
+        self.retrain_factor = retrain_factor
+        self.seed = seed
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+        self._list_of = np.full(len(self._vecs), -1, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def _reserve(self, extra: int) -> None:
+        super()._reserve(extra)
+        if len(self._list_of) < len(self._vecs):
+            list_of = np.full(len(self._vecs), -1, dtype=np.int32)
+            list_of[:len(self._list_of)] = self._list_of
+            self._list_of = list_of
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._list_of[:] = -1
+        self._lists = [[] for _ in self._lists]
+        self._list_arrays = {}
+
+    def _assign(self, rows: np.ndarray, vecs: np.ndarray) -> None:
+        if self._centroids is None:
+            return
+        targets = np.argmax(vecs @ self._centroids.T, axis=1)
+        for row, target in zip(rows.tolist(), targets.tolist()):
+            old = self._list_of[row]
+            if old == target:
+                continue
+            if old >= 0:
+                # Stale entries are filtered out at query time
+                self._list_arrays.pop(int(old), None)
+            self._list_of[row] = target
+            self._lists[target].append(row)
+            self._list_arrays.pop(target, None)
+
+    def train(self, n_lists: Optional[int] = None, iters: int = 10, sample: int = 256) -> None:
+        """Cluster the live vectors and rebuild the inverted lists.
+
+        Args:
+            n_lists: Number of clusters (defaults to ``self.n_lists`` or ``sqrt(n)``).
+            iters: K-means iterations.
+            sample: Training uses at most ``sample * n_lists`` vectors.
+        """
+        live = np.flatnonzero(self._alive[:self._n])
+        if live.size == 0:
+            return
+        n_lists = n_lists or self.n_lists or max(1, int(np.sqrt(live.size)))
+        n_lists = min(n_lists, live.size)
+        rng = np.random.default_rng(self.seed)
+        train_rows = live
+        if live.size > sample * n_lists:
+            train_rows = rng.choice(live, sample * n_lists, replace=False)
+        data = self._vecs[train_rows]
+        centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+        for _ in range(iters):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            counts = np.bincount(labels, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Reseed empty clusters from random training vectors
+                sums[empty] = data[rng.choice(len(data), int(empty.sum()))]
+            centroids = unit_rows(sums)
+
+        self._centroids = centroids
+        self._trained_size = live.size
+        self._list_of[:] = -1
+        self._lists = [[] for _ in range(n_lists)]
+        self._list_arrays = {}
+        self._assign(live, self._vecs[live])
+
+    def _list_rows(self, lst: int) -> np.ndarray:
+        rows = self._list_arrays.get(lst)
+        if rows is None:
+            rows = np.asarray(self._lists[lst], dtype=np.int64)
+            # Drop entries for rows that moved to another list
+            rows = rows[self._list_of[rows] == lst]
+            rows = np.unique(rows)
+            self._lists[lst] = rows.tolist()
+            self._list_arrays[lst] = rows
+        return rows
+
+    def _candidates(self, q: np.ndarray) -> Optional[np.ndarray]:
+        live = len(self._rows)
+        if self._centroids is None:
+            if live < self.min_train:
+                return None
+            self.train()
+        elif self.retrain_factor and live >= self._trained_size * self.retrain_factor:
+            self.train()
+        n_probe = min(self.n_probe, len(self._centroids))
+        if n_probe >= len(self._centroids):
+            return None
+        near = np.argpartition(-(self._centroids @ q), n_probe - 1)[:n_probe]
+        return np.concatenate([self._list_rows(int(lst)) for lst in near])
+
+    def _state(self) -> Dict[str, np.ndarray]:
+        state = super()._state()
+        state["params"] = np.array([
+            -1 if self.n_lists is None else self.n_lists,
+            self.n_probe, self.min_train, self.seed,
+        ])
+        state["retrain_factor"] = np.array(self.retrain_factor)
+        if self._centroids is not None:
+            state["centroids"] = self._centroids
+            state["trained_size"] = np.array(self._trained_size)
+        return state
+
+    @classmethod
+    def _from_state(cls, state) -> "IVFIndex":
+        ids = [str(i) for i in state["ids"]]
+        n_lists, n_probe, min_train, seed = (int(v) for v in state["params"])
+        index = cls(
+            int(state["dim"]),
+            n_lists=None if n_lists < 0 else n_lists,
+            n_probe=n_probe,
+            min_train=min_train,
+            retrain_factor=float(state["retrain_factor"]),
+            capacity=max(len(ids), 1),
+            seed=seed,
+        )
+        if "centroids" in state:
+            index._centroids = np.asarray(state["centroids"], dtype=np.float32)
+            index._trained_size = int(state["trained_size"])
+            index._lists = [[] for _ in range(len(index._centroids))]
+        if ids:
+            index.add(ids, state["vecs"])
+        return index
+
+
+INDEX_TYPES = {cls.kind: cls for cls in (FlatIndex, IVFIndex)}
+
+
+def make_index(dim: int, kind: str = "ivf", **kwargs) -> FlatIndex:
+    """Create an empty index of ``kind`` (``"flat"`` or ``"ivf"``)."""
+    try:
+        cls = INDEX_TYPES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown index kind {kind!r}; expected one of {sorted(INDEX_TYPES)}") from None
+    return cls(dim, **kwargs)
+
+
+def load_index(path: PathLike) -> FlatIndex:
+    """Load an index written by ``save()``."""
+    with np.load(Path(path), allow_pickle=False) as state:
+        state = dict(state)
+    kind = str(state["kind"])
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown index kind {kind!r} in {path}")
+    return INDEX_TYPES[kind]._from_state(state)
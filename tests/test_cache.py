@@ -115,6 +115,58 @@ class TestEmbeddingCache:
         assert stats["cache_file_size_mb"] > 0
 
 
+class TestVectorStore:
+    """Test the memory-mapped store behind the embedding cache."""
+
+    def test_get_many_set_many(self, tmp_path):
+        os.environ["KIMERA_CACHE_DIR"] = str(tmp_path)
+        clear_embedding_cache()
+
+        a, b = np.arange(384, dtype=np.float32), np.ones(384, dtype=np.float32)
+        embed_cache.set_many([("en", "a", a), ("en", "b", b), ("en", "a", a)])
+
+        got = embed_cache.get_many([("en", "b"), ("en", "missing"), ("en", "a")])
+        assert np.array_equal(got[0], b)
+        assert got[1] is None
+        assert np.array_equal(got[2], a)
+        assert get_cache_stats()["embedding_cache_size"] == 2
+
+    def test_torn_append_is_ignored(self, tmp_path):
+        """A crash mid-append leaves partial bytes that must not corrupt reads."""
+        os.environ["KIMERA_CACHE_DIR"] = str(tmp_path)
+        clear_embedding_cache()
+
+        vec = np.full(384, 0.5, dtype=np.float32)
+        embed_cache.set("en", "kept", vec)
+        with open(tmp_path / "vectors_384d.f32", "ab") as f:
+            f.write(b"\x00" * 100)
+        with open(tmp_path / "vectors_384d.idx", "ab") as f:
+            f.write(b"\x01" * 7)
+
+        from kimera.cache import EmbeddingCache
+        fresh = EmbeddingCache()
+        assert fresh._get_cache_size() == 1
+        fresh.set("en", "after", vec * 2)
+
+        reopened = EmbeddingCache()
+        assert np.array_equal(reopened.get("en", "kept"), vec)
+        assert np.array_equal(reopened.get("en", "after"), vec * 2)
+
+    def test_migrate_pickle_cache(self, tmp_path):
+        import joblib
+        from kimera.cache import _emb_key, migrate_pickle_cache
+
+        os.environ["KIMERA_CACHE_DIR"] = str(tmp_path)
+        clear_embedding_cache()
+
+        vec = np.linspace(0, 1, 384).astype(np.float32)
+        joblib.dump(vec, tmp_path / f"{_emb_key('en', 'legacy text')}.pkl")
+
+        assert migrate_pickle_cache(tmp_path, delete=True) == 1
+        assert not list(tmp_path.glob("*.pkl"))
+        assert np.array_equal(embed_cache.get("en", "legacy text"), vec)
+
+
 class TestResonanceCache:
     """Test resonance cache functionality."""
     
@@ -160,6 +212,76 @@ class TestResonanceCache:
         assert resonance_cache.get("gid3", "gid4") is None
 
 
+    def test_resonance_cache_lru_eviction(self):
+        from kimera.cache import ResonanceCache
+
+        cache = ResonanceCache(capacity=2)
+        cache.set("a", "b", 0.1)
+        cache.set("c", "d", 0.2)
+        assert cache.get("b", "a") == 0.1  # touch: (c, d) is now oldest
+        cache.set("e", "f", 0.3)
+
+        assert cache.get("c", "d") is None
+        assert cache.get("a", "b") == 0.1
+        stats = cache.stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2 and stats["misses"] == 1
+
+    def test_resonance_cache_ttl(self, monkeypatch):
+        from kimera import cache as cache_mod
+
+        now = [1000.0]
+        monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+        cache = cache_mod.ResonanceCache(capacity=10, ttl=5.0)
+        cache.set("a", "b", 0.5)
+        now[0] += 4.0
+        assert cache.get("a", "b") == 0.5
+        now[0] += 2.0
+        assert cache.get("a", "b") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_resonance_uses_cache(self):
+        from kimera.geoid import init_geoid
+        from kimera.resonance import resonance
+
+        resonance_cache.clear()
+        resonance_cache.reset_stats()
+        g1 = init_geoid("Cached pair one", "en", ["test"])
+        g2 = init_geoid("Cached pair two", "en", ["test"])
+
+        first = resonance(g1, g2)
+        second = resonance(g2, g1)
+        assert first == second
+        stats = get_cache_stats()
+        assert stats["resonance_cache_hits"] == 1
+        assert stats["resonance_cache_misses"] == 1
+        assert stats["resonance_cache_size"] == 1
+
+    def test_resonance_cache_keys_on_vectors(self):
+        """Geoids sharing a gid but not a vector never share a cached similarity."""
+        import dataclasses
+        from kimera.geoid import Geoid
+        from kimera.resonance import resonance
+
+        def geoid(gid, vec):
+            vec = np.asarray(vec, dtype=np.float32)
+            return Geoid(raw=gid, echo=gid, gid=gid, lang_axis="en", context_layers=["test"],
+                         sem_vec=vec, sym_vec=vec, vdr=1.0)
+
+        resonance_cache.clear()
+        a, b = geoid("cache a", [1.0, 0.0]), geoid("cache b", [1.0, 0.0])
+        assert resonance(a, b) == pytest.approx(1.0)
+
+        turned = np.array([0.0, 1.0], dtype=np.float32)
+        assert resonance(dataclasses.replace(a, sem_vec=turned), b) == pytest.approx(0.0)
+        a.sem_vec = turned
+        assert resonance(a, b) == pytest.approx(0.0)
+        assert resonance(b, a) == pytest.approx(0.0)
+        assert len(resonance_cache) == 2
+
+
 class TestCacheIntegration:
     """Test cache integration with geoid operations."""
     
@@ -6,8 +6,12 @@ import sys
 sys.path.insert(0, 'src')
 
 import json
+import math
 import time
+
+import pytest
 from kimera.echoform import EchoForm
+from kimera.term_table import TermTable
 
 
 def test_echoform_initialization():
@@ -269,6 +273,92 @@ def test_reinflate():
     assert echo.echo_created_at == 1234567890.0
 
 
+def test_pack_roundtrip():
+    """Test binary encoding → reinflate preserves terms and their value types"""
+    echo1 = EchoForm(anchor="packed", domain="echo", topology={"nodes": [1, 2, 3]})
+    echo1.terms = [
+        {"symbol": "α", "role": "primary", "intensity": 1.5, "timestamp": 1234567890.25},
+        {"symbol": "β", "role": "secondary", "intensity": 2, "meta": "data"},
+        {"symbol": 7, "flags": [1, {"x": None}], "weight": 0.5},
+        {"role": "bare"},
+    ]
+
+    blob = echo1.pack()
+    assert isinstance(blob, bytes)
+
+    echo2 = EchoForm.reinflate(blob)
+    assert echo2.__dict__ == echo1.__dict__
+    assert type(echo2.terms[1]["intensity"]) is int
+    # bytes-like blobs as returned by the database
+    assert EchoForm.reinflate(memoryview(blob)).terms == echo1.terms
+
+
+def test_term_table_matches_list_terms():
+    """Test TermTable-backed terms compute the same metrics as a list of dicts"""
+    now = time.time()
+    echo = EchoForm(anchor="columns", domain="cls")
+    for i in range(50):
+        echo.add_term("cls_event", role="resonance_trigger", intensity=0.1 * (i % 7),
+                      timestamp=now - 3600 * i, event_type="repeat")
+    echo.terms += [{"symbol": "s", "intensity": 2}, {"symbol": 5, "intensity": True, "timestamp": None},
+                   {"role": "bare"}]
+
+    table = EchoForm.reinflate(echo.pack(), term_table=True)
+    assert isinstance(table.terms, TermTable)
+    assert table.terms == echo.terms
+    for kwargs in ({}, {"apply_time_decay": False}, {"use_entropy_weighting": False}):
+        assert math.isclose(table.intensity_sum(at=now, **kwargs), echo.intensity_sum(at=now, **kwargs))
+    assert math.isclose(table.entropy(), echo.entropy())
+    assert table.flatten() == echo.flatten()
+
+
+def test_term_table_views():
+    """Test TermTable rows read and write through as dicts"""
+    terms = TermTable([{"symbol": "a", "intensity": 1.0, "note": "x"}, {"symbol": "b"}])
+    terms[0]["intensity"] = 3
+    terms[0]["symbol"] = 7
+    del terms[0]["note"]
+    terms.append({"role": "c", "timestamp": 1.5})
+    assert terms == [{"symbol": 7, "intensity": 3}, {"symbol": "b"}, {"role": "c", "timestamp": 1.5}]
+    assert type(terms[0]["intensity"]) is int
+
+    del terms[1]
+    terms.insert(0, {"symbol": "z"})
+    assert terms.to_list() == [{"symbol": "z"}, {"symbol": 7, "intensity": 3}, {"role": "c", "timestamp": 1.5}]
+
+    terms.scale_intensities(0.5)
+    assert terms[1]["intensity"] == 1.5
+
+
+def test_compact_terms():
+    """Test cls_event rollup keeps entropy and decayed intensity"""
+    now = time.time()
+    echo = EchoForm(anchor="hot", domain="cls")
+    echo.add_term("CLS", role="cls_seed", intensity=1.0, timestamp=now - 86400)
+    for i in range(300):
+        echo.add_term("cls_event", role="resonance_trigger", intensity=0.1 * (1 + i % 5),
+                      timestamp=now - 86400 + 60 * i, event_type="lattice_resolve_repeat")
+    before = (echo.entropy(), echo.intensity_sum(at=now), echo.intensity_sum(apply_time_decay=False))
+
+    assert echo.compact_terms(keep=20, at=now) == 280
+    assert len(echo.terms) == 22
+    (rollup,) = [t for t in echo.terms if t["role"] == "cls_rollup"]
+    assert rollup["rollup_count"] == 280
+    after = (echo.entropy(), echo.intensity_sum(at=now), echo.intensity_sum(apply_time_decay=False))
+    assert after == pytest.approx(before, rel=1e-9)
+
+    # The rollup is merged again, and the table-backed path agrees
+    table = EchoForm.reinflate(echo.pack(), term_table=True)
+    assert table.compact_terms(keep=0, at=now) == 21
+    assert table.terms[1]["rollup_count"] == 300
+    assert table.entropy() == pytest.approx(before[0], rel=1e-9)
+    assert table.intensity_sum(at=now) == pytest.approx(before[1], rel=1e-9)
+
+    # Nothing old enough, or too few terms: left alone
+    assert table.compact_terms(keep=0, at=now) == 0
+    assert echo.compact_terms(max_age=10 * 86400, at=now) == 0
+
+
 def test_to_dict():
     """Test dictionary conversion"""
     echo = EchoForm(
@@ -0,0 +1,64 @@
+"""Tests for precomputed geoid text features."""
+
+import dataclasses
+import pickle
+
+import numpy as np
+
+from kimera import contradiction, features, resonance as resonance_mod
+from kimera.contradiction import detect_contradiction, extract_core_claim
+from kimera.features import text_features
+from kimera.geoid import Geoid, init_geoid, init_geoids_batch
+
+
+def test_features_computed_at_init():
+    g = init_geoid("Birds cannot fly", "en", ["test"])
+    f = g.features
+    assert f.tokens == {"birds", "cannot", "fly"}
+    assert f.has_negation and f.negated
+    assert (f.subject, f.predicate) == ("birds", "fly")
+    assert "fly" in f.antonym_hits
+
+    batch = init_geoids_batch(["The sky is blue", "Birds cannot fly"], "en", ["test"])
+    assert [b.features for b in batch] == [text_features("The sky is blue"), f]
+
+
+def test_features_survive_pickle():
+    g = init_geoid("The sky is not blue", "en", ["test"])
+    assert pickle.loads(pickle.dumps(g)).features == g.features
+
+
+def test_features_follow_replaced_raw():
+    vec = np.ones(4, dtype=np.float32)
+    g = Geoid(raw="The sky is not blue", echo="The sky is not blue", gid="g", lang_axis="en",
+              context_layers=["test"], sem_vec=vec, sym_vec=vec, vdr=1.0)
+    copy = dataclasses.replace(g, raw="The sky is blue")
+    assert copy.features == text_features("The sky is blue")
+    assert not copy.features.has_negation and g.features.has_negation
+
+
+def test_two_negation_notions_stay_distinct():
+    # Token match for resonance, substring match for contradiction heuristics
+    f = text_features("I know the answer")
+    assert not f.has_negation
+    assert f.negated  # "no" occurs inside "know"
+    assert extract_core_claim("  Cats ARE black ") == ("cats", "black", False)
+
+
+def test_pairwise_checks_do_not_retokenize(monkeypatch):
+    a = init_geoid("Water is hot", "en", ["test"])
+    b = init_geoid("Water is cold", "en", ["test"])
+    c = init_geoid("The sky is blue", "en", ["test"])
+    d = init_geoid("The sky is not blue", "en", ["test"])
+
+    def boom(text):
+        raise AssertionError(f"re-tokenized {text!r}")
+
+    monkeypatch.setattr(features, "text_features", boom)
+    monkeypatch.setattr(contradiction, "text_features", boom)
+    monkeypatch.setattr(resonance_mod, "text_features", boom)
+
+    detect_contradiction(a, b)
+    detect_contradiction(c, d)
+    resonance_mod.resonance(c, d)
+    resonance_mod.resonance_matrix([a, b, c, d])
@@ -1,4 +1,17 @@
-from kimera.geoid import init_geoid
+import dataclasses
+
+import numpy as np
+import pytest
+
+from kimera.geoid import (
+    DEFAULT_ENCODER,
+    Geoid,
+    GeoidMatrix,
+    init_geoid,
+    init_geoids_batch,
+    register_encoder,
+    use_encoders,
+)
 
 
 def test_init_geoid():
@@ -24,3 +37,109 @@ def test_stable_gid_from_echo():
     
     assert g1.gid == g2.gid  # Same echo should give same gid
     assert g1.gid != g3.gid  # Different echo should give different gid
+
+
+def test_init_geoids_batch_matches_single():
+    """Batched init returns geoids in input order, identical to init_geoid"""
+    texts = ["Hello world", "  Hello world  ", "The sky is blue", "Hello world"]
+    batch = init_geoids_batch(texts, ["en", "en", "en", "fr"], ["default"])
+    assert [g.raw for g in batch] == texts
+    for g, text, lang in zip(batch, texts, ["en", "en", "en", "fr"]):
+        single = init_geoid(text, lang, ["default"])
+        assert g.gid == single.gid
+        assert g.echo == single.echo
+        assert g.lang_axis == lang
+        assert g.context_layers == ["default"]
+        assert np.allclose(g.sem_vec, single.sem_vec)
+    # Same (lang, echo) is encoded once and shared
+    assert batch[0].sem_vec is batch[1].sem_vec
+
+
+def test_init_geoids_batch_per_row_layers():
+    batch = init_geoids_batch(["a b", "c d"], "en", [["x"], ["y", "z"]])
+    assert batch[0].context_layers == ["x"]
+    assert batch[1].context_layers == ["y", "z"]
+    assert init_geoids_batch([], "en") == []
+
+
+def test_sem_sym_share_one_encoding():
+    """Same encoder for both roles: one computation, no copy"""
+    g = init_geoid("Shared vectors", "en", ["default"])
+    assert g.sym_vec is g.sem_vec
+
+
+def test_separate_symbolic_encoder():
+    calls = []
+
+    def toy_encoder(texts, batch_size):
+        calls.append(list(texts))
+        return np.ones((len(texts), 8), dtype=np.float32)
+
+    register_encoder("toy_sym", toy_encoder, cached=False)
+    use_encoders(sym="toy_sym")
+    try:
+        g = init_geoid("Separate roles", "en", ["default"])
+        assert g.sym_vec.shape == (8,)
+        assert g.sem_vec.shape[0] in (384, 512)
+        assert calls == [["Separate roles"]]
+    finally:
+        use_encoders(sym=DEFAULT_ENCODER)
+
+
+def test_geoid_matrix_rows_are_views():
+    geoids = init_geoids_batch([f"arena text {i}" for i in range(5)], "en")
+    raw = [g.sem_vec.copy() for g in geoids]
+    arena = GeoidMatrix.from_geoids(geoids)
+
+    assert len(arena) == 5
+    assert arena.sem.dtype == np.float32
+    assert arena.sem.flags["C_CONTIGUOUS"]
+    assert np.allclose(np.linalg.norm(arena.sem, axis=1), 1.0, atol=1e-6)
+    for row, (g, vec) in enumerate(zip(geoids, raw)):
+        assert g.arena is arena and g.row == row
+        assert np.shares_memory(g.sem_vec, arena.sem)
+        assert g.sym_vec is g.sem_vec
+        assert np.allclose(g.sem_vec, vec / np.linalg.norm(vec), atol=1e-6)
+
+
+def test_geoid_matrix_grows_and_rebinds():
+    arena = GeoidMatrix(384, capacity=1)
+    geoids = init_geoids_batch([f"growth {i}" for i in range(4)], "en", arena=arena)
+    assert len(arena) == 4
+    assert all(np.shares_memory(g.sem_vec, arena.sem) for g in geoids)
+    assert np.array_equal(arena.rows_of(geoids[::-1]), [3, 2, 1, 0])
+
+
+def test_geoid_pickle_drops_arena():
+    import pickle
+
+    g = init_geoids_batch(["pickled"], "en", arena=GeoidMatrix(384))[0]
+    clone = pickle.loads(pickle.dumps(g))
+    assert clone.arena is None and clone.row == -1
+    assert np.array_equal(clone.sem_vec, g.sem_vec)
+
+
+def _vec_geoid(text, vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return Geoid(raw=text, echo=text, gid=text, lang_axis="en", context_layers=["test"],
+                 sem_vec=vec, sym_vec=vec, vdr=1.0)
+
+
+def test_geoid_matrix_detaches_replaced_and_reassigned_geoids():
+    a, b = _vec_geoid("a", [3.0, 4.0]), _vec_geoid("b", [1.0, 0.0])
+    arena = GeoidMatrix(2, capacity=2)
+    arena.extend([a, b])
+
+    copy = dataclasses.replace(a, sem_vec=np.array([0.0, 1.0], dtype=np.float32))
+    assert copy.arena is None and copy.row == -1
+    assert arena.holds(a)
+
+    b.sem_vec = b.sym_vec = np.array([0.0, 2.0], dtype=np.float32)
+    assert not arena.holds(b)
+    with pytest.raises(ValueError):
+        arena.rows_of([a, b])
+
+    # Growing the arena rebinds held geoids only
+    arena.add(_vec_geoid("c", [1.0, 1.0]))
+    assert arena.holds(a) and np.allclose(a.sem_vec, [0.6, 0.8])
+    assert b.arena is None and np.array_equal(b.sem_vec, [0.0, 2.0])
@@ -0,0 +1,50 @@
+"""Import-time budget: importing kimera must not load the sentence encoder."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Generous default so slow CI runners pass; the point is to catch model loads
+IMPORT_BUDGET_S = float(os.getenv("KIMERA_IMPORT_BUDGET_S", "3.0"))
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "elapsed": elapsed,
+    "sentence_transformers": "sentence_transformers" in sys.modules,
+    "sklearn": "sklearn" in sys.modules,
+}}))
+"""
+
+
+def _import_in_subprocess(module: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["kimera", "kimera.storage"])
+def test_import_is_fast(module):
+    result = _import_in_subprocess(module)
+    assert not result["sentence_transformers"], f"import {module} loaded sentence_transformers"
+    assert not result["sklearn"], f"import {module} loaded sklearn"
+    assert result["elapsed"] < IMPORT_BUDGET_S, (
+        f"import {module} took {result['elapsed']:.2f}s (budget {IMPORT_BUDGET_S}s)"
+    )
+
+
+def test_encoder_loads_lazily():
+    from kimera import geoid
+
+    geoid.warmup()
+    model = geoid._get_model()
+    assert geoid._get_model() is model
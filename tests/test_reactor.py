@@ -1,3 +1,5 @@
+import numpy as np
+
 from kimera.geoid import init_geoid
 from kimera.reactor import reactor_cycle, reactor_cycle_batched
 from kimera import resonance as _res
@@ -35,3 +37,128 @@ def test_reactor_batch_stats():
     assert stats["geoids"] == 400
     assert stats["latency_ms"] > 0
     assert stats["new_scars"] >= 1
+
+
+def _legacy_cycle(geoids):
+    """The original per-pair loop, for equivalence checks."""
+    from kimera.scar import create_scar
+    for g1, g2 in _reactor.random_pairs(geoids):
+        r = _res.resonance(g1, g2)
+        if r < _reactor.THRESH:
+            create_scar(g1, g2, 1 - r)
+
+
+def test_reactor_cycle_matches_per_pair_loop():
+    import random
+    from dataclasses import replace
+    from kimera.scar import SCAR_LOG
+
+    texts = [f"Cats purr softly {i}" for i in range(30)] + [f"Quantum foam {i} is not calm" for i in range(31)]
+    base = [init_geoid(t, "en", ["default"]) for t in texts]
+    # Scars are keyed by gid, so each run gets its own fresh gids
+    runs = {
+        tag: [replace(g, gid=f"{g.gid}-{tag}", scars=None) for g in base]
+        for tag in ("legacy", "vectorized")
+    }
+
+    results = []
+    for tag, run in (("legacy", _legacy_cycle), ("vectorized", reactor_cycle)):
+        before = len(SCAR_LOG)
+        random.seed(11)
+        for _ in range(3):
+            run(runs[tag])
+        results.append([
+            (a.rsplit("-", 1)[0], b.rsplit("-", 1)[0], s.weight)
+            for s in list(SCAR_LOG.values())[before:]
+            for a, b in [s.gid_pair]
+        ])
+    assert results[0] == results[1]
+    assert results[0]
+
+
+def test_pair_indices_strategies():
+    import pytest
+
+    left, right = _reactor.pair_indices(5, "window", window=2)
+    assert sorted(zip(left.tolist(), right.tolist())) == [(0, 1), (0, 2), (1, 2), (1, 3), (2, 3), (2, 4), (3, 4)]
+
+    left, right = _reactor.pair_indices(4, "all_pairs")
+    assert len(left) == 6 and (left < right).all()
+
+    left, right = _reactor.pair_indices(7, "random")
+    assert len(left) == 3 and len(set(left.tolist()) | set(right.tolist())) == 6
+
+    with pytest.raises(ValueError):
+        _reactor.pair_indices(4, "spiral")
+
+
+def test_reactor_batch_strategies_keep_stats_shape():
+    orig_thresh = _reactor.THRESH
+    _reactor.THRESH = 0.95
+    try:
+        geoids = [init_geoid(f"Cats purr softly {i}", "en", ["default"]) for i in range(40)]
+        window = reactor_cycle_batched(geoids, chunk=20, verbose=False, strategy="window", window=3)
+        all_pairs = reactor_cycle_batched(geoids, chunk=20, verbose=False, strategy="all_pairs")
+    finally:
+        _reactor.THRESH = orig_thresh
+
+    for stats in (window, all_pairs):
+        assert set(stats) == {"geoids", "pairs", "latency_ms", "mem_mb", "new_scars"}
+    assert window["pairs"] == 2 * (19 + 18 + 17)
+    assert all_pairs["pairs"] == 2 * 190
+    assert all_pairs["new_scars"] > 0
+
+
+def _vec_geoids(n, tag="v"):
+    """Geoids with fixed random vectors (no encoder needed)."""
+    from kimera.geoid import Geoid
+
+    rng = np.random.default_rng(5)
+    out = []
+    for i in range(n):
+        vec = rng.normal(size=16).astype(np.float32)
+        raw = f"claim {i} is not true" if i % 3 == 0 else f"claim {i} holds"
+        out.append(Geoid(raw=raw, echo=raw, gid=f"{tag}-{i}", lang_axis="en", context_layers=["test"],
+                         sem_vec=vec, sym_vec=vec, vdr=1.0))
+    return out
+
+
+def test_all_pairs_blocks_cover_the_triangle():
+    for n, block in [(0, 4), (1, 4), (2, 1), (7, 1), (7, 5), (12, 100)]:
+        blocks = list(_reactor._triu_blocks(n, block))
+        left, right = _reactor.pair_indices(n, "all_pairs")
+        got_left = np.concatenate([b[0] for b in blocks] or [np.empty(0, dtype=np.intp)])
+        got_right = np.concatenate([b[1] for b in blocks] or [np.empty(0, dtype=np.intp)])
+        assert np.array_equal(got_left, left) and np.array_equal(got_right, right)
+        assert all(len(b[0]) <= max(block, n - 1) for b in blocks)
+
+
+def test_every_strategy_pushes_to_the_rope(monkeypatch):
+    from kimera.rope import rope_buffer
+
+    monkeypatch.setattr(_reactor, "ALL_PAIRS_BLOCK", 5)
+    geoids = _vec_geoids(9, "rope")
+    for strategy in _reactor.STRATEGIES:
+        before = rope_buffer.pushed
+        pairs, _ = _reactor._react(geoids, strategy, window=2)
+        assert rope_buffer.pushed - before == pairs > 0
+
+    left, right = _reactor.pair_indices(9, "all_pairs")
+    gids = [g.gid for g in geoids]
+    assert [e[:2] for e in rope_buffer.entries(last=len(left))] == [(gids[i], gids[j]) for i, j in zip(left, right)]
+
+
+def test_blocked_all_pairs_scores_match_one_pass(monkeypatch):
+    from dataclasses import replace
+    from kimera.scar import SCAR_LOG
+
+    base = _vec_geoids(7, "blocked")
+    results = []
+    for block in (1 << 16, 3):
+        monkeypatch.setattr(_reactor, "ALL_PAIRS_BLOCK", block)
+        run = [replace(g, gid=f"{g.gid}-{block}", scars=None) for g in base]
+        before = len(SCAR_LOG)
+        _reactor._react(run, "all_pairs", 0)
+        results.append([(a.rsplit("-", 1)[0], b.rsplit("-", 1)[0], s.weight)
+                        for s in list(SCAR_LOG.values())[before:] for a, b in [s.gid_pair]])
+    assert results[0] == results[1] and results[0]
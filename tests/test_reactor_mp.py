@@ -1,8 +1,13 @@
 """Tests for multiprocessing reactor functionality."""
 
+import random
+
+import numpy as np
 import pytest
 from kimera.geoid import init_geoid
-from kimera.reactor_mp import reactor_cycle_parallel, reactor_cycle_threaded
+from kimera.reactor_mp import reactor_cycle_parallel, reactor_cycle_threaded, reactor_cycle_shared
+from kimera.resonance import resonance, THRESH
+from kimera.scar import SCAR_LOG
 
 
 def test_reactor_parallel_basic():
@@ -114,4 +119,52 @@ def test_reactor_parallel_single_worker():
     assert stats["workers"] == 1
     assert stats["geoids"] == 100
     assert stats["chunks"] == 4
-    assert stats["new_scars"] >= 0
\ No newline at end of file
+    assert stats["new_scars"] >= 0
+
+
+def _expected_scars(geoids, chunk, seed):
+    """Scar weights the sequential loop would create for the shared reactor's pairing."""
+    random.seed(seed)
+    order = list(range(len(geoids)))
+    random.shuffle(order)
+    expected = {}
+    for start in range(0, len(order), chunk):
+        seg = order[start:start + chunk]
+        for k in range(0, len(seg) - 1, 2):
+            r = resonance(geoids[seg[k]], geoids[seg[k + 1]])
+            if r < THRESH:
+                # Scar weights are stored as float32
+                expected[(geoids[seg[k]].gid, geoids[seg[k + 1]].gid)] = float(np.float32(1 - r))
+    return expected
+
+
+def test_reactor_shared_matches_sequential_and_keeps_scars():
+    """Shared-memory mode creates the scars the sequential loop would, in the parent."""
+    texts = [f"shared {i}" for i in range(120)] + [f"shared {i} is not here" for i in range(81)]
+    geoids = [init_geoid(t, "en", ["test"]) for t in texts]
+
+    # Same seed every cycle: pairs repeat, so penalties include earlier cycles
+    for _ in range(3):
+        expected = _expected_scars(geoids, chunk=40, seed=7)
+        before = len(SCAR_LOG)
+        random.seed(7)
+        stats = reactor_cycle_shared(geoids, workers=2, chunk=40)
+
+        created = list(SCAR_LOG.values())[before:]
+        assert {s.gid_pair: s.weight for s in created} == expected
+        assert stats["new_scars"] == len(created)
+        assert stats["chunks"] == 6
+        assert stats["mode"] == "shared_memory"
+        by_gid = {g.gid: g for g in geoids}
+        for s in created:
+            assert s.scar_id in by_gid[s.gid_pair[0]].scars
+            assert s.scar_id in by_gid[s.gid_pair[1]].scars
+
+
+def test_reactor_shared_empty_dataset():
+    """Shared-memory mode with nothing to pair."""
+    stats = reactor_cycle_shared([], workers=1)
+
+    assert stats["geoids"] == 0
+    assert stats["chunks"] == 0
+    assert stats["new_scars"] == 0
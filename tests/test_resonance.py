@@ -0,0 +1,113 @@
+"""Tests for scalar and vectorized resonance."""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from kimera.cache import resonance_cache
+from kimera.geoid import Geoid, GeoidMatrix, init_geoid
+from kimera.resonance import resonance, resonance_many, resonance_matrix
+from kimera.scar import create_scar
+
+
+def _geoids():
+    texts = [
+        "The sky is blue",
+        "The sky is not blue",
+        "Cats purr softly",
+        "Quantum entanglement defies locality",
+        "Birds can fly",
+        "Birds cannot fly",
+    ]
+    return [init_geoid(t, "en", ["test"]) for t in texts]
+
+
+def test_resonance_many_matches_scalar_exactly():
+    gs = _geoids()
+    create_scar(gs[0], gs[1], 0.4)
+    create_scar(gs[0], gs[1], 0.9)  # two scars shared by one pair
+    create_scar(gs[2], gs[3], 0.7)
+    pairs = [(a, b) for a in gs for b in gs]
+
+    resonance_cache.clear()
+    expected = np.array([resonance(a, b) for a, b in pairs])
+    assert np.array_equal(resonance_many(pairs), expected)
+
+
+def test_resonance_matrix_matches_scalar():
+    gs = _geoids()
+    create_scar(gs[4], gs[5], 0.8)
+    left, right = gs[:3], gs[2:]
+
+    resonance_cache.clear()
+    expected = np.array([[resonance(a, b) for b in right] for a in left])
+    got = resonance_matrix(left, right)
+    assert got.shape == (3, 4)
+    assert np.array_equal(got, expected)
+
+    square = resonance_matrix(gs)
+    assert square.shape == (6, 6)
+    assert np.array_equal(square, square.T)
+    assert np.array_equal(square, resonance_many([(a, b) for a in gs for b in gs]).reshape(6, 6))
+
+
+def test_negation_penalty_vectorized():
+    gs = _geoids()
+    plain = resonance_matrix([gs[0]], [gs[0]])[0, 0]
+    negated = resonance_many([(gs[0], gs[1])])[0]
+    assert negated < plain - 0.2
+
+
+def test_empty_inputs():
+    assert resonance_many([]).shape == (0,)
+    assert resonance_matrix([], _geoids()).shape == (0, 6)
+
+
+def test_arena_backed_geoids_score_the_same():
+    from kimera.geoid import GeoidMatrix
+
+    gs = _geoids()
+    before = resonance_matrix(gs)
+    GeoidMatrix.from_geoids(gs)
+    after = resonance_matrix(gs)
+    assert np.allclose(after, before, atol=1e-6)
+    resonance_cache.clear()
+    assert np.array_equal(after, [[resonance(a, b) for b in gs] for a in gs])
+
+    loose = init_geoid("Not in the arena", "en", ["test"])
+    pairs = [(a, b) for a in gs for b in gs + [loose]]
+    resonance_cache.clear()
+    assert np.array_equal(resonance_many(pairs), [resonance(a, b) for a, b in pairs])
+
+
+def _vec_geoid(text, vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return Geoid(raw=text, echo=text, gid=f"vec:{text}", lang_axis="en", context_layers=["test"],
+                 sem_vec=vec, sym_vec=vec, vdr=1.0)
+
+
+def test_detached_geoids_score_their_own_vectors():
+    rng = np.random.default_rng(7)
+    a, b, c = (_vec_geoid(t, rng.normal(size=16)) for t in ("alpha", "beta", "gamma"))
+    GeoidMatrix.from_geoids([a, b])
+
+    replaced = dataclasses.replace(a, sem_vec=c.sem_vec, sym_vec=c.sym_vec)
+    b.sem_vec = b.sym_vec = c.sem_vec.copy()
+    resonance_cache.clear()
+    for g in (replaced, b):
+        assert resonance(g, c) == pytest.approx(1.0, abs=1e-6)
+        assert resonance_many([(g, c), (a, g)])[0] == pytest.approx(1.0, abs=1e-6)
+    assert resonance_many([(a, b)])[0] == pytest.approx(resonance_many([(a, c)])[0], abs=1e-6)
+
+
+def test_resonance_many_self_pairs_match_scalar():
+    gs = _geoids()
+    create_scar(gs[0], gs[0], 0.3)
+    for w in (0.1, 0.2, 0.35, 0.45, 0.6):
+        create_scar(gs[0], gs[1], w)
+    pairs = [(g, g) for g in gs] + [(gs[1], gs[0])]
+
+    resonance_cache.clear()
+    expected = np.array([resonance(a, b) for a, b in pairs])
+    assert np.array_equal(resonance_many(pairs), expected)
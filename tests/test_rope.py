@@ -0,0 +1,104 @@
+"""Tests for the rope ring buffer."""
+
+import numpy as np
+import pytest
+
+from kimera.rope import RopeBuffer
+
+
+def test_ring_keeps_newest_entries_in_order():
+    rope = RopeBuffer(capacity=4)
+    rope.push("a", "b", 0.1)
+    rope.push_many(["b", "c", "a"], ["c", "a", "a"], [0.2, 0.3, 0.4])
+    rope.push("c", "d", 0.5)
+
+    assert len(rope) == 4 and rope.pushed == 5
+    assert rope.entries() == [
+        ("b", "c", pytest.approx(0.2)),
+        ("c", "a", pytest.approx(0.3)),
+        ("a", "a", pytest.approx(0.4)),
+        ("c", "d", pytest.approx(0.5)),
+    ]
+    assert [e[:2] for e in rope.entries(last=2)] == [("a", "a"), ("c", "d")]
+    assert rope.weight.dtype == np.float32
+
+    # A batch larger than the ring keeps only its tail
+    rope.push_many([f"x{i}" for i in range(10)], ["y"] * 10, np.arange(10) / 10)
+    assert [e[0] for e in rope.entries()] == ["x6", "x7", "x8", "x9"]
+
+    with pytest.raises(ValueError):
+        rope.push_many(["a"], ["b", "c"], [0.1])
+
+
+def test_window_queries():
+    rope = RopeBuffer(capacity=8)
+    rope.push_many(["a", "a", "b", "c", "a"], ["b", "c", "c", "c", "a"], [0.1, 0.2, 0.3, 0.4, 0.5])
+
+    assert rope.mean() == pytest.approx(0.3)
+    assert rope.mean(last=2) == pytest.approx(0.45)
+    assert rope.percentile(50) == pytest.approx(0.3)
+    assert rope.percentile([0, 100], last=3) == pytest.approx([0.3, 0.5])
+    assert rope.activity() == {"a": 3, "c": 3, "b": 2}
+    assert rope.activity(last=2) == {"a": 1, "c": 1}
+    assert rope.activity(top=1) == {"a": 3}
+    assert rope.gid_activity("c") == 3 and rope.gid_activity("zzz") == 0
+
+    hist = rope.histogram(bins=2, value_range=(0.0, 1.0))
+    assert hist == {"edges": [0.0, 0.5, 1.0], "counts": [4, 1]}
+    stats = rope.stats()
+    assert stats["entries"] == 5 and stats["p50"] == pytest.approx(0.3)
+
+
+def test_empty_and_clear():
+    rope = RopeBuffer(capacity=2)
+    assert np.isnan(rope.mean()) and np.isnan(rope.percentile(90))
+    assert rope.activity() == {} and rope.entries() == []
+    rope.push("a", "b", 0.5)
+    rope.clear()
+    assert len(rope) == 0 and rope.stats()["entries"] == 0
+    with pytest.raises(ValueError):
+        RopeBuffer(capacity=0)
+
+
+def test_intern_table_stays_bounded():
+    rope = RopeBuffer(capacity=4)
+    for i in range(100):
+        rope.push(f"a{i}", f"b{i}", i / 100)
+        assert len(rope._gids) <= 4 * rope.capacity
+    rope.push_many([f"c{i}" for i in range(50)], ["d"] * 50, np.zeros(50))
+    assert len(rope._gids) <= 4 * rope.capacity
+    rope.push("c49", "e", 0.5)
+
+    assert [e[:2] for e in rope.entries()] == [("c47", "d"), ("c48", "d"), ("c49", "d"), ("c49", "e")]
+    assert rope.activity() == {"d": 3, "c49": 2, "c47": 1, "c48": 1, "e": 1}
+    assert rope.gid_activity("a99") == 0
+    assert len(rope._index) == len(rope._gids)
+
+
+def test_concurrent_pushes_are_not_lost():
+    import threading
+
+    rope = RopeBuffer(capacity=64)
+    errors = []
+
+    def writer(t):
+        try:
+            for i in range(2000):
+                if i % 10:
+                    rope.push(f"t{t}-{i}", f"t{t}-{i + 1}", 0.5)
+                else:
+                    rope.push_many([f"m{t}-{i}"] * 3, ["x", "y", "z"], [0.1, 0.2, 0.3])
+                rope.activity(last=16)
+        except Exception as e:  # pragma: no cover - the failure being tested
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert rope.pushed == 8 * (1800 + 200 * 3)
+    assert len(rope.entries()) == 64
+    assert len(rope._gids) <= 4 * rope.capacity
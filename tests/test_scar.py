@@ -0,0 +1,191 @@
+"""Tests for the columnar scar store."""
+
+import math
+import pickle
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from kimera import resonance as resonance_mod
+from kimera.geoid import Geoid, init_geoid
+from kimera.scar import SCAR_LOG, ScarStore, ScarView, create_scar, create_scars, fetch_scars
+
+
+def test_append_aggregates_and_adjacency():
+    store = ScarStore(capacity=2)
+    ids = store.append(["a", "a", "b", "c"], ["b", "c", "b", "a"], [0.5, 0.25, 1.0, 0.75])
+
+    assert list(ids) == [0, 1, 2, 3]
+    assert len(store) == 4
+    assert store.totals("a") == (1.5, 3)
+    assert store.totals("b") == (1.5, 2)  # self-scar counts once
+    assert store.totals("missing") == (0.0, 0)
+    assert store.scar_ids("a").tolist() == [0, 1, 3]
+
+    sums, counts = store.totals_many(["c", "missing", "b"])
+    assert sums.tolist() == [1.0, 0.0, 1.5]
+    assert counts.tolist() == [2, 0, 2]
+
+    scar = store[3]
+    assert scar.gid_pair == ("c", "a")
+    assert scar.weight == 0.75
+    assert [s.scar_id for s in store.values()] == [0, 1, 2, 3]
+    assert store.nbytes() == 4 * 20 + 3 * 32 + 3 * 48  # scars, geoids, distinct pairs
+
+
+def test_append_rejects_ragged_input():
+    with pytest.raises(ValueError):
+        ScarStore().append(["a"], ["b", "c"], [0.1])
+
+
+def test_geoid_scars_view_tracks_store():
+    g1 = init_geoid("Scar view left", "en", ["test"])
+    g2 = init_geoid("Scar view right", "en", ["test"])
+    assert isinstance(g1.scars, ScarView) and not g1.scars
+
+    s = create_scar(g1, g2, 0.4)
+    more = create_scars([(g1, g2), (g2, g2)], [0.2, 0.9])
+    assert s.scar_id in g1.scars and s.scar_id in g2.scars
+    assert list(g1.scars) == [s.scar_id, more[0]]
+    assert len(g2.scars) == 3
+    assert more[1] not in g1.scars
+    assert [f.scar_id for f in fetch_scars(g1, g2)] == [s.scar_id, *more]
+
+    # Same gid, same scars; pickling rebinds to the global store
+    assert list(init_geoid("Scar view left", "en", ["test"]).scars) == list(g1.scars)
+    assert list(pickle.loads(pickle.dumps(g1)).scars) == list(g1.scars)
+
+
+@pytest.mark.parametrize("name", ["scars.duckdb", "scars.parquet"])
+def test_snapshot_and_restore(tmp_path, name):
+    store = ScarStore()
+    store.append(["a", "b", "c"], ["b", "c", "a"], np.array([0.1, 0.2, 0.3]))
+    store.snapshot(tmp_path / name)
+
+    restored = ScarStore()
+    restored.append(["z"], ["a"], [1.0])
+    ids = restored.restore(tmp_path / name)
+
+    assert list(ids) == [1, 2, 3]
+    for src, dst in zip(range(3), ids):
+        assert restored[dst].gid_pair == store[src].gid_pair
+        assert restored[dst].weight == store[src].weight
+        assert restored[dst].timestamp == store[src].timestamp
+    assert restored.totals("a") == pytest.approx((1.0 + 0.1 + 0.3, 3))
+
+
+def test_clear_resets_views():
+    store = ScarStore()
+    view = ScarView("g", store)
+    store.append(["g"], ["h"], [0.5])
+    assert len(view) == 1
+    store.clear()
+    assert len(view) == 0 and len(store) == 0
+    assert SCAR_LOG is not store
+
+
+def test_decayed_totals_match_per_scar_decay():
+    store = ScarStore(tau_seconds=100.0)
+    t0 = datetime(2024, 1, 1)
+    store.append(["a"], ["b"], [0.5], timestamp=t0)
+    store.append(["a", "c"], ["c", "c"], [0.25, 1.0], timestamp=t0 + timedelta(seconds=50))
+
+    now = t0 + timedelta(seconds=150)
+    expected = 0.5 * math.exp(-1.5) + 0.25 * math.exp(-1.0)
+    assert store.decayed_totals("a", now) == (pytest.approx(expected), 2)
+    assert store.decayed_totals("b", now) == (pytest.approx(0.5 * math.exp(-1.5)), 1)
+    assert store.decayed_totals("missing", now) == (0.0, 0)
+
+    sums, counts = store.decayed_totals_many(["c", "a"], now)
+    assert sums == pytest.approx([1.25 * math.exp(-1.0), expected])
+    assert counts.tolist() == [2, 2]
+    # Undecayed totals are untouched
+    assert store.totals("a") == (0.75, 2)
+
+    with pytest.raises(ValueError):
+        ScarStore(tau_seconds=0)
+
+
+def test_shared_totals_count_pair_scars_once():
+    store = ScarStore(capacity=1, tau_seconds=100.0)
+    t0 = datetime(2024, 1, 1)
+    store.append(["a", "b", "a"], ["b", "a", "c"], [0.5, 0.25, 1.0], timestamp=t0)
+    store.append(["c", "b"], ["c", "a"], [0.75, 0.125], timestamp=t0 + timedelta(seconds=100))
+
+    assert store.shared_totals("a", "b") == (0.875, 3)
+    assert store.shared_totals("b", "a") == (0.875, 3)
+    assert store.shared_totals("c", "c") == store.totals("c") == (1.75, 2)
+    assert store.shared_totals("b", "c") == (0.0, 0)
+    assert store.shared_totals("a", "missing") == (0.0, 0)
+
+    now = t0 + timedelta(seconds=200)
+    expected = 0.75 * math.exp(-2.0) + 0.125 * math.exp(-1.0)
+    assert store.decayed_shared_totals("a", "b", now) == (pytest.approx(expected), 3)
+
+    idx = store.indices_of(["a", "b", "c", "missing"])
+    sums, counts = store.shared_totals_indexed(idx[:, None], idx[None, :])
+    assert counts.tolist() == [[4, 3, 1, 0], [3, 3, 0, 0], [1, 0, 2, 0], [0, 0, 0, 0]]
+    assert sums[0, 1] == sums[1, 0] == 0.875
+    sums, _ = store.shared_totals_indexed(idx[:1], idx[1:2], decayed=True, now=now)
+    assert sums == pytest.approx([expected])
+
+
+def test_pair_index_survives_buffer_merges(monkeypatch):
+    from kimera import scar as scar_mod
+
+    monkeypatch.setattr(scar_mod, "_PAIR_BUFFER", 3)
+    rng = np.random.default_rng(3)
+    store = ScarStore(capacity=1)
+    gids = [f"p{i}" for i in range(12)]
+    for size in (1, 2, 5, 1, 8, 3, 1, 13):
+        a, b = rng.integers(0, 12, size), rng.integers(0, 12, size)
+        store.append([gids[i] for i in a], [gids[j] for j in b], rng.random(size))
+
+    n = len(store)
+    src, dst, w = store.src[:n], store.dst[:n], store.weight[:n].astype(np.float64)
+    idx = store.indices_of(gids)
+    sums, counts = store.shared_totals_indexed(idx[:, None], idx[None, :])
+    for i, ga in enumerate(gids):
+        for j, gb in enumerate(gids):
+            a, b = idx[i], idx[j]
+            shared = ((src == a) | (dst == a)) & ((src == b) | (dst == b))
+            assert counts[i, j] == shared.sum()
+            assert sums[i, j] == pytest.approx(w[shared].sum())
+            assert store.shared_totals(ga, gb) == (pytest.approx(w[shared].sum()), shared.sum())
+
+
+def _vec_geoid(gid):
+    vec = np.ones(4, dtype=np.float32)
+    return Geoid(gid, gid, gid, "en", ["test"], vec, vec, 0.0)
+
+
+def test_penalty_is_mean_over_union_of_scars():
+    a, b, c, d = (_vec_geoid(f"union penalty {k}") for k in "abcd")
+    create_scar(a, b, 0.8)
+    create_scar(a, c, 0.2)
+    create_scar(b, d, 0.2)
+
+    # Baseline: mean([s.weight for s in fetch_scars(a, b)]) == 1.2 / 3
+    assert np.mean([s.weight for s in fetch_scars(a, b)]) == pytest.approx(0.4)
+    assert resonance_mod.resonance(a, b) == pytest.approx(0.6)
+    assert resonance_mod.resonance(a, a) == pytest.approx(0.5)
+    pairs = [(a, b), (b, a), (a, a), (c, d)]
+    expected = [resonance_mod.resonance(x, y) for x, y in pairs]
+    assert np.array_equal(resonance_mod.resonance_many(pairs), expected)
+    matrix = resonance_mod.resonance_matrix([a, b, c, d])
+    assert matrix[0, 1] == matrix[1, 0] == pytest.approx(0.6)
+    assert matrix[0, 0] == pytest.approx(0.5)
+
+
+def test_resonance_penalty_uses_decayed_sum(monkeypatch):
+    a = init_geoid("Decay penalty left", "en", ["test"])
+    b = init_geoid("Decay penalty right", "en", ["test"])
+    create_scar(a, b, 0.8)
+
+    plain = resonance_mod.resonance(a, b)
+    monkeypatch.setattr(resonance_mod, "ENABLE_SCAR_DECAY", True)
+    monkeypatch.setattr(SCAR_LOG, "tau_seconds", 1e-9)  # everything has decayed away
+    decayed = resonance_mod.resonance(a, b)
+    assert decayed == pytest.approx(plain / (1 - 0.8))
+    assert resonance_mod.resonance_many([(a, b)])[0] == pytest.approx(decayed)
@@ -0,0 +1,143 @@
+"""Tests for the flat and IVF vector indexes."""
+
+import numpy as np
+import pytest
+
+from kimera.api import Kimera
+from kimera.vector_index import FlatIndex, IVFIndex, index_path, load_index, make_index
+
+
+def _clustered(n=4000, dim=32, clusters=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, n)
+    return (centers[labels] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def test_flat_top_k_is_exact():
+    vecs = _clustered(500)
+    index = FlatIndex(vecs.shape[1])
+    index.add([f"v{i}" for i in range(len(vecs))], vecs)
+
+    q = vecs[7]
+    unit = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+    expected = np.argsort(-(unit @ (q / np.linalg.norm(q))))[:5]
+
+    hits = index.top_k(q, 5)
+    assert [h for h, _ in hits] == [f"v{i}" for i in expected]
+    assert hits[0] == ("v7", pytest.approx(1.0, abs=1e-6))
+    assert all(s >= 0.9 for _, s in index.top_k(q, 50, threshold=0.9))
+
+
+def test_add_overwrites_and_remove_hides():
+    index = FlatIndex(3)
+    index.add(["a", "b"], [[1, 0, 0], [0, 1, 0]])
+    index.add(["a"], [[0, 0, 1]])
+    assert len(index) == 2
+    assert index.top_k([0, 0, 1], 1)[0][0] == "a"
+
+    assert index.remove(["a", "missing"]) == 1
+    assert "a" not in index
+    assert [h for h, _ in index.top_k([0, 0, 1], 5)] == ["b"]
+
+    index.compact()
+    assert index.ids == ["b"]
+
+
+def test_ivf_recall_against_flat():
+    vecs = _clustered()
+    ids = [str(i) for i in range(len(vecs))]
+    flat, ivf = FlatIndex(vecs.shape[1]), IVFIndex(vecs.shape[1], n_probe=8)
+    flat.add(ids, vecs)
+    ivf.add(ids, vecs)
+
+    recall = []
+    for q in vecs[:50]:
+        exact = {h for h, _ in flat.top_k(q, 10)}
+        approx = {h for h, _ in ivf.top_k(q, 10)}
+        recall.append(len(exact & approx) / 10)
+    assert ivf.is_trained
+    assert np.mean(recall) >= 0.9
+
+
+def test_ivf_incremental_add_remove_after_training():
+    vecs = _clustered(2000)
+    index = IVFIndex(vecs.shape[1], min_train=100, retrain_factor=0)
+    index.add([str(i) for i in range(1000)], vecs[:1000])
+    index.train()
+
+    index.add([str(i) for i in range(1000, 2000)], vecs[1000:])
+    assert index.top_k(vecs[1500], 1)[0][0] == "1500"
+    index.remove(["1500"])
+    assert "1500" not in {h for h, _ in index.top_k(vecs[1500], 10)}
+
+
+@pytest.mark.parametrize("kind", ["flat", "ivf"])
+def test_save_and_load_round_trip(tmp_path, kind):
+    vecs = _clustered(1500)
+    index = make_index(vecs.shape[1], kind, **({"min_train": 100} if kind == "ivf" else {}))
+    index.add([str(i) for i in range(len(vecs))], vecs)
+    index.remove(["3"])
+    before = index.top_k(vecs[10], 5)
+
+    path = index.save(index_path(tmp_path / "lattice.db"))
+    assert path.name == "lattice.db.sem.index.npz"
+    loaded = load_index(path)
+    assert type(loaded) is type(index)
+    assert len(loaded) == len(index)
+    assert [h for h, _ in loaded.top_k(vecs[10], 5)] == [h for h, _ in before]
+
+
+def test_make_index_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        make_index(8, "hnsw")
+
+
+def test_cross_domain_insights_use_knowledge_index():
+    kb = [
+        "Rivers carve valleys over time",
+        "Companies grow by acquiring rivals",
+        "The heart pumps blood through vessels",
+        "Water flows downhill",
+    ]
+    kimera = Kimera(resonance_version=1)
+    kimera.index_knowledge(kb, kind="flat")
+
+    direct = kimera.find_cross_domain_insights("Erosion shapes landscapes", kb, threshold=0.0)
+    indexed = kimera.find_cross_domain_insights("Erosion shapes landscapes", threshold=0.0)
+    assert [i["text"] for i in indexed] == [i["text"] for i in direct]
+    assert [i["resonance_score"] for i in indexed] == pytest.approx(
+        [i["resonance_score"] for i in direct], abs=1e-6
+    )
+
+    kimera.forget_knowledge([kb[0]])
+    indexed = kimera.find_cross_domain_insights("Erosion shapes landscapes", threshold=0.0)
+    assert kb[0] not in {i["text"] for i in indexed}
+
+
+def test_resonant_cluster_neighbors_subset_of_exhaustive():
+    try:
+        from kimera.resonance_v2 import EnhancedResonanceDetector
+    except ImportError as exc:
+        pytest.skip(f"resonance_v2 unavailable: {exc}")
+    from kimera.dimensions.geoid_v2 import init_geoid_v2
+
+    texts = ["Birds fly south", "Birds migrate in winter", "Stocks fell sharply",
+             "Markets dropped today", "Cells divide by mitosis"]
+    geoids = [init_geoid_v2(t) for t in texts]
+
+    detector = EnhancedResonanceDetector()
+    full = detector.find_resonant_cluster(geoids, threshold=0.0, neighbors=None)
+    pruned = detector.find_resonant_cluster(geoids, threshold=0.0, neighbors=2)
+    assert set(pruned) <= set(full)
+    assert len(pruned) < len(full)
+    # Exhaustive unless asked otherwise
+    assert detector.find_resonant_cluster(geoids, threshold=0.0) == full
+
+    # A prebuilt index is reused instead of building one per call
+    index = IVFIndex(len(geoids[0].sem_vec), min_train=1)
+    index.add_geoids(geoids)
+    reused = detector.find_resonant_cluster(geoids, threshold=0.0, neighbors=2, index=index)
+    assert set(reused) <= set(full)
+    with pytest.raises(ValueError):
+        detector.find_resonant_cluster(geoids, index=index)
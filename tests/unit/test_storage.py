@@ -6,7 +6,16 @@ import sys
 import os
 sys.path.insert(0, 'src')
 
+import json
+import math
+import threading
+import time
+
+import duckdb
 import pytest
+from datetime import datetime, timedelta, timezone
+from kimera import storage as storage_mod
+from kimera.echoform import EchoForm
 from kimera.storage import LatticeStorage
 from kimera.identity import Identity
 
@@ -90,6 +99,559 @@ def test_scar_storage(temp_storage):
     assert retrieved.identity_type == "scar"
     assert "related_ids" in retrieved.metadata
 
+def _form(anchor, intensity=1.0):
+    form = EchoForm(anchor=anchor, domain="bulk")
+    form.add_term("t", intensity=intensity)
+    return form
+
+def test_bulk_store_preserves_created_at(temp_storage):
+    """Bulk merges insert new rows and keep created_at on existing ones"""
+    assert temp_storage.store_forms_bulk([_form("a"), _form("b"), _form("a", 3.0)]) == 2
+    created = {f["anchor"]: f["created_at"] for f in temp_storage.list_forms(domain="bulk")}
+    assert temp_storage.fetch_form("a").intensity_sum() == pytest.approx(3.0)  # last duplicate wins
+
+    time.sleep(0.01)
+    temp_storage.store_forms_bulk([_form("a", 5.0), _form("c")])
+    rows = {f["anchor"]: f for f in temp_storage.list_forms(domain="bulk")}
+    assert set(rows) == {"a", "b", "c"}
+    assert rows["a"]["created_at"] == created["a"]
+    assert rows["a"]["updated_at"] > created["a"]
+    assert rows["a"]["intensity_sum"] == pytest.approx(5.0)
+
+    identities = [Identity(content=f"bulk {i}") for i in range(3)]
+    assert temp_storage.store_identities_bulk(identities) == 3
+    assert temp_storage.get_identity_count() == 3
+    assert temp_storage.fetch_identity(identities[1].id).content == "bulk 1"
+
+def test_upserts_rewrite_indexed_columns(temp_storage):
+    """Single-row upserts keep created_at and rewrite indexed columns"""
+    assert tuple(int(p) for p in duckdb.__version__.split(".")[:2]) >= (1, 4)
+    temp_storage.store_form(_form("a"))
+    identity = Identity(raw="upsert", identity_type="geoid")
+    temp_storage.store_identity(identity)
+    form_row = "SELECT created_at, updated_at FROM echoforms WHERE anchor = 'a'"
+    identity_row = "SELECT created_at, updated_at, identity_type FROM identities WHERE id = ?"
+    form_created, form_updated = temp_storage._conn.execute(form_row).fetchone()
+    created, updated, _ = temp_storage._conn.execute(identity_row, (identity.id,)).fetchone()
+
+    time.sleep(0.01)
+    temp_storage.store_form(_form("a", 2.0))
+    identity.identity_type = "scar"
+    temp_storage.store_identity(identity)
+    assert temp_storage._conn.execute(form_row).fetchone()[0] == form_created
+    assert temp_storage._conn.execute(form_row).fetchone()[1] > form_updated
+    assert temp_storage.fetch_form("a").intensity_sum() == pytest.approx(2.0)
+    row = temp_storage._conn.execute(identity_row, (identity.id,)).fetchone()
+    assert row[0] == created and row[1] > updated and row[2] == "scar"
+    assert [i["id"] for i in temp_storage.list_identities(identity_type="scar")] == [identity.id]
+
+def test_write_behind_reads_see_staged_rows(temp_storage):
+    """Staged writes are visible to fetches and flushed before queries"""
+    temp_storage.enable_write_behind(flush_rows=100, flush_interval=60)
+    identity = Identity(content="staged")
+    temp_storage.store_identity(identity)
+    temp_storage.store_form(_form("staged"))
+
+    assert temp_storage._pending_forms and temp_storage._pending_identities
+    assert temp_storage.fetch_identity(identity.id).content == "staged"
+    assert temp_storage.fetch_form("staged").intensity_sum() == pytest.approx(1.0)
+    assert temp_storage.get_form_count() == 1  # flushes
+    assert not temp_storage._pending_forms and not temp_storage._pending_identities
+
+def test_write_behind_flushes_by_size_and_time(temp_storage):
+    """The buffer is merged once full, and periodically in the background"""
+    temp_storage.enable_write_behind(flush_rows=3, flush_interval=0.05)
+    temp_storage._stop_flusher.set()  # size trigger only for now
+    temp_storage._flusher.join()
+    temp_storage._flusher = None
+    for i in range(3):
+        temp_storage.store_form(_form(f"s{i}"))
+    assert not temp_storage._pending_forms
+
+    temp_storage.enable_write_behind(flush_rows=1000, flush_interval=0.05)
+    temp_storage.store_form(_form("timed"))
+    deadline = time.time() + 5
+    while temp_storage._pending_forms and time.time() < deadline:
+        time.sleep(0.01)
+    assert not temp_storage._pending_forms
+
+def test_close_flushes_staged_writes(tmp_path):
+    """Closing a write-behind storage loses nothing"""
+    db = tmp_path / "wb.db"
+    storage = LatticeStorage(db_path=str(db), write_behind=True, flush_interval=60)
+    storage.store_form(_form("kept"))
+    storage.close()
+
+    reopened = LatticeStorage(db_path=str(db))
+    try:
+        assert reopened.fetch_form("kept") is not None
+    finally:
+        reopened.close()
+
+def test_set_based_decay_matches_python_reference(temp_storage):
+    """SQL decay gives the same forms and identities as decaying in Python"""
+    now = time.time()
+    form = _form("decayed")
+    form.add_term("stamped", intensity=2, timestamp=now - 3600)
+    form.add_term("zero", intensity=0)
+    form.terms.append({"symbol": "no_intensity"})
+    scar = Identity.create_scar(content="scar", related_ids=["a", "b", "c"])
+    geoid = Identity(raw="geoid", meta={"terms": [{"intensity": 2.0}, {"intensity": 1, "s": "q"}, {"x": 1}]})
+    temp_storage.store_forms_bulk([form])
+    temp_storage.store_identities_bulk([scar, geoid])
+    # Age everything by three days
+    temp_storage._conn.execute("UPDATE echoforms SET created_at = created_at - 3 * 86400")
+    temp_storage._conn.execute("UPDATE identities SET created_at = created_at - 3 * 86400")
+
+    def approx_terms(terms):
+        return [{k: pytest.approx(v) if isinstance(v, float) else v for k, v in t.items()} for t in terms]
+
+    anchor, blob, created = temp_storage._conn.execute(
+        "SELECT anchor, blob, created_at FROM echoforms").fetchone()
+    expected_form = EchoForm.reinflate(blob)
+    factor = math.exp(-(time.time() - created) / (14 * 86400))
+    for term in expected_form.terms:
+        if "intensity" in term:
+            term["intensity"] *= factor
+    expected_ids = {}
+    stored = temp_storage._conn.execute("SELECT id, created_at FROM identities").fetchall()
+    for (identity_id, created), identity in zip(
+            stored, temp_storage.fetch_identities_many(identity_id for identity_id, _ in stored)):
+        factor = math.exp(-(time.time() - created) / identity.effective_tau(14 * 86400))
+        identity.weight *= factor
+        for term in identity.meta.get("terms", []):
+            if "intensity" in term:
+                term["intensity"] *= factor
+        expected_ids[identity_id] = identity
+
+    assert temp_storage.apply_time_decay(14.0) == 1
+    assert temp_storage.apply_identity_decay(14.0) == 2
+
+    decayed = temp_storage.fetch_form(anchor)
+    assert decayed.terms == approx_terms(expected_form.terms)
+    assert temp_storage.list_forms(domain="bulk")[0]["intensity_sum"] == pytest.approx(
+        expected_form.intensity_sum(), rel=1e-6)
+    for row in temp_storage.list_identities():
+        expected = expected_ids[row["id"]]
+        got = temp_storage.fetch_identity(row["id"])
+        assert got.weight == pytest.approx(expected.weight)
+        assert got.meta.get("terms", []) == approx_terms(expected.meta.get("terms", []))
+        assert row["entropy_score"] == pytest.approx(expected.entropy())
+    # The indexes dropped for the rewrite are back
+    names = {r[0] for r in temp_storage._conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+    assert {"idx_echoforms_updated_at", "idx_identities_updated_at", "idx_identities_entropy"} <= names
+
+def test_form_decay_is_one_update_applied_on_read(temp_storage, monkeypatch):
+    """apply_time_decay never decodes forms; reads and rewrites apply the scale once"""
+    now = time.time()
+    form = _form("scaled", 2.0)
+    form.add_term("dated", intensity=4, timestamp=now)
+    temp_storage.store_form(form)
+    temp_storage._conn.execute("UPDATE echoforms SET created_at = created_at - 14 * 86400")
+    factor = math.exp(-1)
+
+    def no_reinflate(*args, **kwargs):
+        raise AssertionError("apply_time_decay decoded a form")
+
+    with monkeypatch.context() as m:
+        m.setattr(storage_mod.EchoForm, "reinflate", no_reinflate)
+        assert temp_storage.apply_time_decay(14.0) == 1
+        assert temp_storage.apply_time_decay(14.0) == 1
+    decayed = temp_storage.fetch_form("scaled")
+    assert [t["intensity"] for t in decayed.terms] == pytest.approx([2.0 * factor ** 2, 4 * factor ** 2])
+    assert temp_storage.list_forms(domain="bulk")[0]["intensity_sum"] == pytest.approx(
+        decayed.intensity_sum(), rel=1e-6)
+    assert temp_storage.fetch_form("scaled", term_table=True).intensity_sum() == pytest.approx(
+        decayed.intensity_sum())
+
+    # Storing the decoded form again bakes the scale into its blob
+    temp_storage.store_form(decayed)
+    assert temp_storage._conn.execute("SELECT term_scale FROM echoforms").fetchall() == [(1.0,)]
+    assert temp_storage.fetch_form("scaled").terms == decayed.terms
+
+def test_reads_decay_lazily(temp_storage, monkeypatch):
+    """list_forms/list_identities decay at read time without rewriting rows"""
+    now = time.time()
+    strong, weak = _form("strong", 3.0), _form("weak", 1.0)
+    strong.add_term("old", intensity=2.0, timestamp=now - 86400)
+    identity = Identity(raw="decaying", weight=2.0, created_at=datetime.now(timezone.utc) - timedelta(days=2))
+    temp_storage.store_forms_bulk([weak, strong])
+    temp_storage.store_identity(identity)
+    stored = temp_storage._conn.execute("SELECT updated_at FROM echoforms ORDER BY anchor").fetchall()
+
+    later = now + 5 * 86400
+    monkeypatch.setattr(storage_mod.time, "time", lambda: later)
+    forms = temp_storage.list_forms(domain="bulk", order_by="intensity")
+    assert [f["anchor"] for f in forms] == ["strong", "weak"]
+    assert forms[0]["intensity_sum"] == pytest.approx(strong.intensity_sum(at=later))
+    assert forms[1]["intensity_sum"] == pytest.approx(weak.intensity_sum(at=later))
+    (row,) = temp_storage.list_identities(order_by="weight")
+    at = datetime.fromtimestamp(later, timezone.utc)
+    assert row["weight"] == pytest.approx(identity.weight * identity.decay_factor(at=at))
+    # Nothing was written
+    assert temp_storage._conn.execute("SELECT updated_at FROM echoforms ORDER BY anchor").fetchall() == stored
+
+    with pytest.raises(ValueError):
+        temp_storage.list_forms(order_by="anchor; DROP TABLE echoforms")
+
+def test_lazy_decay_columns_are_backfilled(tmp_path):
+    """Databases from before decay-on-read are migrated on open"""
+    db = tmp_path / "old.db"
+    conn = duckdb.connect(str(db))
+    conn.execute("""CREATE TABLE echoforms (anchor TEXT PRIMARY KEY, blob JSON, created_at DOUBLE,
+                    updated_at DOUBLE, domain TEXT, phase TEXT, intensity_sum DOUBLE)""")
+    conn.execute("""CREATE TABLE identities (id TEXT PRIMARY KEY, identity_type TEXT NOT NULL, data JSON NOT NULL,
+                    created_at DOUBLE NOT NULL, updated_at DOUBLE NOT NULL, lang_axis TEXT, entropy_score DOUBLE)""")
+    now = time.time()
+    conn.execute("INSERT INTO echoforms VALUES ('old', ?, ?, ?, 'bulk', 'active', 2.0)",
+                 (_form("old").flatten(), now, now))
+    conn.execute("""INSERT INTO identities VALUES ('i', 'geoid', '{"weight": 0.5}', ?, ?, 'en', 0.0)""", (now, now))
+    conn.close()
+
+    storage = LatticeStorage(db_path=str(db))
+    try:
+        (form,) = storage.list_forms(domain="bulk")
+        assert form["intensity_sum"] == pytest.approx(2.0, rel=1e-4)
+        (identity,) = storage.list_identities()
+        assert identity["weight"] == pytest.approx(0.5, rel=1e-4)
+    finally:
+        storage.close()
+
+def test_related_scars_use_identity_edges(temp_storage):
+    """Scars are found by related id and by relationship type through the edges table"""
+    a = Identity.create_scar(content="a", related_ids=["x", "y"], metadata={"relationship_type": "conflict"})
+    b = Identity.create_scar(content="b", related_ids=["y"], weight=0.5)
+    temp_storage.store_identity(a)
+    temp_storage.store_identities_bulk([b])
+
+    assert [s.id for s in temp_storage.get_related_scars("x")] == [a.id]
+    assert {s.id for s in temp_storage.get_related_scars("y")} == {a.id, b.id}
+    assert [s.id for s in temp_storage.get_scars_by_type("conflict")] == [a.id]
+
+    # Rewriting an identity replaces its edges
+    a.related_ids = ["z"]
+    temp_storage.enable_write_behind(flush_rows=100, flush_interval=60)
+    temp_storage.store_identity(a)
+    assert temp_storage.get_related_scars("x") == []
+    assert [s.id for s in temp_storage.get_related_scars("z")] == [a.id]
+
+    stats = temp_storage.get_identity_lattice_stats("y")
+    assert stats["relationship_count"] == 1
+    assert stats["relationship_weight"] == pytest.approx(0.5)
+
+def test_identity_edges_are_backfilled(tmp_path):
+    """Databases from before identity_edges get it built from related_ids"""
+    db = tmp_path / "old.db"
+    scar = Identity.create_scar(content="s", related_ids=["x", "y"])
+    storage = LatticeStorage(db_path=str(db))
+    storage.store_identity(scar)
+    storage._conn.execute("DROP TABLE identity_edges")
+    storage.close()
+
+    storage = LatticeStorage(db_path=str(db))
+    try:
+        assert [s.id for s in storage.get_related_scars("y")] == [scar.id]
+    finally:
+        storage.close()
+
+def test_identity_counts_track_inserts_and_reconcile(temp_storage):
+    """Writes count new identities in process; reconciling re-reads the totals"""
+    a = Identity(raw="a", identity_type="geoid")
+    temp_storage.store_identity(a)
+    temp_storage.store_identity(a)  # an update, not counted again
+    temp_storage.store_identities_bulk([Identity(raw="b", identity_type="geoid"), a,
+                                        Identity.create_scar(content="s", related_ids=["x"])])
+    assert temp_storage.identity_counts() == {"geoid": 2, "scar": 1}
+
+    temp_storage._conn.execute("UPDATE identities SET identity_type = 'scar' WHERE id = ?", (a.id,))
+    assert temp_storage.identity_counts() == {"geoid": 2, "scar": 1}
+    assert temp_storage.reconcile_identity_counts() == {"geoid": 1, "scar": 2}
+    assert temp_storage.identity_counts() == {"geoid": 1, "scar": 2}
+
+    if storage_mod.OBSERVABILITY_AVAILABLE:
+        from kimera.observability import kimera_registry
+        assert kimera_registry.get_sample_value("kimera_active_identities", {"identity_type": "scar"}) == 2
+
+def test_identity_counts_ignore_updates_within_one_clock_tick(temp_storage, monkeypatch):
+    """A rewrite stamped with the stored created_at is still an update"""
+    monkeypatch.setattr(storage_mod.time, "time", lambda: 1_700_000_000.0)
+    a = Identity(raw="a", identity_type="geoid")
+    temp_storage.store_identity(a)
+    temp_storage.store_identity(a)
+    temp_storage.store_identities_bulk([a, Identity(raw="b", identity_type="geoid")])
+    temp_storage.store_identities_bulk([a])
+    assert temp_storage.identity_counts() == {"geoid": 2}
+
+def test_identity_writes_detect_inserts_without_a_pre_read(temp_storage, monkeypatch):
+    """Inserts come back from the write itself; updates keep created_at"""
+    executed = []
+
+    class Recording:
+        def __init__(self, conn):
+            self._conn = conn
+
+        def __getattr__(self, name):
+            if name == "extract_statements":
+                raise AttributeError(name)
+            return getattr(self._conn, name)
+
+        def execute(self, sql, *args):
+            executed.append(" ".join(str(sql).split()))
+            return self._conn.execute(sql, *args)
+
+    a = Identity(raw="a", identity_type="geoid")
+    temp_storage.store_identity(a)
+    created = temp_storage.fetch_identity(a.id).created_at
+    monkeypatch.setattr(temp_storage, "_conn", Recording(temp_storage._conn))
+
+    a.raw = "a again"
+    temp_storage.store_identity(a)
+    temp_storage.store_identities_bulk([a, Identity(raw="b", identity_type="scar")])
+    temp_storage.store_identity(Identity(raw="c", identity_type="geoid"))
+    assert not [sql for sql in executed if sql.upper().startswith("SELECT")]
+    assert temp_storage.identity_counts() == {"geoid": 2, "scar": 1}
+    stored = temp_storage.fetch_identity(a.id)
+    assert (stored.raw, stored.created_at) == ("a again", created)
+
+def test_search_identities_bm25_ranking(temp_storage):
+    """BM25 ranks by term rarity and frequency; rewrites reindex the identity"""
+    rare = Identity(content="the quasar flickers")
+    twice = Identity(content="the lattice of the lattice")
+    once = Identity(content="the lattice holds")
+    temp_storage.store_identity(rare)
+    temp_storage.store_identities_bulk([twice, once])
+
+    assert [r.id for r in temp_storage.search_identities("lattice")] == [twice.id, once.id]
+    assert temp_storage.search_identities("quasar lattice", limit=1)[0].id == rare.id
+    assert temp_storage.search_identities("LATTICE holds")[0].id == once.id
+    assert temp_storage.search_identities("...") == []
+    assert temp_storage.compact_search_index() == 9
+    assert [r.id for r in temp_storage.search_identities("lattice")] == [twice.id, once.id]
+
+    rare.raw = rare.echo = "a quiet star"
+    temp_storage.store_identity(rare)
+    assert temp_storage.search_identities("quasar") == []
+    assert [r.id for r in temp_storage.search_identities("star")] == [rare.id]
+    assert [r.id for r in temp_storage.search_identities("ttice ho", mode="substring")] == [once.id]
+
+def test_search_index_is_backfilled(tmp_path):
+    """Databases from before the search index get raw/echo columns and postings on open"""
+    db = tmp_path / "old.db"
+    identity = Identity(content="migrated lattice text")
+    conn = duckdb.connect(str(db))
+    conn.execute("""CREATE TABLE identities (id TEXT PRIMARY KEY, identity_type TEXT NOT NULL, data JSON NOT NULL,
+                    created_at DOUBLE NOT NULL, updated_at DOUBLE NOT NULL, lang_axis TEXT, entropy_score DOUBLE)""")
+    now = time.time()
+    conn.execute("INSERT INTO identities VALUES (?, 'geoid', ?, ?, ?, 'en', 0.0)",
+                 (identity.id, json.dumps(identity.to_dict()), now, now))
+    conn.close()
+
+    storage = LatticeStorage(db_path=str(db))
+    try:
+        assert [r.id for r in storage.search_identities("migrated")] == [identity.id]
+        assert storage._conn.execute("SELECT raw, doc_len FROM identities").fetchone() == (
+            "migrated lattice text", 3)
+    finally:
+        storage.close()
+
+def test_reads_do_not_wait_for_the_writer(temp_storage):
+    """Reads run on per-thread cursors while a write holds the writer lock"""
+    temp_storage.store_form(_form("f"))
+    temp_storage.store_identity(Identity(content="concurrent read"))
+    results = []
+
+    def read():
+        results.append((temp_storage.fetch_form("f").anchor, temp_storage.get_form_count(),
+                        len(temp_storage.search_identities("concurrent")), temp_storage._cursor()))
+
+    with temp_storage._lock:
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for t in readers:
+            t.start()
+        for t in readers:
+            t.join(timeout=10)
+        assert not any(t.is_alive() for t in readers)
+    assert [r[:3] for r in results] == [("f", 1, 1)] * 4
+    assert len({id(r[3]) for r in results}) == 4
+
+def test_thread_cursors_are_released_when_threads_exit(temp_storage):
+    """Each reading thread's cursor is closed once the thread is gone"""
+    temp_storage.store_form(_form("f"))
+    temp_storage._cursor()
+    cursors = []
+
+    def read():
+        assert temp_storage.fetch_form("f").anchor == "f"
+        cursors.append(temp_storage._cursor())
+
+    for _ in range(3):
+        readers = [threading.Thread(target=read) for _ in range(8)]
+        for t in readers:
+            t.start()
+        for t in readers:
+            t.join()
+    assert len(cursors) == 24
+    assert len(temp_storage._cursors) == 1  # this thread's
+    with pytest.raises(duckdb.ConnectionException):
+        cursors[0].execute("SELECT 1")
+    assert temp_storage.get_form_count() == 1
+
+def test_rows_read_through_thread_cursors_can_be_rewritten(temp_storage):
+    """A single-row read does not pin the snapshot later writes commit against"""
+    identity = Identity(raw="read me", identity_type="geoid")
+    temp_storage.store_identity(identity)
+    temp_storage.store_form(_form("f"))
+    assert temp_storage.fetch_identity(identity.id).raw == "read me"
+    assert temp_storage.fetch_form("f").anchor == "f"
+    assert temp_storage.get_identity_count("geoid") == 1
+    assert temp_storage.get_form_count() == 1
+    temp_storage.get_identity_lattice_stats(identity.id)
+    for i in range(3):
+        identity.raw = f"rewrite {i}"
+        temp_storage.store_identity(identity)
+        temp_storage.store_form(_form("f"))
+    assert temp_storage.fetch_identity(identity.id).raw == "rewrite 2"
+
+def test_statements_fall_back_to_plain_sql(temp_storage, monkeypatch):
+    """Connections without extract_statements execute the SQL text"""
+    class NoExtract:
+        def __init__(self, conn):
+            self._conn = conn
+
+        def __getattr__(self, name):
+            if name == "extract_statements":
+                raise AttributeError(name)
+            return getattr(self._conn, name)
+
+    monkeypatch.setattr(temp_storage, "_conn", NoExtract(temp_storage._conn))
+    sql = "SELECT blob FROM echoforms WHERE anchor = ?"
+    assert temp_storage._statement(sql) == sql
+    identity = Identity(raw="plain sql")
+    temp_storage.store_identity(identity)
+    temp_storage.store_form(_form("plain"))
+    assert temp_storage.fetch_identity(identity.id).raw == "plain sql"
+    assert temp_storage.fetch_form("plain").intensity_sum() == pytest.approx(1.0)
+
+def test_read_only_storage(tmp_path):
+    """A read-only storage reads an existing database and refuses writes"""
+    db = tmp_path / "ro.db"
+    storage = LatticeStorage(db_path=str(db))
+    storage.store_form(_form("f"))
+    storage.close()
+
+    reader = LatticeStorage(db_path=str(db), read_only=True)
+    try:
+        assert reader.fetch_form("f").anchor == "f"
+        assert reader.get_form_count() == 1
+        with pytest.raises(duckdb.Error):
+            reader.store_form(_form("g"))
+        with pytest.raises(ValueError):
+            reader.enable_write_behind()
+    finally:
+        reader.close()
+
+def test_fetch_identities_many(temp_storage, monkeypatch):
+    """Bulk fetches follow the requested ids, see staged rows and decode every field"""
+    created = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    full = Identity(id="full", raw="r", echo="e", lang_axis="fr", tags=["t"], weight=0.25,
+                    related_ids=["x"], meta={"k": [1, 2]}, created_at=created, updated_at=created)
+    legacy = Identity(content="legacy", metadata={"m": 1})
+    scar = Identity.create_scar(content="s", related_ids=["full"])
+    temp_storage.store_identities_bulk([full, legacy])
+    temp_storage.enable_write_behind(flush_rows=100, flush_interval=60)
+    temp_storage.store_identity(scar)
+    monkeypatch.setattr(storage_mod, "_FETCH_MANY_CHUNK", 1)
+
+    got = temp_storage.fetch_identities_many([scar.id, "missing", full.id, legacy.id, full.id])
+    assert [i and i.id for i in got] == [scar.id, None, "full", legacy.id, "full"]
+    restored = got[2]
+    assert (restored.raw, restored.echo, restored.lang_axis, restored.tags, restored.weight,
+            restored.related_ids, restored.meta) == ("r", "e", "fr", ["t"], 0.25, ["x"], {"k": [1, 2]})
+    assert restored.created_at == created and restored.updated_at == created
+    assert not hasattr(restored, "content")
+    assert (got[3].content, got[3].metadata) == ("legacy", {"m": 1})
+    assert got[0].metadata["related_ids"] == ["full"]
+
+    many = [Identity(raw=f"n{i}", created_at=created + timedelta(seconds=i)) for i in range(40)]
+    temp_storage.store_identities_bulk(many)
+    fetched = temp_storage.fetch_identities_many(i.id for i in many)
+    assert [i.created_at for i in fetched] == [i.created_at for i in many]
+    assert fetched[0].created_at.tzinfo is not None
+    assert temp_storage.fetch_identity(full.id).created_at == created
+
+def test_identity_columns_are_backfilled(tmp_path):
+    """Databases that kept identities as a JSON document get typed columns on open"""
+    db = tmp_path / "old.db"
+    scar = Identity.create_scar(content="old scar", related_ids=["x"], weight=0.5,
+                                metadata={"relationship_type": "support"})
+    conn = duckdb.connect(str(db))
+    conn.execute("""CREATE TABLE identities (id TEXT PRIMARY KEY, identity_type TEXT NOT NULL, data JSON NOT NULL,
+                    created_at DOUBLE NOT NULL, updated_at DOUBLE NOT NULL, lang_axis TEXT, entropy_score DOUBLE)""")
+    conn.execute("CREATE INDEX idx_identities_entropy ON identities(entropy_score DESC)")
+    now = time.time()
+    conn.execute("INSERT INTO identities VALUES (?, 'scar', ?, ?, ?, 'en', 0.0)",
+                 (scar.id, json.dumps(scar.to_dict()), now, now))
+    conn.close()
+
+    storage = LatticeStorage(db_path=str(db))
+    try:
+        columns = {r[0] for r in storage._conn.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = 'identities'").fetchall()}
+        assert "data" not in columns
+        restored = storage.fetch_identity(scar.id)
+        assert (restored.weight, restored.related_ids, restored.meta, restored.content) == (
+            0.5, ["x"], scar.meta, "old scar")
+        assert restored.created_at == scar.created_at
+        assert [s.id for s in storage.get_scars_by_type("support")] == [scar.id]
+    finally:
+        storage.close()
+
+def test_compact_forms(temp_storage):
+    """Hot forms roll their old cls_event terms up; cool ones are left alone"""
+    now = time.time()
+    hot, cool = EchoForm(anchor="hot", domain="cls"), EchoForm(anchor="cool", domain="cls")
+    for i in range(50):
+        hot.add_term("cls_event", role="resonance_trigger", intensity=0.2, timestamp=now - 3600 + i)
+    for i in range(5):
+        cool.add_term("cls_event", role="resonance_trigger", intensity=0.2, timestamp=now - 30 * 86400 + i)
+    temp_storage.store_forms_bulk([hot, cool])
+
+    assert temp_storage.compact_forms(threshold=40, keep=10) == 1
+    compacted = temp_storage.fetch_form("hot")
+    assert len(compacted.terms) == 11
+    assert compacted.intensity_sum() == pytest.approx(hot.intensity_sum(), rel=1e-6)
+    assert len(temp_storage.fetch_form("cool").terms) == 5
+
+    assert temp_storage.compact_forms(threshold=40, max_age=7 * 86400) == 1
+    assert len(temp_storage.fetch_form("cool").terms) == 1
+
+def test_form_blobs_are_packed_on_open(tmp_path):
+    """Databases that kept forms as JSON get binary blobs and a topology column on open"""
+    db = tmp_path / "old.db"
+    form = _form("old_form", 2.0)
+    form.topology = {"identities": ["id_1"]}
+    conn = duckdb.connect(str(db))
+    conn.execute("""CREATE TABLE echoforms (anchor TEXT PRIMARY KEY, blob JSON, created_at DOUBLE, updated_at DOUBLE,
+                    domain TEXT, phase TEXT, intensity_sum DOUBLE, base_intensity DOUBLE,
+                    last_decay_ts DOUBLE, decay_tau DOUBLE)""")
+    conn.execute("CREATE INDEX idx_echoforms_updated_at ON echoforms(updated_at)")
+    now = time.time()
+    conn.execute("INSERT INTO echoforms VALUES (?, ?, ?, ?, 'bulk', 'active', 2.0, 2.0, ?, NULL)",
+                 (form.anchor, form.flatten(), now, now, now))
+    conn.close()
+
+    storage = LatticeStorage(db_path=str(db))
+    try:
+        kind = storage._conn.execute("""SELECT data_type FROM information_schema.columns
+                                        WHERE table_name = 'echoforms' AND column_name = 'blob'""").fetchone()[0]
+        assert kind == "BLOB"
+        assert storage.fetch_form("old_form").terms == form.terms
+        assert storage.get_identity_lattice_stats("id_1", domain="bulk")["related_forms_count"] == 1
+        storage.store_form(_form("new_form", 1.0))
+        assert storage.fetch_form("new_form").terms == _form("new_form", 1.0).terms
+    finally:
+        storage.close()
+
 if __name__ == "__main__":
     # Note: These tests require pytest fixtures, so they should be run with pytest
     print("Run these tests with: python -m pytest tests/unit/test_storage.py -v")
\ No newline at end of file
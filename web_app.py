@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from kimera.api import Kimera
+from kimera.geoid import warmup
 
 app = Flask(__name__)
 kimera = Kimera()
@@ -92,5 +93,6 @@ if __name__ == '__main__':
     templates_dir.mkdir(exist_ok=True)
     
     print("Starting Kimera Web Interface...")
+    warmup()  # load the sentence encoder before the first request
     print("Open http://localhost:5000 in your browser")
     app.run(debug=True, port=5000)
\ No newline at end of file